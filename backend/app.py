@@ -3,14 +3,21 @@ DataApp1 - Backend Flask Application
 Aplicación para análisis exploratorio de datos con IA
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, abort, redirect, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
 import pandas as pd
 from werkzeug.utils import secure_filename
 import logging
-from data_analysis import DataAnalyzer
+from data_analysis import ANALYSIS_OUTPUTS, CHART_MODES
+from plot_rendering import RENDER_PROFILES
+from plot_sources import render_plot_source
+from jobs import JobManager, JobQueueFull, run_analysis
+from artifact_store import REFS_DIR, ArtifactStore, artifact_digest
+from janitor import Janitor, sweep_directory
+from result_cache import NumpyJSONProvider, ResultCache, content_key
 import json
+import uuid
 from datetime import datetime
 
 # Configuración de la aplicación
@@ -24,7 +31,44 @@ ALLOWED_EXTENSIONS = {'csv'}
 
 app.config['UPLOAD_FOLDER'] = os.path.abspath(UPLOAD_FOLDER)
 app.config['STATIC_FOLDER'] = os.path.abspath(STATIC_FOLDER)
+app.config['PLOTS_FOLDER'] = os.path.join(app.config['STATIC_FOLDER'], 'plots')  # Gráficos guardados por su hash
+app.config['PLOTS_MAX_AGE'] = 365 * 24 * 3600  # Segundos que el navegador puede cachear un gráfico
+app.config['PLOTS_MAX_BYTES'] = 512 * 1024 * 1024  # Tamaño máximo del directorio de gráficos
+app.config['PLOTS_TTL'] = 24 * 3600  # Segundos sin usar antes de borrar un gráfico (mayor que RESULT_CACHE_TTL)
+app.config['PLOT_REFS_FOLDER'] = os.path.abspath('../plot_refs')  # Claves de render -> gráfico, fuera del directorio público
+app.config['PLOT_SOURCES_FOLDER'] = os.path.abspath('../plot_sources')  # Datos de los gráficos que se generan al pedirlos
+app.config['PLOT_SOURCES_MAX_BYTES'] = 1024 * 1024 * 1024  # Tamaño máximo del directorio de datos de gráficos
+app.config['PLOT_SOURCES_TTL'] = 24 * 3600  # Segundos sin usar antes de borrar los datos de un gráfico
+app.config['UPLOAD_MAX_AGE'] = 3 * 3600  # Segundos tras los que se borra un archivo subido huérfano
+app.config['JANITOR_INTERVAL'] = 300  # Segundos entre limpiezas de gráficos y archivos subidos
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
+app.config['CSV_SNIFF_SAMPLE_SIZE'] = 64 * 1024  # Bytes inspeccionados para detectar el dialecto CSV
+app.config['CHUNKED_ANALYSIS_THRESHOLD'] = 20 * 1024 * 1024  # Archivos mayores se analizan por bloques
+app.config['ANALYSIS_CHUNKSIZE'] = 100_000  # Filas por bloque en el análisis por bloques
+app.config['ANALYSIS_SAMPLE_ROWS'] = 50_000  # Filas de muestra para gráficos e insights
+app.config['QUANTILE_APPROX_ROW_THRESHOLD'] = 250_000  # Desde aquí los cuartiles son aproximados
+app.config['QUANTILE_RANK_ERROR'] = 0.01  # Error de rango objetivo de los cuartiles aproximados
+app.config['DISTINCT_APPROX_ROW_THRESHOLD'] = 100_000  # Desde aquí los conteos de valores únicos son aproximados
+app.config['HISTOGRAM_BUDGET'] = 12  # Histogramas dibujados, de los mejor puntuados
+app.config['BOXPLOT_BUDGET'] = 5  # Boxplots dibujados, de los mejor puntuados
+app.config['RESULT_CACHE_SIZE'] = 32  # Resultados de análisis guardados en memoria
+app.config['RESULT_CACHE_TTL'] = 3600  # Segundos que un resultado sigue siendo válido
+app.config['RESULT_CACHE_DIR'] = None  # Directorio de la caché en disco (None la desactiva)
+app.config['RESULT_CACHE_DISK_SIZE'] = 256  # Resultados guardados en disco
+# Procesos que ejecutan análisis en paralelo: por defecto la mitad de los
+# núcleos, para que sus procesos de gráficos tengan núcleos propios
+app.config['ANALYSIS_WORKERS'] = int(os.environ.get('ANALYSIS_WORKERS') or max(1, (os.cpu_count() or 1) // 2))
+# Procesos por análisis que generan gráficos (1: en el mismo proceso); cada
+# proceso de análisis tiene los suyos, así que se reparten los núcleos
+app.config['PLOT_WORKERS'] = int(os.environ.get('PLOT_WORKERS') or
+                                 max(1, (os.cpu_count() or 1) // app.config['ANALYSIS_WORKERS']))
+app.config['RENDER_PROFILE'] = 'web-preview'  # Resolución y formato de los gráficos si la petición no elige otro
+app.config['ANALYSIS_MAX_PENDING_JOBS'] = 32  # Trabajos en cola o en curso antes de rechazar (503)
+app.config['JOB_RESULT_TTL'] = 600  # Segundos que se conserva el resultado de un trabajo
+app.config['JOB_EVENTS_KEEPALIVE'] = 15  # Segundos entre comentarios keep-alive del flujo de eventos
+
+# Las respuestas, y la caché de resultados en disco, convierten también los tipos de numpy
+app.json = NumpyJSONProvider(app)
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -32,7 +76,41 @@ logger = logging.getLogger(__name__)
 
 # Crear directorios si no existen
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs(os.path.join(app.config['STATIC_FOLDER'], 'plots'), exist_ok=True)
+os.makedirs(app.config['PLOTS_FOLDER'], exist_ok=True)
+
+# Caché de resultados: volver a subir el mismo archivo no repite el análisis
+result_cache = ResultCache(max_entries=app.config['RESULT_CACHE_SIZE'],
+                           ttl=app.config['RESULT_CACHE_TTL'],
+                           disk_dir=app.config['RESULT_CACHE_DIR'],
+                           max_disk_entries=app.config['RESULT_CACHE_DISK_SIZE'],
+                           dumps=app.json.dumps)
+
+# Gráficos guardados por su hash, con límite de tamaño y antigüedad
+plot_store = ArtifactStore(app.config['PLOTS_FOLDER'],
+                           max_bytes=app.config['PLOTS_MAX_BYTES'],
+                           ttl=app.config['PLOTS_TTL'],
+                           refs_root=app.config['PLOT_REFS_FOLDER'])
+
+# Datos de los gráficos bajo demanda (modo lazy), fuera del directorio público
+plot_sources = ArtifactStore(app.config['PLOT_SOURCES_FOLDER'],
+                             max_bytes=app.config['PLOT_SOURCES_MAX_BYTES'],
+                             ttl=app.config['PLOT_SOURCES_TTL'])
+
+# Limpieza periódica de gráficos y de archivos subidos que quedaron sin borrar
+janitor = Janitor(interval=app.config['JANITOR_INTERVAL'])
+janitor.add('plots', plot_store.evict)
+janitor.add('plot_sources', plot_sources.evict)
+janitor.add('uploads', lambda: sweep_directory(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_MAX_AGE']))
+
+# Pool de procesos para los análisis; /analyze solo encola el trabajo
+job_manager = JobManager(max_workers=app.config['ANALYSIS_WORKERS'],
+                         max_pending=app.config['ANALYSIS_MAX_PENDING_JOBS'],
+                         result_ttl=app.config['JOB_RESULT_TTL'])
+
+# Opciones de configuración que cambian el resultado del análisis
+ANALYSIS_OPTION_KEYS = ['CSV_SNIFF_SAMPLE_SIZE', 'CHUNKED_ANALYSIS_THRESHOLD', 'ANALYSIS_CHUNKSIZE',
+                        'ANALYSIS_SAMPLE_ROWS', 'QUANTILE_APPROX_ROW_THRESHOLD', 'QUANTILE_RANK_ERROR',
+                        'DISTINCT_APPROX_ROW_THRESHOLD', 'HISTOGRAM_BUDGET', 'BOXPLOT_BUDGET']
 
 def allowed_file(filename):
     """Verificar si el archivo tiene una extensión permitida"""
@@ -68,12 +146,73 @@ def health_check():
     """Endpoint para verificar el estado del servidor"""
     return jsonify({
         'status': 'healthy',
-        'message': 'DataApp1 Backend está funcionando correctamente'
+        'message': 'DataApp1 Backend está funcionando correctamente',
+        'storage': janitor.report()
     })
 
+def describe_analysis_error(error):
+    """Mensaje y código HTTP para un error producido al analizar un archivo"""
+    if isinstance(error, pd.errors.EmptyDataError):
+        logger.error(f"EmptyDataError: {str(error)}")
+        return 'El archivo CSV está vacío o no contiene datos válidos', 400
+    if isinstance(error, pd.errors.ParserError):
+        logger.error(f"ParserError: {str(error)}")
+        return f'Error al parsear el archivo CSV. Verifica que el archivo tenga el formato correcto y use separadores como , o ; entre columnas. Error: {str(error)}', 400
+    if isinstance(error, UnicodeDecodeError):
+        logger.error(f"UnicodeDecodeError: {str(error)}")
+        return 'Error de codificación del archivo. Verifica que el archivo esté guardado en UTF-8, Latin-1 o Windows-1252', 400
+    if isinstance(error, FileNotFoundError):
+        logger.error(f"FileNotFoundError: {str(error)}")
+        return 'No se pudo encontrar el archivo subido', 400
+    if isinstance(error, RuntimeError):
+        # El analizador devolvió success=False con su propio mensaje
+        logger.error(f"Error en el análisis: {str(error)}")
+        return str(error), 400
+    logger.error(f"Error durante el análisis: {str(error)}", exc_info=error)
+    return f'Error interno del servidor: {str(error)}', 500
+
+def plot_urls(value):
+    """URLs de gráficos (/plots/...) que aparecen en un resultado"""
+    prefix = plot_store.url_prefix + '/'
+    if isinstance(value, str):
+        if value.startswith(prefix):
+            yield value[len(prefix):]
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from plot_urls(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from plot_urls(item)
+
+def plots_available(results):
+    """Comprobar que siguen guardados los gráficos de un resultado, marcándolos como usados"""
+    for name in plot_urls(results):
+        if name.startswith('render/'):
+            # Gráfico bajo demanda: basta con que se conserven sus datos
+            if plot_sources.lookup(name[len('render/'):]) is None:
+                return False
+        elif not plot_store.touch(name):
+            return False
+    return True
+
+def job_response(job_id):
+    """Respuesta 202 con las URLs para seguir un trabajo de análisis"""
+    return jsonify({
+        'job_id': job_id,
+        'status': job_manager.status(job_id),
+        'status_url': f'/jobs/{job_id}',
+        'events_url': f'/jobs/{job_id}/events',
+        'sections_url': f'/jobs/{job_id}/sections',
+        'result_url': f'/jobs/{job_id}/result'
+    }), 202
+
+def result_body(job):
+    """Resultado de un trabajo terminado con la información de la caché"""
+    return {'cache': {'hit': False, 'age_seconds': 0.0}, **job['result']}
+
 @app.route('/analyze', methods=['POST'])
 def analyze_data():
-    """Endpoint principal para analizar datos CSV"""
+    """Endpoint principal: encola el análisis de un CSV y devuelve el id del trabajo"""
     try:
         # Verificar que se envió un archivo
         if 'file' not in request.files:
@@ -89,58 +228,225 @@ def analyze_data():
         if not allowed_file(file.filename):
             return jsonify({'error': 'Tipo de archivo no permitido. Solo se aceptan archivos CSV'}), 400
         
-        # Guardar archivo de forma segura
-        filename = secure_filename(file.filename)
+        # Un archivo vacío se rechaza sin encolar el trabajo
+        file.stream.seek(0, os.SEEK_END)
+        if file.stream.tell() == 0:
+            return jsonify({'error': 'El archivo CSV está vacío o no contiene datos válidos'}), 400
+        file.stream.seek(0)
+        
+        # Secciones solicitadas (por defecto todas); solo se ejecutan sus etapas
+        outputs = [name.strip() for name in request.form.get('outputs', '').split(',') if name.strip()]
+        # Las etapas internas (datos numéricos, perfiles...) no son secciones del resultado
+        unknown = [name for name in outputs if name not in ANALYSIS_OUTPUTS]
+        if unknown:
+            return jsonify({'error': f'Secciones no válidas: {", ".join(unknown)}'}), 400
+        
+        # Gráficos como imágenes (por defecto), como datos para dibujarlos en el
+        # navegador o como descriptores que se generan al pedir su URL
+        chart_mode = request.form.get('chart_mode', 'image')
+        if chart_mode not in CHART_MODES:
+            return jsonify({'error': f'Modo de gráficos no válido: {chart_mode}'}), 400
+        
+        # Perfil de las imágenes: web-preview (WebP ligero), pdf (PNG a 300 DPI) o thumbnail
+        render_profile = request.form.get('render_profile', app.config['RENDER_PROFILE'])
+        if render_profile not in RENDER_PROFILES:
+            return jsonify({'error': f'Perfil de gráficos no válido: {render_profile}'}), 400
+        
+        # Un archivo idéntico con las mismas opciones se sirve desde la caché
+        options = {key: app.config[key] for key in ANALYSIS_OPTION_KEYS}
+        options['outputs'] = sorted(outputs or ANALYSIS_OUTPUTS)
+        options['chart_mode'] = chart_mode
+        options['render_profile'] = render_profile
+        cache_key = content_key(file.stream, options)
+        cached = result_cache.get(cache_key)
+        if cached is not None and not plots_available(cached[0]):
+            # Algún gráfico ya se borró del almacén: se repite el análisis
+            logger.info("Resultado en caché descartado: faltan gráficos")
+            result_cache.discard(cache_key)
+            cached = None
+        if cached is not None:
+            results, age = cached
+            logger.info(f"Resultado servido desde la caché ({age:.1f} s)")
+            job_id = job_manager.completed({**results, 'cache': {'hit': True, 'age_seconds': round(age, 3)}})
+            return job_response(job_id)
+        
+        # La limpieza periódica empieza con el primer análisis
+        janitor.start()
+        
+        # Guardar archivo de forma segura; el prefijo único evita que dos
+        # trabajos en cola compartan archivo
+        filename = f"{uuid.uuid4().hex}_{secure_filename(file.filename)}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
         
         logger.info(f"Archivo guardado: {filepath}")
         
-        # Crear analizador y procesar datos
-        analyzer = DataAnalyzer(file_path=filepath)
-        results = analyzer.analyze()
-        
-        # Verificar si el análisis fue exitoso
-        if not results.get('success', False):
-            error_msg = results.get('error', 'Error desconocido durante el análisis')
-            logger.error(f"Error en el análisis: {error_msg}")
-            return jsonify({'error': error_msg}), 400
-        
-        # Limpiar archivo temporal
+        # El análisis se ejecuta en un proceso del pool, que borra el archivo al terminar
+        params = {key: app.config[key] for key in ANALYSIS_OPTION_KEYS}
+        params['PLOTS_FOLDER'] = app.config['PLOTS_FOLDER']
+        params['PLOT_REFS_FOLDER'] = app.config['PLOT_REFS_FOLDER']
+        params['PLOT_SOURCES_FOLDER'] = app.config['PLOT_SOURCES_FOLDER']
+        params['PLOT_WORKERS'] = app.config['PLOT_WORKERS']
         try:
+            job_id = job_manager.submit(run_analysis, filepath, params, outputs or None, chart_mode,
+                                        render_profile,
+                                        on_success=lambda results: result_cache.put(cache_key, results))
+        except JobQueueFull:
             os.remove(filepath)
-        except Exception:
-            pass
-        
-        logger.info("Análisis completado exitosamente")
-        return jsonify(results)
-        
-    except pd.errors.EmptyDataError as e:
-        logger.error(f"EmptyDataError: {str(e)}")
-        return jsonify({'error': 'El archivo CSV está vacío o no contiene datos válidos'}), 400
-    except pd.errors.ParserError as e:
-        logger.error(f"ParserError: {str(e)}")
-        return jsonify({'error': f'Error al parsear el archivo CSV. Verifica que el archivo tenga el formato correcto y use separadores como , o ; entre columnas. Error: {str(e)}'}), 400
-    except UnicodeDecodeError as e:
-        logger.error(f"UnicodeDecodeError: {str(e)}")
-        return jsonify({'error': 'Error de codificación del archivo. Verifica que el archivo esté guardado en UTF-8, Latin-1 o Windows-1252'}), 400
-    except FileNotFoundError as e:
-        logger.error(f"FileNotFoundError: {str(e)}")
-        return jsonify({'error': 'No se pudo encontrar el archivo subido'}), 400
+            return jsonify({'error': 'El servidor está ocupado con otros análisis. Intenta de nuevo en unos momentos'}), 503
+        
+        logger.info(f"Análisis encolado: {job_id}")
+        return job_response(job_id)
+        
     except Exception as e:
-        logger.error(f"Error durante el análisis: {str(e)}", exc_info=True)
-        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+        message, status_code = describe_analysis_error(e)
+        return jsonify({'error': message}), status_code
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Estado de un trabajo: etapa alcanzada, tiempo transcurrido y posición en la cola"""
+    status = job_manager.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Flujo Server-Sent Events con el progreso real de un trabajo hasta que termina"""
+    if job_manager.get(job_id) is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    
+    # Al reconectar, EventSource envía el id del último evento recibido
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    cursor = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+    keepalive = app.config['JOB_EVENTS_KEEPALIVE']
+    
+    def stream(cursor):
+        while True:
+            events = job_manager.wait_events(job_id, cursor, timeout=keepalive)
+            if events is None:
+                return
+            if not events:
+                yield ': keep-alive\n\n'
+                continue
+            for event in events:
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+                if event['event'] == 'job_finished':
+                    return
+            cursor = events[-1]['id'] + 1
+    
+    return Response(stream_with_context(stream(cursor)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """Resultado de un trabajo terminado (202 mientras sigue en curso)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    
+    if job['status'] == 'failed':
+        message, status_code = describe_analysis_error(job['error'])
+        return jsonify({'error': message}), status_code
+    if job['status'] != 'done':
+        return jsonify(job_manager.status(job_id)), 202
+    
+    logger.debug(f"Caché de estadísticas por etapa: {job['result'].get('cache_stats')}")
+    return jsonify(result_body(job))
+
+@app.route('/jobs/<job_id>/sections', methods=['GET'])
+def job_sections(job_id):
+    """
+    Resultado de un trabajo en NDJSON: una línea por sección en cuanto su etapa
+    termina y una última línea con 'done' y el resto del resultado
+    """
+    if job_manager.get(job_id) is None:
+        return jsonify({'error': 'Trabajo no encontrado'}), 404
+    keepalive = app.config['JOB_EVENTS_KEEPALIVE']
+    
+    def line(payload):
+        return app.json.dumps(payload) + '\n'
+    
+    def stream():
+        cursor = 0
+        sent = set()
+        finished = False
+        while not finished:
+            waited = job_manager.wait_sections(job_id, cursor, timeout=keepalive)
+            if waited is None:
+                return
+            sections, finished = waited
+            if not sections and not finished:
+                # Línea vacía para mantener viva la conexión
+                yield '\n'
+            for section in sections:
+                sent.add(section['section'])
+                yield line(section)
+            cursor += len(sections)
+        
+        job = job_manager.get(job_id)
+        if job is None:
+            return
+        if job['status'] == 'failed':
+            message, status_code = describe_analysis_error(job['error'])
+            yield line({'done': True, 'success': False, 'error': message, 'status': status_code})
+            return
+        
+        # Las secciones de un resultado en caché llegan todas al final
+        result = result_body(job)
+        for name in ANALYSIS_OUTPUTS:
+            if name in result and name not in sent:
+                yield line({'section': name, 'data': result[name]})
+        yield line({'done': True, **{key: value for key, value in result.items() if key not in ANALYSIS_OUTPUTS}})
+    
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def is_plot_reference(folder, filename):
+    """Indicar si filename, dentro de folder, es una referencia interna de gráficos que
+    versiones anteriores guardaban junto a los gráficos públicos"""
+    path = os.path.abspath(os.path.join(folder, filename))
+    return path.startswith(os.path.join(os.path.abspath(app.config['PLOTS_FOLDER']), REFS_DIR) + os.sep)
 
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     """Servir archivos estáticos (gráficos)"""
+    if is_plot_reference(app.config['STATIC_FOLDER'], filename):
+        abort(404)
     return send_from_directory(app.config['STATIC_FOLDER'], filename)
 
+@app.route('/plots/render/<key>')
+def render_plot(key):
+    """Generar un gráfico descrito por un análisis la primera vez que se pide y redirigir a su imagen"""
+    profile = request.args.get('profile', app.config['RENDER_PROFILE'])
+    if profile not in RENDER_PROFILES:
+        return jsonify({'error': f'Perfil de gráficos no válido: {profile}'}), 400
+    
+    try:
+        name = render_plot_source(plot_sources, plot_store, key, RENDER_PROFILES[profile])
+    except Exception as e:
+        logger.error(f"Error al generar el gráfico {key}: {str(e)}")
+        return jsonify({'error': 'No se pudo generar el gráfico'}), 500
+    if name is None:
+        return jsonify({'error': 'Gráfico no encontrado o expirado'}), 404
+    return redirect(plot_store.url(name))
+
 @app.route('/plots/<path:filename>')
 def serve_plots(filename):
     """Servir gráficos generados"""
-    plots_dir = os.path.join(app.config['STATIC_FOLDER'], 'plots')
-    return send_from_directory(plots_dir, filename)
+    digest = artifact_digest(filename)
+    if digest is None:
+        if is_plot_reference(app.config['PLOTS_FOLDER'], filename):
+            abort(404)
+        return send_from_directory(app.config['PLOTS_FOLDER'], filename)
+    
+    # El nombre es el hash del contenido: el archivo nunca cambia y el
+    # navegador puede guardarlo sin volver a validarlo
+    response = send_from_directory(app.config['PLOTS_FOLDER'], filename, etag=digest,
+                                   max_age=app.config['PLOTS_MAX_AGE'])
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 @app.route('/generate-pdf', methods=['POST'])
 def generate_pdf():
@@ -322,6 +628,7 @@ def generate_pdf():
                     stats_data.append(['Cuartil 25%', str(column_stats.get('q25', 'N/A'))])
                     stats_data.append(['Cuartil 75%', str(column_stats.get('q75', 'N/A'))])
                     stats_data.append(['Máximo', str(column_stats.get('max', 'N/A'))])
+                    stats_data.append(['Valores atípicos', str(column_stats.get('outliers', 'N/A'))])
                     
                     stats_table = Table(stats_data, colWidths=[2.5*inch, 2*inch])
                     stats_table.setStyle(TableStyle([
@@ -534,6 +841,7 @@ if __name__ == '__main__':
     print("   - POST /analyze - Analizar archivo CSV")
     print("   - GET  /static/<filename> - Servir archivos estáticos")
     print("   - GET  /plots/<filename> - Servir gráficos")
+    print("   - GET  /plots/render/<id> - Generar un gráfico bajo demanda")
     print("-" * 50)
     
     app.run(debug=True, host='0.0.0.0', port=5000)
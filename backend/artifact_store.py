@@ -0,0 +1,172 @@
+"""
+Content-addressed store for generated artifacts such as plots.
+
+Each artifact is saved once under the SHA-256 of its bytes, so the same
+plot produced by two analyses is stored once and its URL never changes
+meaning: clients may cache it forever. The directory is bounded by a
+total size and a time to live, enforced by ``evict``.
+
+A producer can also record which artifact it made from a given input
+under a key of its own, e.g. a hash of a plot's data, and look the key up
+to skip producing the same artifact again. These references are internal:
+a store whose directory is served publicly keeps them in a separate
+``refs_root``.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+# File names produced by the store: hex digest plus extension
+ARTIFACT_NAME = re.compile(r'^([0-9a-f]{64})\.([a-z0-9]+)$')
+
+# Producer keys: hex digests as well
+REFERENCE_KEY = re.compile(r'^[0-9a-f]{64}$')
+
+# Subdirectory holding the key -> artifact name references, unless the
+# store is given a directory of its own for them
+REFS_DIR = 'refs'
+
+
+def artifact_digest(name: str):
+    """
+    The content hash encoded in an artifact name, or None if ``name`` was
+    not produced by the store.
+    """
+    match = ARTIFACT_NAME.match(name)
+    return match.group(1) if match else None
+
+
+class ArtifactStore:
+    """
+    Directory of immutable files named by the hash of their content and
+    served under ``url_prefix``.
+
+    A file's modification time records its last ``put``; ``evict`` removes
+    files unused for ``ttl`` seconds and then the least recently used ones
+    until the directory holds at most ``max_bytes``, along with the
+    references to them.
+    """
+
+    def __init__(self, root: str, url_prefix: str = '/plots',
+                 max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 refs_root: Optional[str] = None):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip('/')
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.refs_root = refs_root or os.path.join(root, REFS_DIR)
+        os.makedirs(root, exist_ok=True)
+
+    def put(self, data: bytes, extension: str = 'png') -> str:
+        """
+        Store ``data`` unless an identical artifact exists and return its name.
+        """
+        name = f'{hashlib.sha256(data).hexdigest()}.{extension}'
+        path = self.path(name)
+        try:
+            # Reusing an artifact keeps it from being evicted
+            os.utime(path)
+        except FileNotFoundError:
+            self._write(path, data)
+        return name
+
+    def _write(self, path: str, data: bytes):
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def link(self, key: str, name: str):
+        """
+        Record that the artifact ``name`` was produced from input ``key``.
+        """
+        if not REFERENCE_KEY.match(key) or artifact_digest(name) is None:
+            raise ValueError(f'Invalid reference {key!r} -> {name!r}')
+        os.makedirs(self.refs_root, exist_ok=True)
+        self._write(os.path.join(self.refs_root, key), name.encode())
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Name of the artifact linked to ``key`` if it is still stored; using
+        it counts as a ``put`` for eviction.
+        """
+        if not REFERENCE_KEY.match(key):
+            return None
+        try:
+            with open(os.path.join(self.refs_root, key), 'rb') as f:
+                name = f.read().decode()
+            if artifact_digest(name) is None:
+                return None
+            os.utime(self.path(name))
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+        return name
+
+    def touch(self, name: str) -> bool:
+        """
+        Mark the artifact ``name`` as used, as a ``put`` would. False if it
+        is not stored (never was, or evicted).
+        """
+        if artifact_digest(name) is None:
+            return False
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def url(self, name: str) -> str:
+        return f'{self.url_prefix}/{name}'
+
+    def evict(self) -> Tuple[int, int]:
+        """
+        Apply the TTL and size limits; return the files and bytes removed.
+        """
+        entries = []
+        for name in os.listdir(self.root):
+            if artifact_digest(name) is None:
+                continue
+            try:
+                stat = os.stat(self.path(name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        entries.sort()
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        removed_files = removed_bytes = 0
+        for mtime, size, name in entries:
+            expired = self.ttl is not None and now - mtime > self.ttl
+            oversized = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or oversized):
+                continue
+            try:
+                os.remove(self.path(name))
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed_files += 1
+            removed_bytes += size
+
+        # References to removed artifacts are dropped with them
+        keys = os.listdir(self.refs_root) if os.path.isdir(self.refs_root) else []
+        for key in keys:
+            if not REFERENCE_KEY.match(key):
+                continue
+            ref_path = os.path.join(self.refs_root, key)
+            try:
+                with open(ref_path, 'rb') as f:
+                    name = f.read().decode()
+                if not os.path.exists(self.path(name)):
+                    os.remove(ref_path)
+            except (OSError, UnicodeDecodeError):
+                continue
+        return removed_files, removed_bytes
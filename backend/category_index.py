@@ -0,0 +1,87 @@
+"""
+Row positions of the most frequent values of a categorical column.
+
+A column is factorized once and the rows of each chosen category are
+kept as an array of positions. Any numeric column can then be split by
+those categories with one fancy-indexing gather per group, instead of
+filtering a copy of the table for every pair of columns, and per-group
+sums come from one ``bincount`` over the group code of every row.
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class CategoryIndex:
+    """
+    Groups of rows of one column, one per category, in the given order.
+
+    ``positions[i]`` holds the row positions whose value is
+    ``categories[i]`` and ``codes`` the group of every row, -1 for rows
+    with other values or nulls, which belong to no group.
+    """
+
+    def __init__(self, categories: List[Any], positions: List[np.ndarray], codes: np.ndarray):
+        self.categories = categories
+        self.positions = positions
+        self.codes = codes
+
+    @classmethod
+    def build(cls, series: pd.Series, categories: Sequence[Any]) -> 'CategoryIndex':
+        """
+        Index the rows of ``series`` holding each of ``categories``.
+        """
+        codes, uniques = pd.factorize(series)
+        code_of = {value: code for code, value in enumerate(uniques)}
+
+        # Group of every factorized code, -1 for codes of other categories;
+        # the extra last slot maps null rows (code -1) to no group too
+        group_of_code = np.full(len(uniques) + 1, -1, dtype=np.int64)
+        kept = []
+        for category in categories:
+            code = code_of.get(category)
+            if code is not None:
+                group_of_code[code] = len(kept)
+                kept.append(category)
+        groups = group_of_code[codes]
+
+        # A stable sort keeps the rows of every group in their original order
+        order = np.argsort(groups, kind='stable')
+        bounds = np.searchsorted(groups[order], np.arange(len(kept) + 1))
+        positions = [order[bounds[i]:bounds[i + 1]] for i in range(len(kept))]
+        return cls(kept, positions, groups)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def sizes(self) -> List[int]:
+        return [len(rows) for rows in self.positions]
+
+    def split(self, values: np.ndarray, dropna: bool = True) -> List[Tuple[Any, np.ndarray]]:
+        """
+        ``(category, values)`` of every group, gathered from an array aligned
+        with the indexed column. Groups left without values are omitted.
+        """
+        groups = []
+        for category, rows in zip(self.categories, self.positions):
+            group = values[rows]
+            if dropna:
+                group = group[~pd.isna(group)]
+            if len(group):
+                groups.append((category, group))
+        return groups
+
+    def moments(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count, sum and sum of squares of the non-null ``values`` of every
+        group, e.g. to compare group means without gathering the groups.
+        """
+        values = np.asarray(values, dtype=float)
+        rows = (self.codes >= 0) & ~np.isnan(values)
+        codes, values = self.codes[rows], values[rows]
+        k = len(self.categories)
+        return (np.bincount(codes, minlength=k),
+                np.bincount(codes, weights=values, minlength=k),
+                np.bincount(codes, weights=values * values, minlength=k))
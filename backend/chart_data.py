@@ -0,0 +1,130 @@
+"""
+Compact chart payloads drawn by the browser instead of rendered images.
+
+Each function takes the same arguments as its counterpart in
+``plot_rendering`` and returns a JSON-serializable dict holding only what
+the chart needs: bin edges and counts of a histogram, the five-number
+summary and a sample of outliers of a boxplot, the matrix of a heatmap.
+Building them costs a pass over the values instead of a rendered figure.
+Ungrouped boxplots take a box already summarized by ``iqr_box`` from the
+outliers the analysis found, so the values are not searched again.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Same number of bins as the rendered histograms
+HISTOGRAM_BINS = 30
+
+# Whiskers reach the furthest value within this many IQRs of the box
+WHISKER_IQR = 1.5
+
+# Outliers sent per box; the count of all of them is sent too
+MAX_OUTLIER_SAMPLES = 50
+
+
+def _number(value) -> Optional[float]:
+    # NaN is not valid JSON
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def iqr_box(values: np.ndarray, q1: float, median: float, q3: float,
+            outlier_rows: np.ndarray) -> Dict[str, Any]:
+    """
+    Five-number summary of ``values`` and all of its outliers, given its
+    quartiles and the positions of the outliers, as ``IQROutliers`` finds
+    them. Null values are skipped and are never outliers.
+    """
+    values = np.asarray(values, dtype=float)
+    inside = ~np.isnan(values)
+    count = int(np.count_nonzero(inside))
+    if count == 0:
+        return {'count': 0}
+    inside[outlier_rows] = False
+    inside = values[inside]
+    outliers = np.sort(values[outlier_rows])
+
+    return {
+        'count': count,
+        'min': float(np.nanmin(values)),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'max': float(np.nanmax(values)),
+        'whisker_low': float(inside.min()),
+        'whisker_high': float(inside.max()),
+        'outliers': outliers.tolist(),
+        'outlier_count': len(outliers),
+    }
+
+
+def sample_outliers(box: Dict[str, Any], max_outliers: int = MAX_OUTLIER_SAMPLES) -> Dict[str, Any]:
+    """
+    ``box`` with an evenly spaced sample of at most ``max_outliers`` of its
+    outliers; ``outlier_count`` still counts all of them.
+    """
+    outliers = box.get('outliers', [])
+    if len(outliers) <= max_outliers:
+        return box
+    picks = np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int)
+    return {**box, 'outliers': [outliers[i] for i in picks]}
+
+
+def box_summary(values: np.ndarray, max_outliers: int = MAX_OUTLIER_SAMPLES) -> Dict[str, Any]:
+    """
+    Five-number summary of ``values`` with whiskers at ``WHISKER_IQR`` IQRs,
+    as drawn by matplotlib, and an evenly spaced sample of the outliers.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {'count': 0}
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    outlier_rows = np.flatnonzero((values < q1 - WHISKER_IQR * iqr) | (values > q3 + WHISKER_IQR * iqr))
+    return sample_outliers(iqr_box(values, q1, median, q3, outlier_rows), max_outliers)
+
+
+def heatmap_data(correlation_matrix: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        'type': 'heatmap',
+        'title': 'Matriz de Correlación',
+        'columns': [str(col) for col in correlation_matrix.columns],
+        'values': [[_number(value) for value in row] for row in correlation_matrix.to_numpy()],
+    }
+
+
+def histogram_data(column: str, values: np.ndarray, mean: float, median: float) -> Dict[str, Any]:
+    counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+    return {
+        'type': 'histogram',
+        'title': f'Histograma de {column}',
+        'column': str(column),
+        'bin_edges': edges.tolist(),
+        'counts': counts.tolist(),
+        'mean': _number(mean),
+        'median': _number(median),
+    }
+
+
+def boxplot_data(column: str, box: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'type': 'boxplot',
+        'title': f'Boxplot de {column}',
+        'column': str(column),
+        'groups': [{'name': str(column), **sample_outliers(box)}],
+    }
+
+
+def grouped_boxplot_data(num_col: str, cat_col: str, groups: List[Tuple[Any, np.ndarray]]) -> Dict[str, Any]:
+    return {
+        'type': 'boxplot',
+        'title': f'Boxplot de {num_col} por {cat_col}',
+        'column': str(num_col),
+        'group_by': str(cat_col),
+        'groups': [{'name': str(name), **box_summary(values)} for name, values in groups],
+    }
@@ -0,0 +1,293 @@
+"""
+Out-of-core analysis for CSV files larger than memory.
+
+The file is parsed in chunks of ``chunksize`` rows. Dimensions, data types,
+null counts, moments and the correlation matrix are accumulated exactly over
+every chunk as mergeable column summaries; quantiles come from the summaries'
+sketches, and plots and insights are computed on a bounded uniform sample
+of rows. Peak memory therefore depends on the chunk and sample sizes,
+not on the size of the file.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from artifact_store import ArtifactStore
+from column_stats import ColumnSummary, QuantileSketch, RowReservoir, RunningCovariance
+from csv_dialect import CSVDialect, DEFAULT_SAMPLE_SIZE, read_with_fallback, sniff_file
+from data_analysis import (ANALYSIS_OUTPUTS, BOXPLOT_BUDGET, HISTOGRAM_BUDGET, DataAnalyzer,
+                           QUANTILE_RANK_ERROR, dtype_label, preview_records)
+from outliers import IQROutliers
+from plot_rendering import DEFAULT_RENDER_PROFILE, PlotRenderer
+from progress import ProgressCallback, ProgressReader, emit
+
+# Rows parsed per chunk
+DEFAULT_CHUNKSIZE = 100_000
+
+# Rows kept in the uniform sample used for plots and insights
+DEFAULT_SAMPLE_ROWS = 50_000
+
+
+def _is_numeric(dtype) -> bool:
+    return dtype.kind in 'iuf'
+
+
+def _combine_dtypes(current, new):
+    """
+    Dtype the full column would get when chunks disagree.
+    """
+    if current == new:
+        return current
+    if _is_numeric(current) and _is_numeric(new):
+        return np.promote_types(current, new)
+    return np.dtype(object)
+
+
+class ChunkedDataAnalyzer:
+    def __init__(self, file_path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                 sample_rows: int = DEFAULT_SAMPLE_ROWS,
+                 sniff_sample_size: int = DEFAULT_SAMPLE_SIZE,
+                 quantile_error: float = QUANTILE_RANK_ERROR,
+                 progress: Optional[ProgressCallback] = None,
+                 plot_store: Optional[ArtifactStore] = None,
+                 plot_renderer: Optional[PlotRenderer] = None,
+                 chart_mode: str = 'image',
+                 render_profile: str = DEFAULT_RENDER_PROFILE,
+                 plot_sources: Optional[ArtifactStore] = None,
+                 histogram_budget: int = HISTOGRAM_BUDGET,
+                 boxplot_budget: int = BOXPLOT_BUDGET):
+        """
+        Initialize the analyzer and stream the whole file once.
+        
+        ``chart_mode``, ``render_profile``, ``plot_sources`` and the plot
+        budgets are passed to the ``DataAnalyzer`` drawing the plots.
+        """
+        self.file_path = file_path
+        self.progress = progress
+        self.plot_store = plot_store
+        self.plot_renderer = plot_renderer
+        self.chart_mode = chart_mode
+        self.render_profile = render_profile
+        self.plot_sources = plot_sources
+        self.histogram_budget = histogram_budget
+        self.boxplot_budget = boxplot_budget
+        self.chunksize = chunksize
+        self.sniff_sample_size = sniff_sample_size
+        self.quantile_k = QuantileSketch.k_for_error(quantile_error)
+        self.sample_rows = sample_rows
+        self.dialect: Optional[CSVDialect] = None
+        self._reset()
+
+        self.analysis_results = {}
+        self.plot_paths = []
+
+        self.process()
+
+    def _reset(self):
+        self.rows = 0
+        self.chunks = 0
+        self.columns: List[str] = []
+        self.dtypes: Dict[str, Any] = {}
+        self.summaries: Dict[str, ColumnSummary] = {}
+        self.covariance: Optional[RunningCovariance] = None
+        self.reservoir = RowReservoir(self.sample_rows)
+        self.preview: List[Dict[str, Any]] = []
+
+    def process(self):
+        """
+        Read the file chunk by chunk and update every accumulator.
+
+        A file that fails to decode past its sniffed prefix is read again
+        from the start with a fallback encoding.
+        """
+        def read(dialect: CSVDialect):
+            self._reset()
+            with open(self.file_path, 'rb') as f:
+                source = f if self.progress is None else ProgressReader(f, os.path.getsize(self.file_path),
+                                                                        self.progress)
+                with pd.read_csv(source, chunksize=self.chunksize, **dialect.read_csv_kwargs()) as reader:
+                    for chunk in reader:
+                        self._update(chunk)
+
+        _, self.dialect = read_with_fallback(read, sniff_file(self.file_path, self.sniff_sample_size))
+
+    def _update(self, chunk: pd.DataFrame):
+        if self.chunks == 0:
+            self.columns = list(chunk.columns)
+            self.dtypes = {col: chunk[col].dtype for col in self.columns}
+            self.summaries = {col: ColumnSummary(col, _is_numeric(self.dtypes[col]), quantile_k=self.quantile_k)
+                              for col in self.columns}
+            numeric_cols = [col for col in self.columns if self.summaries[col].numeric]
+            self.covariance = RunningCovariance(numeric_cols)
+            self.preview = preview_records(chunk)
+        else:
+            for col in self.columns:
+                self.dtypes[col] = _combine_dtypes(self.dtypes[col], chunk[col].dtype)
+
+        self.rows += len(chunk)
+        self.chunks += 1
+        for col, summary in self.summaries.items():
+            summary.update(chunk[col])
+
+        # Columns that turned non-numeric in this chunk are coerced to NaN
+        # here and dropped from the numeric results at the end
+        numeric_block = chunk[self.covariance.columns]
+        non_numeric = [col for col in numeric_block.columns if not _is_numeric(numeric_block[col].dtype)]
+        if non_numeric:
+            numeric_block = numeric_block.copy()
+            for col in non_numeric:
+                numeric_block[col] = pd.to_numeric(numeric_block[col], errors='coerce')
+
+        self.covariance.update(numeric_block)
+
+        self.reservoir.update(chunk)
+
+    def numerical_columns(self) -> List[str]:
+        """
+        Columns that are numeric over the whole file.
+        """
+        return [col for col in self.covariance.columns if _is_numeric(self.dtypes[col])]
+
+    def get_basic_info(self) -> Dict[str, Any]:
+        """
+        Get basic information about the dataset, exact over all chunks.
+        """
+        data_types = {col: dtype_label(self.dtypes[col]) for col in self.columns}
+
+        null_values = {}
+        for col in self.columns:
+            null_count = int(self.summaries[col].null_count)
+            null_percentage = round((null_count / self.rows) * 100, 2) if self.rows else 0.0
+            null_values[col] = {
+                'count': null_count,
+                'percentage': null_percentage
+            }
+
+        return {
+            'dimensions': {
+                'rows': int(self.rows),
+                'columns': len(self.columns)
+            },
+            'data_types': data_types,
+            'null_values': null_values
+        }
+
+    def get_statistical_summary(self) -> Dict[str, Any]:
+        """
+        Get statistical summary for numerical columns.
+
+        Count, mean, std, min and max are exact; median and quartiles come
+        from each column's quantile sketch. Outliers are counted in the row
+        sample against those quartiles and scaled to the column's count, so
+        they are exact only when the sample holds every row.
+        """
+        columns = [col for col in self.numerical_columns() if self.summaries[col].count]
+        quartiles = {col: self.summaries[col].quantiles.quantiles([0.25, 0.5, 0.75]) for col in columns}
+        sample = self.reservoir.sample[columns] if self.reservoir.sample is not None else pd.DataFrame(columns=columns)
+        sample = sample.apply(pd.to_numeric, errors='coerce')
+        outliers = IQROutliers.detect(sample, [quartiles[col][0] for col in columns],
+                                      [quartiles[col][2] for col in columns]).counts()
+        sampled = sample.notnull().sum()
+        outliers_exact = len(sample) == self.rows
+
+        stats = {}
+        for col in columns:
+            summary = self.summaries[col]
+            q25, median, q75 = quartiles[col]
+            if outliers_exact:
+                outlier_count = int(outliers[col])
+            else:
+                outlier_count = int(round(outliers[col] / sampled[col] * summary.count)) if sampled[col] else 0
+            stats[col] = {
+                'count': int(summary.count),
+                'mean': round(float(summary.mean), 4),
+                'median': round(float(median), 4),
+                'std': round(float(summary.std), 4),
+                'min': round(float(summary.min), 4),
+                'max': round(float(summary.max), 4),
+                'q25': round(float(q25), 4),
+                'q75': round(float(q75), 4),
+                'outliers': outlier_count,
+                'outliers_exact': outliers_exact,
+                'quantiles_exact': summary.quantiles.is_exact
+            }
+            if not summary.quantiles.is_exact:
+                stats[col]['quantile_rank_error'] = summary.quantiles.rank_error
+        return stats
+
+    def get_correlation_matrix(self) -> pd.DataFrame:
+        """
+        Exact pairwise-complete correlation matrix over all chunks.
+        """
+        return self.covariance.subset(self.numerical_columns()).correlation()
+
+    def analyze(self, outputs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Build the same result structure as ``DataAnalyzer.analyze``.
+        
+        Exact sections come from the accumulators; plots and insights run
+        as stages of a ``DataAnalyzer`` over the row sample.
+        """
+        if not self.columns:
+            return {'error': 'No data loaded'}
+
+        sample_analyzer = DataAnalyzer(progress=self.progress, plot_store=self.plot_store,
+                                       plot_renderer=self.plot_renderer, chart_mode=self.chart_mode,
+                                       render_profile=self.render_profile, plot_sources=self.plot_sources,
+                                       histogram_budget=self.histogram_budget,
+                                       boxplot_budget=self.boxplot_budget)
+        sample_analyzer.df = self.reservoir.sample
+        cache = sample_analyzer._stats()
+        # The heatmap uses the exact matrix accumulated over every chunk
+        cache.set('correlation_matrix', self.get_correlation_matrix())
+        exact_outputs = {
+            'basic_info': self.get_basic_info,
+            'statistical_summary': self.get_statistical_summary,
+            'data_preview': lambda: self.preview,
+        }
+
+        try:
+            outputs = outputs or ANALYSIS_OUTPUTS
+            # The exact sections are ready from the accumulators, so they are
+            # delivered before the sample stages start
+            exact_results = {}
+            for name in outputs:
+                if name in exact_outputs:
+                    exact_results[name] = exact_outputs[name]()
+                    emit(self.progress, 'section_ready', section=name, value=exact_results[name])
+            sample_results = sample_analyzer.run_stages([name for name in outputs if name not in exact_outputs])
+
+            results = {}
+            for name in outputs:
+                results[name] = exact_results[name] if name in exact_outputs else sample_results[name]
+            results['cache_stats'] = cache.report()
+            results['streaming'] = {
+                'chunks': self.chunks,
+                'chunksize': self.chunksize,
+                'sample_rows': len(sample_analyzer.df)
+            }
+            results['success'] = True
+
+            self.analysis_results = results
+            return results
+
+        except Exception as e:
+            print(f"Error during chunked analysis: {e}")
+            return {
+                'error': f'Error durante el análisis: {str(e)}',
+                'success': False
+            }
+        finally:
+            self.plot_paths.extend(sample_analyzer.plot_paths)
+
+    def cleanup_plots(self):
+        """
+        Clean up temporary plot files.
+        """
+        cleaner = DataAnalyzer()
+        cleaner.plot_paths = self.plot_paths
+        cleaner.cleanup_plots()
+        self.plot_paths = []
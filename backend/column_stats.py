@@ -0,0 +1,623 @@
+"""
+Running accumulators for column statistics.
+
+Every accumulator is updated one block of rows at a time, so statistics can
+be computed over data that never fits in memory at once.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class RunningMoments:
+    """
+    Count, mean, variance (Welford/Chan), min and max of a numeric column.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> 'RunningMoments':
+        """
+        Add a block of values; NaNs are ignored.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        block = RunningMoments()
+        block.count = int(values.size)
+        block.mean = float(values.mean())
+        block.m2 = float(((values - block.mean) ** 2).sum())
+        block.min = float(values.min())
+        block.max = float(values.max())
+        return self.merge(block)
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """
+        Fold another accumulator into this one (Chan et al. parallel update).
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """
+        Sample variance (ddof=1), matching ``pandas.Series.var``.
+        """
+        if self.count < 2:
+            return float('nan')
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+
+class RunningCovariance:
+    """
+    Pairwise-complete co-moments of a fixed set of numeric columns.
+
+    For every pair of columns it tracks the number of rows where both are
+    present, their means and second moments over those rows and their
+    co-moment, so the resulting correlation matrix equals ``DataFrame.corr()``
+    on the full data.
+    """
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        p = len(self.columns)
+        self.n = np.zeros((p, p))
+        self.mean_x = np.zeros((p, p))
+        self.m2_x = np.zeros((p, p))
+        self.comoment = np.zeros((p, p))
+
+    def update(self, block: pd.DataFrame) -> 'RunningCovariance':
+        """
+        Add a block of rows containing (at least) the tracked columns.
+        """
+        values = block[self.columns].to_numpy(dtype=float)
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+
+        # Centering on the block's column means keeps the raw sums small;
+        # every pairwise statistic is shift-invariant
+        counts = mask.sum(axis=0)
+        sums = np.where(present, values, 0.0).sum(axis=0)
+        shift = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        centered = np.where(present, values - shift, 0.0)
+
+        n = mask.T @ mask
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sum_x = centered.T @ mask
+            mean_x = np.where(n > 0, sum_x / n, 0.0)
+            m2_x = (centered ** 2).T @ mask - n * mean_x ** 2
+            comoment = centered.T @ centered - n * mean_x * mean_x.T
+
+        self._merge_arrays(n, mean_x + shift[:, None], m2_x, comoment)
+        return self
+
+    def merge(self, other: 'RunningCovariance') -> 'RunningCovariance':
+        """
+        Fold another accumulator over the same columns into this one.
+        """
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge covariance accumulators over different columns")
+        self._merge_arrays(other.n, other.mean_x, other.m2_x, other.comoment)
+        return self
+
+    def _merge_arrays(self, n_b, mean_b, m2_b, comoment_b):
+        total = self.n + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, self.n * n_b / total, 0.0)
+            fraction = np.where(total > 0, n_b / total, 0.0)
+        delta = mean_b - self.mean_x
+        self.mean_x = self.mean_x + delta * fraction
+        # mean_x[i, j] is the mean of column i over rows shared with j, so
+        # the matching delta of column j is the transpose
+        self.m2_x = self.m2_x + m2_b + delta ** 2 * weight
+        self.comoment = self.comoment + comoment_b + delta * delta.T * weight
+        self.n = total
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pearson correlation matrix over pairwise-complete rows.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.sqrt(self.m2_x * self.m2_x.T)
+        corr[self.n < 2] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(np.diag(self.m2_x) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def subset(self, columns: List[str]) -> 'RunningCovariance':
+        """
+        Accumulator restricted to some of the tracked columns.
+        """
+        positions = [self.columns.index(col) for col in columns]
+        result = RunningCovariance(columns)
+        grid = np.ix_(positions, positions)
+        result.n = self.n[grid]
+        result.mean_x = self.mean_x[grid]
+        result.m2_x = self.m2_x[grid]
+        result.comoment = self.comoment[grid]
+        return result
+
+
+class RowReservoir:
+    """
+    Uniform random sample of at most ``size`` rows from a stream of blocks.
+
+    Each row gets a random priority and the rows with the smallest
+    priorities are kept, which is a uniform sample without replacement.
+    """
+
+    def __init__(self, size: int, seed: Optional[int] = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.sample: Optional[pd.DataFrame] = None
+        self.priorities = np.empty(0)
+
+    def update(self, block: pd.DataFrame) -> 'RowReservoir':
+        priorities = self.rng.random(len(block))
+        if self.sample is None:
+            combined = block
+            combined_priorities = priorities
+        else:
+            combined = pd.concat([self.sample, block], ignore_index=True)
+            combined_priorities = np.concatenate([self.priorities, priorities])
+
+        if len(combined) > self.size:
+            keep = np.sort(np.argpartition(combined_priorities, self.size - 1)[:self.size])
+            combined = combined.iloc[keep].reset_index(drop=True)
+            combined_priorities = combined_priorities[keep]
+
+        self.sample = combined.reset_index(drop=True)
+        self.priorities = combined_priorities
+        return self
+
+
+class QuantileSketch:
+    """
+    Mergeable KLL quantile sketch.
+
+    Values are kept in a hierarchy of compactors; an item at level ``h``
+    stands for ``2**h`` original values. When a level overflows it is
+    sorted and every other item is promoted to the next level, so memory
+    stays at O(k log(n / k)) while rank error stays around O(1 / k).
+    While nothing has been compacted the sketch holds every value and its
+    quantiles are exact.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = 0):
+        self.k = k
+        self.n = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def k_for_error(rank_error: float) -> int:
+        """
+        Compactor size giving roughly ``rank_error`` normalized rank error.
+        """
+        return max(8, int(np.ceil(2.0 / rank_error)))
+
+    @classmethod
+    def for_error(cls, rank_error: float, seed: Optional[int] = 0) -> 'QuantileSketch':
+        """
+        Sketch sized for a target normalized rank error (e.g. 0.01).
+        """
+        return cls(cls.k_for_error(rank_error), seed)
+
+    @property
+    def rank_error(self) -> float:
+        """
+        Normalized rank error the sketch is sized for (0 while exact).
+        """
+        return 0.0 if self.is_exact else 2.0 / self.k
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """
+        Add a block of values; NaNs are ignored.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.n += int(values.size)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Fold another sketch into this one.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item stays behind so the promoted half is exact
+                if len(items) % 2:
+                    keep, items = items[-1:], items[:-1]
+                else:
+                    keep = np.empty(0)
+                offset = int(self.rng.integers(2))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+                self.levels[level] = keep
+                # Capacities depend on the number of levels, so start over
+                level = 0
+                continue
+            level += 1
+
+    @property
+    def is_exact(self) -> bool:
+        """
+        True while the sketch still holds every value it has seen.
+        """
+        return len(self.levels) == 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimated ``q`` quantile (0 <= q <= 1).
+        """
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs: List[float]) -> np.ndarray:
+        """
+        Estimated quantiles for several probabilities at once.
+        """
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        if self.is_exact:
+            # Same linear interpolation as pandas
+            return np.quantile(self.levels[0], qs)
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        targets = np.asarray(qs, dtype=float) * cumulative[-1]
+        positions = np.searchsorted(cumulative, targets, side='left')
+        return items[np.clip(positions, 0, len(items) - 1)]
+
+
+class TopKSketch:
+    """
+    Mergeable Misra-Gries heavy-hitters summary with ``k`` counters.
+
+    Reported counts underestimate true counts by at most
+    ``pruned_weight``, which is bounded by n / (k + 1).
+    """
+
+    def __init__(self, k: int = 50):
+        self.k = k
+        self.n = 0
+        self.counters: Dict[Any, int] = {}
+        self.pruned_weight = 0
+
+    def update(self, values) -> 'TopKSketch':
+        """
+        Add a block of non-null values.
+        """
+        counts = pd.Series(values).value_counts(dropna=True)
+        block = TopKSketch(self.k)
+        block.n = int(counts.sum())
+        block.counters = {key: int(count) for key, count in counts.items()}
+        return self.merge(block)
+
+    def merge(self, other: 'TopKSketch') -> 'TopKSketch':
+        """
+        Fold another sketch into this one.
+        """
+        counters = dict(self.counters)
+        for key, count in other.counters.items():
+            counters[key] = counters.get(key, 0) + count
+        self.n += other.n
+        self.pruned_weight += other.pruned_weight
+
+        if len(counters) > self.k:
+            # Subtracting the (k+1)-th largest count keeps at most k counters
+            threshold = sorted(counters.values(), reverse=True)[self.k]
+            counters = {key: count - threshold for key, count in counters.items() if count > threshold}
+            self.pruned_weight += threshold
+
+        self.counters = counters
+        return self
+
+    @property
+    def is_exact(self) -> bool:
+        return self.pruned_weight == 0
+
+    def top(self, n: int = 10) -> List[Tuple[Any, int]]:
+        """
+        The ``n`` most frequent values with their (lower-bound) counts.
+        """
+        return sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class DistinctCounter:
+    """
+    Mergeable HyperLogLog estimate of the number of distinct non-null values.
+
+    Uses ``2 ** precision`` one-byte registers regardless of cardinality;
+    the relative standard error of ``estimate`` is 1.04 / sqrt(2 ** precision).
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(len(self.registers))
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        # Split into 32-bit halves so the float exponent is exact
+        high = (values >> np.uint64(32)).astype(float)
+        low = (values & np.uint64(0xFFFFFFFF)).astype(float)
+        return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+    def update(self, values) -> 'DistinctCounter':
+        """
+        Add a block of non-null values.
+        """
+        values = pd.Series(values).to_numpy()
+        if values.size == 0:
+            return self
+
+        # Unlike nunique, hashing without categorizing never builds the set
+        # of unique values
+        hashes = pd.util.hash_array(values, categorize=False)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        max_rank = 64 - self.precision + 1
+        ranks = np.minimum(65 - self._bit_length(rest), max_rank).astype(np.uint8)
+        np.maximum.at(self.registers, index, ranks)
+        return self
+
+    def merge(self, other: 'DistinctCounter') -> 'DistinctCounter':
+        """
+        Fold another counter with the same precision into this one.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge distinct counters with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Linear counting is far more accurate at small cardinalities
+        if raw <= 2.5 * m and zeros > 0:
+            return float(m * np.log(m / zeros))
+        return float(raw)
+
+    def exceeds(self, limit: float, sigmas: float = 3.0) -> bool:
+        """
+        Whether the distinct count is above ``limit`` with high confidence.
+        """
+        estimate = self.estimate
+        return estimate * (1 - sigmas * self.relative_error) > limit + 1
+
+
+class ColumnSummary:
+    """
+    Mergeable summary of one column: counts, moments, min/max and sketches.
+
+    Summaries of disjoint parts of a column (chunks, byte-range shards,
+    worker processes) combine with ``merge`` into the summary of the whole
+    column, in any grouping.
+    """
+
+    def __init__(self, name: str, numeric: bool, quantile_k: int = 200, top_k: int = 50):
+        self.name = name
+        self.numeric = numeric
+        self.count = 0
+        self.null_count = 0
+        self.sum = 0.0
+        self.moments = RunningMoments() if numeric else None
+        self.quantiles = QuantileSketch(quantile_k) if numeric else None
+        self.top_k = None if numeric else TopKSketch(top_k)
+        self.distinct = DistinctCounter()
+
+    def update(self, series: pd.Series) -> 'ColumnSummary':
+        """
+        Add a block of the column.
+        """
+        nulls = series.isnull()
+        null_count = int(nulls.sum())
+        self.null_count += null_count
+        self.count += len(series) - null_count
+
+        if self.numeric:
+            values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+            finite = values[~np.isnan(values)]
+            self.sum += float(finite.sum())
+            self.moments.update(finite)
+            self.quantiles.update(finite)
+        else:
+            self.top_k.update(series[~nulls])
+        self.distinct.update(series[~nulls])
+        return self
+
+    def merge_from(self, other: 'ColumnSummary') -> 'ColumnSummary':
+        """
+        Fold another summary of the same column into this one.
+        """
+        if other.numeric != self.numeric:
+            raise ValueError(f"Cannot merge numeric and non-numeric summaries of '{self.name}'")
+        self.count += other.count
+        self.null_count += other.null_count
+        self.sum += other.sum
+        if self.numeric:
+            self.moments.merge(other.moments)
+            self.quantiles.merge(other.quantiles)
+        else:
+            self.top_k.merge(other.top_k)
+        self.distinct.merge(other.distinct)
+        return self
+
+    @property
+    def total(self) -> int:
+        return self.count + self.null_count
+
+    @property
+    def mean(self) -> float:
+        return self.moments.mean if self.numeric and self.moments.count else float('nan')
+
+    @property
+    def m2(self) -> float:
+        return self.moments.m2 if self.numeric else float('nan')
+
+    @property
+    def min(self) -> float:
+        return self.moments.min if self.numeric and self.moments.count else float('nan')
+
+    @property
+    def max(self) -> float:
+        return self.moments.max if self.numeric and self.moments.count else float('nan')
+
+    @property
+    def std(self) -> float:
+        return self.moments.std if self.numeric else float('nan')
+
+
+def merge(a, b):
+    """
+    Combine two partial summaries without modifying either of them.
+
+    Works for ``ColumnSummary``, the sketches and accumulators in this
+    module, and for profiles (dicts of column name to ``ColumnSummary``).
+    """
+    if isinstance(a, dict):
+        result = {name: copy.deepcopy(summary) for name, summary in a.items()}
+        for name, summary in b.items():
+            if name in result:
+                result[name].merge_from(summary)
+            else:
+                result[name] = copy.deepcopy(summary)
+        return result
+
+    result = copy.deepcopy(a)
+    if isinstance(result, ColumnSummary):
+        return result.merge_from(b)
+    return result.merge(b)
+
+
+def profile_frame(df: pd.DataFrame, quantile_k: int = 200, top_k: int = 50) -> Dict[str, ColumnSummary]:
+    """
+    Summaries of every column of a DataFrame (or a chunk of one).
+    """
+    profile = {}
+    for col in df.columns:
+        numeric = df[col].dtype.kind in 'iuf'
+        profile[col] = ColumnSummary(col, numeric, quantile_k, top_k).update(df[col])
+    return profile
+
+
+def profile_numeric(df: pd.DataFrame, quantiles: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Per-column metrics of the numeric columns of a DataFrame, computed for
+    all columns together with vectorized passes over one 2-D array.
+
+    Returns one row per column with ``count``, ``null_count``, ``mean``,
+    ``std``, ``min``, ``max`` and ``skew`` (same conventions as the pandas
+    reductions), plus one exact quantile column per entry of
+    ``quantiles`` (name to probability, linear interpolation).
+    """
+    values = df.to_numpy(dtype=float, na_value=np.nan)
+    missing = np.isnan(values)
+    count = (~missing).sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(missing, 0.0, values).sum(axis=0) / count
+        centered = np.where(missing, 0.0, values - mean)
+        squared = centered * centered
+        m2 = squared.sum(axis=0)
+        m3 = (squared * centered).sum(axis=0)
+        # Rounding noise of constant columns must not look like spread. The
+        # computed mean is off by up to about log2(count) + 1 roundings of
+        # the largest value, so the noise scales with the column, not 1
+        scale = np.where(missing, 0.0, np.abs(values)).max(axis=0, initial=0.0)
+        noise = (np.log2(np.maximum(count, 1)) + 1) * np.finfo(float).eps * scale
+        m2 = np.where(m2 <= count * noise ** 2, 0.0, m2)
+
+        std = np.where(count > 1, np.sqrt(m2 / (count - 1)), np.nan)
+        skew = (count * np.sqrt(count - 1) / (count - 2)) * (m3 / m2 ** 1.5)
+        skew = np.where(m2 == 0, 0.0, skew)
+        skew = np.where(count < 3, np.nan, skew)
+
+    has_values = count > 0
+    minimum = np.where(has_values, np.where(missing, np.inf, values).min(axis=0, initial=np.inf), np.nan)
+    maximum = np.where(has_values, np.where(missing, -np.inf, values).max(axis=0, initial=-np.inf), np.nan)
+
+    profile = pd.DataFrame({
+        'count': count,
+        'null_count': missing.sum(axis=0),
+        'mean': mean,
+        'std': std,
+        'min': minimum,
+        'max': maximum,
+        'skew': skew,
+    }, index=df.columns)
+
+    if quantiles:
+        # NaNs sort last, so the first ``count`` rows of each column are its values
+        ordered = np.sort(values, axis=0)
+        columns = np.arange(values.shape[1])
+        last = np.maximum(count - 1, 0)
+        for name, q in quantiles.items():
+            position = q * last
+            lower = np.floor(position).astype(int)
+            upper = np.minimum(lower + 1, last)
+            fraction = position - lower
+            low_values = ordered[lower, columns] if len(ordered) else np.full(len(columns), np.nan)
+            high_values = ordered[upper, columns] if len(ordered) else np.full(len(columns), np.nan)
+            with np.errstate(invalid='ignore'):
+                result = np.where(fraction == 0, low_values, low_values + (high_values - low_values) * fraction)
+            profile[name] = np.where(has_values, result, np.nan)
+
+    return profile
@@ -8,8 +8,41 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-for-dataapp1'
     UPLOAD_FOLDER = os.path.abspath('../uploads')
     STATIC_FOLDER = os.path.abspath('../static')
+    PLOTS_FOLDER = os.path.join(STATIC_FOLDER, 'plots')  # Gráficos guardados por su hash
+    PLOTS_MAX_AGE = 365 * 24 * 3600  # Segundos que el navegador puede cachear un gráfico
+    PLOTS_MAX_BYTES = 512 * 1024 * 1024  # Tamaño máximo del directorio de gráficos
+    PLOTS_TTL = 24 * 3600  # Segundos sin usar antes de borrar un gráfico (mayor que RESULT_CACHE_TTL)
+    PLOT_REFS_FOLDER = os.path.abspath('../plot_refs')  # Claves de render -> gráfico, fuera del directorio público
+    PLOT_SOURCES_FOLDER = os.path.abspath('../plot_sources')  # Datos de los gráficos que se generan al pedirlos
+    PLOT_SOURCES_MAX_BYTES = 1024 * 1024 * 1024  # Tamaño máximo del directorio de datos de gráficos
+    PLOT_SOURCES_TTL = 24 * 3600  # Segundos sin usar antes de borrar los datos de un gráfico
+    UPLOAD_MAX_AGE = 3 * 3600  # Segundos tras los que se borra un archivo subido huérfano
+    JANITOR_INTERVAL = 300  # Segundos entre limpiezas de gráficos y archivos subidos
     MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB
     ALLOWED_EXTENSIONS = {'csv'}
+    CSV_SNIFF_SAMPLE_SIZE = 64 * 1024  # Bytes inspeccionados para detectar el dialecto CSV
+    CHUNKED_ANALYSIS_THRESHOLD = 20 * 1024 * 1024  # Archivos mayores se analizan por bloques
+    ANALYSIS_CHUNKSIZE = 100_000  # Filas por bloque en el análisis por bloques
+    ANALYSIS_SAMPLE_ROWS = 50_000  # Filas de muestra para gráficos e insights
+    QUANTILE_APPROX_ROW_THRESHOLD = 250_000  # Desde aquí los cuartiles son aproximados
+    QUANTILE_RANK_ERROR = 0.01  # Error de rango objetivo de los cuartiles aproximados
+    DISTINCT_APPROX_ROW_THRESHOLD = 100_000  # Desde aquí los conteos de valores únicos son aproximados
+    HISTOGRAM_BUDGET = 12  # Histogramas dibujados, de los mejor puntuados
+    BOXPLOT_BUDGET = 5  # Boxplots dibujados, de los mejor puntuados
+    RESULT_CACHE_SIZE = 32  # Resultados de análisis guardados en memoria
+    RESULT_CACHE_TTL = 3600  # Segundos que un resultado sigue siendo válido
+    RESULT_CACHE_DIR = None  # Directorio de la caché en disco (None la desactiva)
+    RESULT_CACHE_DISK_SIZE = 256  # Resultados guardados en disco
+    # Procesos que ejecutan análisis en paralelo: por defecto la mitad de los
+    # núcleos, para que sus procesos de gráficos tengan núcleos propios
+    ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS') or max(1, (os.cpu_count() or 1) // 2))
+    # Procesos por análisis que generan gráficos (1: en el mismo proceso); cada
+    # proceso de análisis tiene los suyos, así que se reparten los núcleos
+    PLOT_WORKERS = int(os.environ.get('PLOT_WORKERS') or max(1, (os.cpu_count() or 1) // ANALYSIS_WORKERS))
+    RENDER_PROFILE = 'web-preview'  # Resolución y formato de los gráficos si la petición no elige otro
+    ANALYSIS_MAX_PENDING_JOBS = 32  # Trabajos en cola o en curso antes de rechazar (503)
+    JOB_RESULT_TTL = 600  # Segundos que se conserva el resultado de un trabajo
+    JOB_EVENTS_KEEPALIVE = 15  # Segundos entre comentarios keep-alive del flujo de eventos
 
 class TestConfig(Config):
     """Configuración para pruebas"""
@@ -0,0 +1,90 @@
+"""
+Correlation matrix and strongest correlated pairs of numeric columns.
+
+The matrix is computed with matrix products instead of ``DataFrame.corr()``,
+which loops over the pairs of columns: without missing values the columns
+are standardized once and correlated with a single product; with missing
+values every pair uses the rows where both columns are present, as
+``DataFrame.corr()`` does, through ``RunningCovariance``. Pairs are searched
+over the upper triangle of the matrix at once instead of one lookup per
+pair.
+
+Matrices too wide to read are cut down to their most correlated columns,
+ordered by hierarchical clustering so correlated columns sit together.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+
+from column_stats import RunningCovariance
+
+
+def pairwise_correlation(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pearson correlation matrix of the columns of ``frame``, equal to
+    ``frame.corr()``: pairwise-complete rows, NaN for constant columns and
+    pairs sharing fewer than two rows.
+    """
+    values = frame.to_numpy(dtype=float, na_value=np.nan)
+    if np.isnan(values).any():
+        # Columns are addressed by position, names may repeat
+        covariance = RunningCovariance(list(range(values.shape[1])))
+        corr = covariance.update(pd.DataFrame(values)).correlation().to_numpy()
+    else:
+        centered = values - values.mean(axis=0)
+        norms = np.sqrt((centered ** 2).sum(axis=0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            standardized = centered / norms
+        corr = np.clip(standardized.T @ standardized, -1.0, 1.0)
+        varying = (norms > 0) & (len(values) > 1)
+        corr[~varying, :] = np.nan
+        corr[:, ~varying] = np.nan
+        np.fill_diagonal(corr, np.where(varying, 1.0, np.nan))
+    return pd.DataFrame(corr, index=frame.columns, columns=frame.columns)
+
+
+def correlated_pairs(matrix: pd.DataFrame, threshold: float = 0.0,
+                     k: Optional[int] = None) -> List[Tuple[Any, Any, float]]:
+    """
+    ``(column, column, correlation)`` of the pairs whose absolute
+    correlation is above ``threshold`` (at least 0), strongest first and at
+    most ``k`` of them. Equally strong pairs keep the matrix order.
+    """
+    values = matrix.to_numpy(dtype=float)
+    # The lower triangle and the diagonal become 0 and never pass the
+    # threshold; NaN never does either
+    strength = np.abs(np.triu(values, 1)).ravel()
+    found = np.flatnonzero(strength > threshold)
+    if k is not None and len(found) > k:
+        kth = np.partition(strength[found], len(found) - k)[len(found) - k]
+        found = found[strength[found] >= kth]
+    found = found[np.lexsort((found, -strength[found]))][:k]
+
+    rows, cols = np.divmod(found, values.shape[1])
+    columns = matrix.columns
+    return [(columns[i], columns[j], float(values[i, j])) for i, j in zip(rows, cols)]
+
+
+def clustered_matrix(matrix: pd.DataFrame, max_columns: Optional[int] = None) -> pd.DataFrame:
+    """
+    Correlation matrix restricted to the ``max_columns`` columns most
+    correlated with some other column, with rows and columns ordered by
+    average-linkage clustering on ``1 - |correlation|``.
+    """
+    strength = np.abs(np.nan_to_num(matrix.to_numpy(dtype=float)))
+    np.fill_diagonal(strength, 0.0)
+    keep = np.arange(len(strength))
+    if max_columns is not None and len(keep) > max_columns:
+        keep = np.sort(np.argsort(-strength.max(axis=0), kind='stable')[:max_columns])
+        strength = strength[np.ix_(keep, keep)]
+
+    if len(keep) > 2:
+        distance = 1.0 - strength
+        np.fill_diagonal(distance, 0.0)
+        tree = linkage(squareform(distance, checks=False), method='average', optimal_ordering=True)
+        keep = keep[leaves_list(tree)]
+    return matrix.iloc[keep, keep]
@@ -0,0 +1,281 @@
+"""
+CSV dialect detection on a bounded prefix of the data.
+
+Encoding, separator, quoting and number format are inferred from the first
+``sample_size`` bytes only, so the cost of sniffing does not grow with the
+size of the file. A file whose prefix is ASCII or UTF-8 may still hold
+bytes of another encoding further on; ``read_with_fallback`` then reads it
+again with a single-byte encoding.
+"""
+
+import codecs
+import csv
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import chardet
+
+# Number of leading bytes inspected by default
+DEFAULT_SAMPLE_SIZE = 64 * 1024
+
+# Number of sample lines used to vote on separator, quoting and decimals
+MAX_SAMPLE_LINES = 20
+
+SEPARATORS = [',', ';', '\t', '|']
+QUOTE_CHARS = ['"', "'"]
+
+# UTF-32 marks must be checked before UTF-16 because they share a prefix
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Encodings tried, in order, when a source sniffed as ASCII or UTF-8 fails
+# to decode past its sample: cp1252 is what spreadsheets usually export and
+# latin-1 decodes any byte
+FALLBACK_ENCODINGS = ['cp1252', 'latin-1']
+
+DECIMAL_COMMA_RE = re.compile(r'^-?\d+,\d+$')
+THOUSANDS_DOT_RE = re.compile(r'^-?\d{1,3}(\.\d{3})+(,\d+)?$')
+
+
+class CSVDialect:
+    """
+    Parsing parameters detected for a CSV source.
+
+    The same object can be reused to parse the full file, further chunks of
+    it, or other files exported by the same system.
+    """
+
+    def __init__(self, encoding: Optional[str] = 'utf-8', separator: str = ',',
+                 quotechar: str = '"', decimal: str = '.', thousands: Optional[str] = None,
+                 has_bom: bool = False, encoding_source: str = 'default'):
+        self.encoding = encoding
+        self.separator = separator
+        self.quotechar = quotechar
+        self.decimal = decimal
+        self.thousands = thousands
+        self.has_bom = has_bom
+        self.encoding_source = encoding_source
+
+    def read_csv_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments for ``pd.read_csv`` matching this dialect.
+        """
+        kwargs = {
+            'sep': self.separator,
+            'quotechar': self.quotechar,
+            'decimal': self.decimal,
+        }
+        if self.thousands:
+            kwargs['thousands'] = self.thousands
+        if self.encoding:
+            kwargs['encoding'] = self.encoding
+        return kwargs
+
+    def with_encoding(self, encoding: str) -> 'CSVDialect':
+        """
+        Same dialect read with another encoding.
+        """
+        return CSVDialect(encoding=encoding, separator=self.separator, quotechar=self.quotechar,
+                          decimal=self.decimal, thousands=self.thousands, encoding_source='fallback')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serializable representation of the dialect.
+        """
+        return {
+            'encoding': self.encoding,
+            'separator': self.separator,
+            'quotechar': self.quotechar,
+            'decimal': self.decimal,
+            'thousands': self.thousands,
+            'has_bom': self.has_bom,
+            'encoding_source': self.encoding_source,
+        }
+
+    def __repr__(self) -> str:
+        return (f"CSVDialect(encoding={self.encoding!r}, separator={self.separator!r}, "
+                f"quotechar={self.quotechar!r}, decimal={self.decimal!r}, "
+                f"thousands={self.thousands!r})")
+
+
+def detect_encoding(sample: bytes) -> CSVDialect:
+    """
+    Detect the encoding of a byte sample, returning a dialect with only the
+    encoding fields filled in.
+
+    BOMs and ASCII/UTF-8 content are resolved without calling chardet.
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return CSVDialect(encoding=encoding, has_bom=True, encoding_source='bom')
+
+    # Pure ASCII is decoded correctly by UTF-8, which also covers any
+    # accented text past the sampled prefix
+    if sample.isascii():
+        return CSVDialect(encoding='utf-8', encoding_source='ascii')
+
+    # The sample may end in the middle of a multi-byte sequence, so decode
+    # incrementally and let the decoder hold back an incomplete tail
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return CSVDialect(encoding='utf-8', encoding_source='utf-8')
+    except UnicodeDecodeError:
+        pass
+
+    detected = chardet.detect(sample)
+    if detected.get('encoding') and detected['confidence'] > 0.7:
+        return CSVDialect(encoding=detected['encoding'], encoding_source='chardet')
+
+    # Not UTF-8 and no confident guess: latin-1 maps every byte
+    return CSVDialect(encoding='latin-1', encoding_source='fallback')
+
+
+T = TypeVar('T')
+
+
+def read_with_fallback(read: Callable[[CSVDialect], T], dialect: CSVDialect) -> Tuple[T, CSVDialect]:
+    """
+    ``read(dialect)`` and the dialect it succeeded with.
+
+    If the encoding was inferred from an ASCII or UTF-8 sample and reading
+    fails to decode, the read is retried with each of ``FALLBACK_ENCODINGS``.
+    """
+    try:
+        return read(dialect), dialect
+    except UnicodeDecodeError:
+        if dialect.encoding_source not in ('ascii', 'utf-8'):
+            raise
+    for encoding in FALLBACK_ENCODINGS[:-1]:
+        try:
+            fallback = dialect.with_encoding(encoding)
+            return read(fallback), fallback
+        except UnicodeDecodeError:
+            continue
+    fallback = dialect.with_encoding(FALLBACK_ENCODINGS[-1])
+    return read(fallback), fallback
+
+
+def _sample_lines(text: str, truncated: bool) -> List[str]:
+    """
+    First non-empty lines of the sample, without splitting the whole text.
+    """
+    lines = text.split('\n', MAX_SAMPLE_LINES + 1)
+    # The last piece is either the unsplit remainder or a line cut short by
+    # the sample boundary
+    if truncated or len(lines) > MAX_SAMPLE_LINES:
+        lines = lines[:-1] or lines
+    return [line.rstrip('\r') for line in lines[:MAX_SAMPLE_LINES] if line.strip()]
+
+
+def _detect_quotechar(lines: List[str]) -> str:
+    """
+    Pick the quote character that wraps whole fields in the sample.
+    """
+    best_quote, best_count = '"', 0
+    for quote in QUOTE_CHARS:
+        pattern = re.compile(r'(^|[,;\t|])' + re.escape(quote))
+        count = sum(len(pattern.findall(line)) for line in lines)
+        if count > best_count:
+            best_quote, best_count = quote, count
+    return best_quote
+
+
+def _detect_separator(lines: List[str], quotechar: str) -> str:
+    """
+    Pick the separator that yields a consistent number of fields per line.
+
+    Separators giving exactly the same field count on every line (header
+    included) win over ones that merely vary little, which keeps decimal
+    commas in ``;`` files from being mistaken for separators.
+    """
+    separator_scores = {}
+
+    for sep in SEPARATORS:
+        counts = [len(row) - 1 for row in csv.reader(lines, delimiter=sep, quotechar=quotechar)]
+        # Check if separator count is consistent across lines
+        if counts and len(set(counts)) <= 2 and max(counts) > 0:
+            separator_scores[sep] = (len(set(counts)) == 1, max(counts))
+
+    if separator_scores:
+        return max(separator_scores, key=separator_scores.get)
+    return ','  # Default to comma
+
+
+def _detect_number_format(lines: List[str], separator: str, quotechar: str) -> Dict[str, Optional[str]]:
+    """
+    Detect the ``;``-separated decimal-comma convention (``1.234,5``).
+    """
+    if separator == ',':
+        return {'decimal': '.', 'thousands': None}
+
+    decimal_comma = 0
+    thousands_dot = 0
+    for row in csv.reader(lines[1:], delimiter=separator, quotechar=quotechar):
+        for field in row:
+            field = field.strip()
+            if DECIMAL_COMMA_RE.match(field):
+                decimal_comma += 1
+            elif THOUSANDS_DOT_RE.match(field):
+                thousands_dot += 1
+
+    if decimal_comma == 0:
+        return {'decimal': '.', 'thousands': None}
+    return {'decimal': ',', 'thousands': '.' if thousands_dot else None}
+
+
+def _dialect_from_lines(lines: List[str], encoding: Optional[CSVDialect] = None) -> CSVDialect:
+    """
+    Build a dialect from sample lines and an optional encoding detection.
+    """
+    quotechar = _detect_quotechar(lines)
+    separator = _detect_separator(lines, quotechar)
+    number_format = _detect_number_format(lines, separator, quotechar)
+
+    dialect = CSVDialect(
+        encoding=None,
+        separator=separator,
+        quotechar=quotechar,
+        decimal=number_format['decimal'],
+        thousands=number_format['thousands'],
+    )
+    if encoding is not None:
+        dialect.encoding = encoding.encoding
+        dialect.has_bom = encoding.has_bom
+        dialect.encoding_source = encoding.encoding_source
+    return dialect
+
+
+def sniff_text(text: str, sample_size: int = DEFAULT_SAMPLE_SIZE) -> CSVDialect:
+    """
+    Detect the dialect of already-decoded CSV text from its first
+    ``sample_size`` characters. The returned dialect has no encoding.
+    """
+    lines = _sample_lines(text[:sample_size], truncated=len(text) > sample_size)
+    return _dialect_from_lines(lines)
+
+
+def sniff_bytes(raw_data: bytes, sample_size: int = DEFAULT_SAMPLE_SIZE) -> CSVDialect:
+    """
+    Detect the full dialect of raw CSV bytes from their first
+    ``sample_size`` bytes.
+    """
+    sample = raw_data[:sample_size]
+    encoding = detect_encoding(sample)
+    text = sample.decode(encoding.encoding, errors='ignore')
+    lines = _sample_lines(text, truncated=len(raw_data) > sample_size)
+    return _dialect_from_lines(lines, encoding)
+
+
+def sniff_file(file_path: str, sample_size: int = DEFAULT_SAMPLE_SIZE) -> CSVDialect:
+    """
+    Detect the dialect of a CSV file reading only its first ``sample_size``
+    bytes.
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size + 1)
+    return sniff_bytes(sample, sample_size=sample_size)
@@ -1,30 +1,182 @@
 import pandas as pd
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
-from io import StringIO
+from io import StringIO, BytesIO
 import chardet
 import os
-import tempfile
+import time
 import base64
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Callable, Dict, List, Any, Tuple, Optional
+from artifact_store import ArtifactStore
+from category_index import CategoryIndex
+from chart_data import boxplot_data, grouped_boxplot_data, heatmap_data, histogram_data, iqr_box
+from column_stats import DistinctCounter, QuantileSketch, TopKSketch, profile_numeric
+from correlation import clustered_matrix, correlated_pairs, pairwise_correlation
+from csv_dialect import (CSVDialect, DEFAULT_SAMPLE_SIZE, detect_encoding, read_with_fallback, sniff_bytes,
+                         sniff_file, sniff_text)
+from outliers import IQROutliers
+from plot_rendering import (DEFAULT_RENDER_PROFILE, HEATMAP_ANNOTATION_LIMIT, RENDER_PROFILES, PlotRenderer,
+                            render_boxplot, render_grouped_boxplot, render_heatmap, render_histogram,
+                            render_key, source_key)
+from plot_selection import association_score, distribution_score, eta_squared, is_identifier
+from plot_sources import plot_descriptor
+from progress import ProgressCallback, ProgressReader, emit
+from stage_graph import StageGraph
+from stats_cache import StatsCache
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
-# Set style for plots
-plt.style.use('default')
-sns.set_palette("husl")
+# Above this many rows, quartiles come from a one-pass quantile sketch
+QUANTILE_APPROX_ROW_THRESHOLD = 250_000
+
+# Target normalized rank error of approximate quartiles
+QUANTILE_RANK_ERROR = 0.01
+
+# Values fed to the quantile sketch per update
+QUANTILE_BLOCK_SIZE = 65_536
+
+# Quartile columns of the numeric profile
+QUARTILES = {'q25': 0.25, 'median': 0.5, 'q75': 0.75}
+
+# Above this many rows, distinct counts and top categories of a column come
+# from HyperLogLog and heavy-hitters sketches unless the exact count matters
+DISTINCT_APPROX_ROW_THRESHOLD = 100_000
+
+# Counters kept by the heavy-hitters sketch of top categories
+TOP_CATEGORIES_K = 50
+
+# Categories shown per grouped plot
+GROUPED_PLOT_CATEGORIES = 10
+
+# Plots drawn per analysis, the best ranked first
+HISTOGRAM_BUDGET = 12
+BOXPLOT_BUDGET = 5
+
+# Columns kept in the heatmap of wider data, the most correlated ones
+HEATMAP_MAX_COLUMNS = 40
+
+# Text columns with more distinct values than this share of the rows
+# (names, identifiers) are not used to group plots
+MAX_GROUPING_DISTINCT_SHARE = 0.5
+
+# Chart modes: 'image' renders images on the server, 'data' returns the
+# compact payload of each chart for the browser to draw, 'lazy' describes
+# each plot and renders it only when its URL is first requested
+CHART_MODES = ('image', 'data', 'lazy')
+
+# Payload builder taking the same arguments as each render function
+CHART_PAYLOADS = {
+    render_heatmap: heatmap_data,
+    render_histogram: histogram_data,
+    render_boxplot: boxplot_data,
+    render_grouped_boxplot: grouped_boxplot_data,
+}
+
+# Analysis stages: each names the DataAnalyzer method producing it and the
+# stages it needs. Only the stages required by the requested outputs run.
+ANALYSIS_STAGES = StageGraph()
+ANALYSIS_STAGES.add('numerical_data', 'get_numerical_data', memoized=True)
+ANALYSIS_STAGES.add('categorical_data', 'get_categorical_data', memoized=True)
+ANALYSIS_STAGES.add('null_counts', 'get_null_counts', memoized=True)
+ANALYSIS_STAGES.add('duplicate_rows', 'get_duplicate_count', memoized=True)
+ANALYSIS_STAGES.add('numeric_profile', 'get_numeric_profile', ['numerical_data'], memoized=True)
+ANALYSIS_STAGES.add('correlation_matrix', 'get_correlation_matrix', ['numerical_data'], memoized=True)
+ANALYSIS_STAGES.add('outliers', 'get_outliers', ['numerical_data', 'numeric_profile'], memoized=True)
+ANALYSIS_STAGES.add('basic_info', 'get_basic_info', ['null_counts'])
+ANALYSIS_STAGES.add('statistical_summary', 'get_statistical_summary', ['numeric_profile', 'outliers'])
+ANALYSIS_STAGES.add('data_preview', 'get_data_preview')
+ANALYSIS_STAGES.add('plot_ranking', 'rank_plots', ['numeric_profile', 'categorical_data'], memoized=True)
+ANALYSIS_STAGES.add('correlation_heatmap', 'create_correlation_heatmap', ['correlation_matrix'])
+ANALYSIS_STAGES.add('histograms', 'create_histograms', ['numeric_profile', 'plot_ranking'])
+ANALYSIS_STAGES.add('boxplots', 'create_boxplots',
+                    ['numerical_data', 'categorical_data', 'numeric_profile', 'outliers', 'plot_ranking'])
+ANALYSIS_STAGES.add('ai_insights', 'generate_ai_insights',
+                    ['null_counts', 'duplicate_rows', 'numeric_profile', 'correlation_matrix', 'outliers',
+                     'categorical_data'])
+
+# Outputs returned by ``analyze`` when none are requested explicitly
+ANALYSIS_OUTPUTS = ['basic_info', 'statistical_summary', 'data_preview', 'correlation_heatmap',
+                    'histograms', 'boxplots', 'ai_insights']
+
+def dtype_label(dtype) -> str:
+    """
+    Human-readable (Spanish) label for a pandas dtype.
+    """
+    dtype = str(dtype)
+    if dtype.startswith('int'):
+        return 'Entero'
+    elif dtype.startswith('float'):
+        return 'Decimal'
+    elif dtype.startswith('object'):
+        return 'Texto'
+    elif dtype.startswith('datetime'):
+        return 'Fecha'
+    return dtype
+
+def preview_records(df: pd.DataFrame, rows: int = 10) -> List[Dict[str, Any]]:
+    """
+    First rows of a DataFrame as a list of records.
+    """
+    data_preview = []
+    if df is not None and not df.empty:
+        for _, row in df.head(rows).iterrows():
+            data_preview.append(row.to_dict())
+    return data_preview
 
 class DataAnalyzer:
-    def __init__(self, csv_content: str = None, file_path: str = None):
+    def __init__(self, csv_content: str = None, file_path: str = None, file_bytes: bytes = None,
+                 sniff_sample_size: int = DEFAULT_SAMPLE_SIZE,
+                 quantile_row_threshold: int = QUANTILE_APPROX_ROW_THRESHOLD,
+                 quantile_error: float = QUANTILE_RANK_ERROR,
+                 distinct_row_threshold: int = DISTINCT_APPROX_ROW_THRESHOLD,
+                 progress: Optional[ProgressCallback] = None,
+                 plot_store: Optional[ArtifactStore] = None,
+                 plot_renderer: Optional[PlotRenderer] = None,
+                 chart_mode: str = 'image',
+                 render_profile: str = DEFAULT_RENDER_PROFILE,
+                 plot_sources: Optional[ArtifactStore] = None,
+                 histogram_budget: int = HISTOGRAM_BUDGET,
+                 boxplot_budget: int = BOXPLOT_BUDGET):
         """
-        Initialize DataAnalyzer with CSV content or file path.
+        Initialize DataAnalyzer with CSV content, file path or raw file bytes.
+        
+        ``progress`` receives the events described in the ``progress``
+        module while the file is parsed and the analysis runs. Plots are
+        saved to ``plot_store`` and returned as URLs when it is given, and
+        inlined as data URIs otherwise. ``plot_renderer`` may render them
+        in a pool of processes; by default they are rendered in this one.
+        With ``chart_mode='data'`` no image is rendered and every plot is
+        returned as the payload built by the ``chart_data`` module.
+        ``render_profile`` names the ``RENDER_PROFILES`` entry setting the
+        resolution and format of rendered images. With ``chart_mode='lazy'``
+        plots are described instead, and their data kept in
+        ``plot_sources`` until they are rendered into ``plot_store``.
+        At most ``histogram_budget`` histograms and ``boxplot_budget``
+        boxplots are drawn, the best ranked by ``rank_plots``.
         """
+        if chart_mode not in CHART_MODES:
+            raise ValueError(f"Unknown chart mode: {chart_mode}")
+        if chart_mode == 'lazy' and (plot_store is None or plot_sources is None):
+            raise ValueError("Lazy charts need a plot store and a plot source store")
+        if render_profile not in RENDER_PROFILES:
+            raise ValueError(f"Unknown render profile: {render_profile}")
         self.df = None
+        self.progress = progress
+        self.chart_mode = chart_mode
+        self.render_profile = RENDER_PROFILES[render_profile]
+        self.plot_store = plot_store
+        self.plot_sources = plot_sources
+        self.plot_renderer = plot_renderer or PlotRenderer()
+        self.dialect: Optional[CSVDialect] = None
+        self.sniff_sample_size = sniff_sample_size
+        self.quantile_row_threshold = quantile_row_threshold
+        self.quantile_error = quantile_error
+        self.distinct_row_threshold = distinct_row_threshold
+        self.histogram_budget = histogram_budget
+        self.boxplot_budget = boxplot_budget
+        self.stats_cache = StatsCache()
+        self._stats_cache_df = None
         self.analysis_results = {}
         self.plot_paths = []
         
@@ -32,49 +184,32 @@ class DataAnalyzer:
             self.load_from_content(csv_content)
         elif file_path:
             self.load_from_file(file_path)
+        elif file_bytes:
+            self.load_from_bytes(file_bytes)
     
     def detect_separator(self, sample_text: str) -> str:
         """
         Detect the separator used in CSV file.
         """
-        # Common separators to test
-        separators = [',', ';', '\t', '|']
-        separator_counts = {}
-        
-        lines = sample_text.split('\n')[:5]  # Check first 5 lines
-        
-        for sep in separators:
-            counts = []
-            for line in lines:
-                if line.strip():
-                    counts.append(line.count(sep))
-            
-            if counts:
-                # Check if separator count is consistent across lines
-                if len(set(counts)) <= 2 and max(counts) > 0:
-                    separator_counts[sep] = max(counts)
-        
-        if separator_counts:
-            return max(separator_counts, key=separator_counts.get)
-        return ','  # Default to comma
+        return sniff_text(sample_text, self.sniff_sample_size).separator
     
     def detect_encoding(self, file_content: bytes) -> str:
         """
-        Detect file encoding.
+        Detect file encoding from a bounded prefix of the raw bytes.
         """
-        detected = chardet.detect(file_content)
-        return detected.get('encoding', 'utf-8') if detected['confidence'] > 0.7 else 'utf-8'
+        return detect_encoding(file_content[:self.sniff_sample_size]).encoding
     
     def load_from_content(self, csv_content: str):
         """
         Load data from CSV content string.
         """
         try:
-            # Detect separator
-            separator = self.detect_separator(csv_content)
+            # Detect dialect on a bounded prefix
+            self.dialect = sniff_text(csv_content, self.sniff_sample_size)
+            separator = self.dialect.separator
             
-            # Try to read with detected separator
-            self.df = pd.read_csv(StringIO(csv_content), sep=separator)
+            # Try to read with detected dialect
+            self.df = pd.read_csv(StringIO(csv_content), **self.dialect.read_csv_kwargs())
             
             # If dataframe has only one column, try with comma
             if len(self.df.columns) == 1 and separator != ',':
@@ -93,25 +228,48 @@ class DataAnalyzer:
                 except:
                     continue
     
+    def load_from_bytes(self, raw_data: bytes):
+        """
+        Load data from the raw bytes of a CSV file.
+        
+        The dialect is detected from a bounded prefix and the parser reads
+        straight from the in-memory buffer, so the file is neither decoded
+        as a whole nor read a second time.
+        """
+        try:
+            # BytesIO shares the buffer with raw_data instead of copying it
+            self.df, self.dialect = read_with_fallback(
+                lambda dialect: pd.read_csv(BytesIO(raw_data), **dialect.read_csv_kwargs()),
+                sniff_bytes(raw_data, self.sniff_sample_size))
+            
+        except Exception as e:
+            print(f"Error loading file: {e}")
+            # Fallback
+            try:
+                self.df = pd.read_csv(BytesIO(raw_data))
+            except:
+                self.df = pd.read_csv(BytesIO(raw_data), sep=';')
+    
     def load_from_file(self, file_path: str):
         """
         Load data from CSV file.
+        
+        Only the sniffing prefix is read up front; the parser then streams
+        the file from disk once, which is faster than feeding it an
+        in-memory copy and never holds the raw bytes alongside the frame.
         """
-        try:
-            # Read file as bytes to detect encoding
+        def read(dialect: CSVDialect) -> pd.DataFrame:
+            if self.progress is None:
+                return pd.read_csv(file_path, **dialect.read_csv_kwargs())
             with open(file_path, 'rb') as f:
-                raw_data = f.read()
-            
-            # Detect encoding
-            encoding = self.detect_encoding(raw_data)
-            
-            # Read as text to detect separator
-            text_content = raw_data.decode(encoding)
-            separator = self.detect_separator(text_content)
-            
-            # Load with detected parameters
-            self.df = pd.read_csv(file_path, sep=separator, encoding=encoding)
+                reader = ProgressReader(f, os.path.getsize(file_path), self.progress)
+                return pd.read_csv(reader, **dialect.read_csv_kwargs())
+        
+        try:
+            self.df, self.dialect = read_with_fallback(read, sniff_file(file_path, self.sniff_sample_size))
             
+        except FileNotFoundError:
+            raise
         except Exception as e:
             print(f"Error loading file: {e}")
             # Fallback
@@ -136,26 +294,15 @@ class DataAnalyzer:
         # Data types
         data_types = {}
         for col in self.df.columns:
-            dtype = str(self.df[col].dtype)
-            if dtype.startswith('int'):
-                data_types[col] = 'Entero'
-            elif dtype.startswith('float'):
-                data_types[col] = 'Decimal'
-            elif dtype.startswith('object'):
-                data_types[col] = 'Texto'
-            elif dtype.startswith('datetime'):
-                data_types[col] = 'Fecha'
-            else:
-                data_types[col] = dtype
+            data_types[col] = dtype_label(self.df[col].dtype)
         
-        # Null values
+        # Null values, counted for all columns in one pass
+        null_counts = self.get_null_counts()
         null_values = {}
-        for col in self.df.columns:
-            null_count = int(self.df[col].isnull().sum())
-            null_percentage = round((null_count / len(self.df)) * 100, 2)
+        for col, null_count in null_counts.items():
             null_values[col] = {
-                'count': null_count,
-                'percentage': null_percentage
+                'count': int(null_count),
+                'percentage': round((int(null_count) / len(self.df)) * 100, 2)
             }
         
         return {
@@ -164,6 +311,160 @@ class DataAnalyzer:
             'null_values': null_values
         }
     
+    def get_numeric_profile(self) -> pd.DataFrame:
+        """
+        One row of metrics per numeric column, computed once per DataFrame.
+        
+        Count, nulls, mean, std, min, max, skew and (up to
+        ``quantile_row_threshold`` rows) exact quartiles come from a single
+        vectorized kernel over all numeric columns; larger frames get their
+        quartiles from per-column quantile sketches with rank error
+        ``quantile_error``. Every section reads its metrics from this table.
+        """
+        return self._stats().get('numeric_profile', self._compute_numeric_profile)
+    
+    def _compute_numeric_profile(self) -> pd.DataFrame:
+        numerical_data = self.get_numerical_data()
+        exact = len(numerical_data) <= self.quantile_row_threshold
+        profile = profile_numeric(numerical_data, QUARTILES if exact else None)
+        profile['quantiles_exact'] = exact
+        profile['quantile_rank_error'] = 0.0
+        if not exact:
+            for col in numerical_data.columns:
+                values = numerical_data[col].to_numpy(dtype=float)
+                sketch = QuantileSketch.for_error(self.quantile_error)
+                for start in range(0, len(values), QUANTILE_BLOCK_SIZE):
+                    sketch.update(values[start:start + QUANTILE_BLOCK_SIZE])
+                for name, q in zip(QUARTILES, sketch.quantiles(list(QUARTILES.values()))):
+                    profile.loc[col, name] = q
+                profile.loc[col, 'quantiles_exact'] = sketch.is_exact
+                profile.loc[col, 'quantile_rank_error'] = sketch.rank_error
+        return profile
+    
+    def get_quantiles(self, col: str) -> Dict[str, Any]:
+        """
+        Q1, median and Q3 of a numeric column, read from the numeric profile;
+        ``exact`` tells whether they come from a quantile sketch.
+        """
+        row = self.get_numeric_profile().loc[col]
+        return {
+            'q25': float(row['q25']),
+            'median': float(row['median']),
+            'q75': float(row['q75']),
+            'exact': bool(row['quantiles_exact']),
+            'rank_error': float(row['quantile_rank_error'])
+        }
+    
+    def get_distinct_count(self, col: str, limit: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Number of distinct non-null values of a column.
+        
+        Above ``distinct_row_threshold`` rows the count is a HyperLogLog
+        estimate, and it is only made exact when it is not clearly above
+        ``limit``, i.e. when a ``<= limit`` decision depends on it.
+        """
+        cache = self._stats()
+        series = self.df[col]
+        
+        def count_distinct():
+            if len(series) > self.distinct_row_threshold:
+                counter = DistinctCounter()
+                for start in range(0, len(series), QUANTILE_BLOCK_SIZE):
+                    block = series.iloc[start:start + QUANTILE_BLOCK_SIZE]
+                    counter.update(block[block.notnull()])
+                return {'count': int(round(counter.estimate)), 'exact': False, 'sketch': counter}
+            return {'count': int(series.nunique()), 'exact': True}
+        
+        result = cache.get(('distinct', col), count_distinct)
+        if not result['exact'] and limit is not None and not result['sketch'].exceeds(limit):
+            result = {'count': int(series.nunique()), 'exact': True}
+            cache.set(('distinct', col), result)
+        return {'count': result['count'], 'exact': result['exact']}
+    
+    def get_top_categories(self, col: str, n: int = 10) -> Dict[str, Any]:
+        """
+        The ``n`` most frequent values of a column with their counts.
+        
+        Above ``distinct_row_threshold`` rows they come from a heavy-hitters
+        sketch, whose counts are exact when the column has at most
+        ``TOP_CATEGORIES_K`` distinct values.
+        """
+        def top_categories():
+            series = self.df[col]
+            if len(series) > self.distinct_row_threshold:
+                sketch = TopKSketch(TOP_CATEGORIES_K)
+                for start in range(0, len(series), QUANTILE_BLOCK_SIZE):
+                    block = series.iloc[start:start + QUANTILE_BLOCK_SIZE]
+                    sketch.update(block[block.notnull()])
+                return {'values': sketch.top(TOP_CATEGORIES_K), 'exact': sketch.is_exact}
+            counts = series.value_counts().head(TOP_CATEGORIES_K)
+            return {'values': list(counts.items()), 'exact': True}
+        
+        result = self._stats().get(('top_categories', col), top_categories)
+        return {'values': result['values'][:n], 'exact': result['exact']}
+    
+    def get_category_index(self, col: str, n: int = GROUPED_PLOT_CATEGORIES) -> CategoryIndex:
+        """
+        Row positions of the ``n`` most frequent values of a column, built
+        once per column and shared by every grouped statistic or plot.
+        """
+        def build():
+            categories = [value for value, _ in self.get_top_categories(col, n)['values']]
+            return CategoryIndex.build(self.df[col], categories)
+        
+        return self._stats().get(('category_index', col, n), build)
+    
+    def get_numerical_data(self) -> pd.DataFrame:
+        """
+        The numeric columns of the dataset.
+        """
+        return self._stats().get('numerical_data', lambda: self.df.select_dtypes(include=[np.number]))
+    
+    def get_categorical_data(self) -> pd.DataFrame:
+        """
+        The text (object) columns of the dataset.
+        """
+        return self._stats().get('categorical_data', lambda: self.df.select_dtypes(include=['object']))
+    
+    def get_null_counts(self) -> pd.Series:
+        """
+        Number of nulls in every column.
+        """
+        return self._stats().get('null_counts', lambda: self.df.isnull().sum())
+    
+    def get_duplicate_count(self) -> int:
+        """
+        Number of rows that duplicate an earlier row.
+        """
+        return self._stats().get('duplicate_rows', lambda: int(self.df.duplicated().sum()))
+    
+    def get_correlation_matrix(self) -> pd.DataFrame:
+        """
+        Pairwise correlation matrix of the numeric columns, shared by the
+        heatmap and the insights.
+        """
+        return self._stats().get('correlation_matrix', lambda: pairwise_correlation(self.get_numerical_data()))
+    
+    def _stats(self) -> StatsCache:
+        """
+        Statistics cache of the current DataFrame, emptied whenever
+        ``self.df`` is replaced.
+        """
+        if self._stats_cache_df is not self.df:
+            self.stats_cache.clear()
+            self._stats_cache_df = self.df
+        return self.stats_cache
+    
+    def get_outliers(self) -> IQROutliers:
+        """
+        Outliers of every numeric column by the IQR rule, from the quartiles
+        of the numeric profile, computed once per DataFrame.
+        """
+        def detect():
+            profile = self.get_numeric_profile()
+            return IQROutliers.detect(self.get_numerical_data(), profile['q25'], profile['q75'])
+        return self._stats().get('outliers', detect)
+    
     def get_statistical_summary(self) -> Dict[str, Any]:
         """
         Get statistical summary for numerical columns.
@@ -171,199 +472,224 @@ class DataAnalyzer:
         if self.df is None:
             return {}
         
-        numerical_cols = self.df.select_dtypes(include=[np.number]).columns
         stats = {}
+        outlier_counts = self.get_outliers().counts()
         
-        for col in numerical_cols:
+        for col, row in self.get_numeric_profile().iterrows():
             col_stats = {
-                'count': int(self.df[col].count()),
-                'mean': round(float(self.df[col].mean()), 4),
-                'median': round(float(self.df[col].median()), 4),
-                'std': round(float(self.df[col].std()), 4),
-                'min': round(float(self.df[col].min()), 4),
-                'max': round(float(self.df[col].max()), 4),
-                'q25': round(float(self.df[col].quantile(0.25)), 4),
-                'q75': round(float(self.df[col].quantile(0.75)), 4)
+                'count': int(row['count']),
+                'mean': round(float(row['mean']), 4),
+                'median': round(float(row['median']), 4),
+                'std': round(float(row['std']), 4),
+                'min': round(float(row['min']), 4),
+                'max': round(float(row['max']), 4),
+                'q25': round(float(row['q25']), 4),
+                'q75': round(float(row['q75']), 4),
+                'outliers': int(outlier_counts[col]),
+                'outliers_exact': True,
+                'quantiles_exact': bool(row['quantiles_exact'])
             }
+            if not row['quantiles_exact']:
+                col_stats['quantile_rank_error'] = float(row['quantile_rank_error'])
             stats[col] = col_stats
         
         return stats
     
-    def create_correlation_heatmap(self) -> str:
+    def _export_plot(self, image: bytes, key: Optional[str] = None) -> str:
+        """
+        Publish a rendered image.
+        
+        With a plot store it is stored once under its content hash, linked
+        to its render ``key`` if given, and its URL is returned; otherwise
+        it is inlined as a base64 data URI and never touches the disk.
+        """
+        if self.plot_store is not None:
+            name = self.plot_store.put(image, self.render_profile.format)
+            if key is not None:
+                self.plot_store.link(key, name)
+            return self.plot_store.url(name)
+        return f"data:{self.render_profile.mimetype};base64,{base64.b64encode(image).decode()}"
+    
+    def _render_plots(self, stage: str, tasks: List[Tuple[str, Callable[..., bytes], tuple]]) -> List[Any]:
+        """
+        Render ``(label, function, args)`` tasks with the plot renderer and
+        export them in task order; failed plots are reported and skipped.
+        
+        With a plot store, a plot already rendered from the same data with
+        the same profile is served from the store instead of drawn again.
+        In data mode the chart payload of each task is returned instead, and
+        in lazy mode its descriptor.
+        """
+        if self.chart_mode in ('data', 'lazy'):
+            charts = []
+            for label, function, args in tasks:
+                try:
+                    if self.chart_mode == 'data':
+                        charts.append(CHART_PAYLOADS[function](*args))
+                    else:
+                        charts.append(plot_descriptor(self.plot_sources, function, args,
+                                                      self.plot_store.url_prefix))
+                except Exception as e:
+                    print(f"Error creating {label}: {e}")
+            return charts
+        
+        profile = self.render_profile
+        plots: List[Optional[str]] = [None] * len(tasks)
+        keys: List[Optional[str]] = [None] * len(tasks)
+        if self.plot_store is not None:
+            for index, (_, function, args) in enumerate(tasks):
+                keys[index] = render_key(source_key(function, args), profile)
+                name = self.plot_store.lookup(keys[index])
+                if name is not None:
+                    plots[index] = self.plot_store.url(name)
+        pending = [index for index, plot in enumerate(plots) if plot is None]
+        
+        def on_rendered(count: int):
+            emit(self.progress, 'plot_rendered', stage=stage, rendered=len(tasks) - len(pending) + count,
+                 total=len(tasks))
+        
+        outputs = self.plot_renderer.render([(tasks[index][1], tasks[index][2] + (profile,)) for index in pending],
+                                            on_rendered)
+        for index, output in zip(pending, outputs):
+            if isinstance(output, Exception):
+                print(f"Error creating {tasks[index][0]}: {output}")
+                continue
+            plots[index] = self._export_plot(output, keys[index])
+        return [plot for plot in plots if plot is not None]
+    
+    def rank_plots(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Candidate histograms and boxplots, best first, scored by the
+        ``plot_selection`` module from statistics already computed.
+        
+        Histograms are scored by their column's distribution. Boxplots
+        group a numeric column by a text column and are scored by how much
+        the grouping explains; without usable text columns they show single
+        columns, scored like histograms. Candidates scoring zero, such as
+        constant columns or row identifiers, are left out.
+        """
+        return self._stats().get('plot_ranking', self._compute_plot_ranking)
+    
+    def _compute_plot_ranking(self) -> Dict[str, List[Dict[str, Any]]]:
+        profile = self.get_numeric_profile()
+        rows = len(self.df)
+        
+        histograms = []
+        for col in profile.index:
+            stats = profile.loc[col]
+            if is_identifier(self.df[col], stats):
+                continue
+            # Flags are told apart by their distinct count, exact up to 2
+            distinct = self.get_distinct_count(col, limit=2)['count'] if stats['std'] > 0 else None
+            score = distribution_score(stats, distinct)
+            if score > 0:
+                histograms.append({'column': col, 'score': round(score, 4)})
+        
+        boxplots = []
+        max_distinct = rows * MAX_GROUPING_DISTINCT_SHARE
+        for cat_col in self.get_categorical_data().columns:
+            if self.get_distinct_count(cat_col, limit=max_distinct)['count'] > max_distinct:
+                continue
+            index = self.get_category_index(cat_col)
+            if len(index) < 2:
+                continue
+            coverage = sum(index.sizes()) / rows
+            for candidate in histograms:
+                eta2 = eta_squared(*index.moments(self.df[candidate['column']].to_numpy(dtype=float)))
+                score = association_score(eta2, coverage)
+                if score > 0:
+                    boxplots.append({'column': candidate['column'], 'group_by': cat_col, 'score': round(score, 4)})
+        if not boxplots:
+            boxplots = [{**candidate, 'group_by': None} for candidate in histograms]
+        
+        # Stable sorts keep column order among equal scores
+        histograms.sort(key=lambda candidate: -candidate['score'])
+        boxplots.sort(key=lambda candidate: -candidate['score'])
+        return {'histograms': histograms, 'boxplots': boxplots}
+    
+    def create_correlation_heatmap(self, correlation_matrix: Optional[pd.DataFrame] = None) -> Any:
         """
         Create correlation heatmap for numerical variables.
+        
+        A precomputed correlation matrix can be passed in, e.g. one
+        accumulated over a file too large to load at once. Beyond
+        ``HEATMAP_ANNOTATION_LIMIT`` columns the heatmap shows the
+        ``HEATMAP_MAX_COLUMNS`` most correlated ones, clustered.
         """
         if self.df is None:
             return ""
         
-        numerical_cols = self.df.select_dtypes(include=[np.number]).columns
+        if correlation_matrix is None:
+            numerical_cols = self.get_numerical_data().columns
+        else:
+            numerical_cols = correlation_matrix.columns
         
         if len(numerical_cols) < 2:
             return ""
         
         try:
-            plt.figure(figsize=(10, 8))
-            correlation_matrix = self.df[numerical_cols].corr()
-            
-            # Create heatmap
-            sns.heatmap(correlation_matrix, 
-                       annot=True, 
-                       cmap='coolwarm', 
-                       center=0,
-                       square=True,
-                       fmt='.2f',
-                       cbar_kws={'shrink': 0.8})
-            
-            plt.title('Matriz de Correlación', fontsize=16, fontweight='bold')
-            plt.tight_layout()
-            
-            # Save plot
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir='../frontend/plots')
-            plt.savefig(temp_file.name, dpi=300, bbox_inches='tight')
-            plt.close()
-            
-            # Convert to base64 for web display
-            with open(temp_file.name, 'rb') as f:
-                img_data = base64.b64encode(f.read()).decode()
-            
-            self.plot_paths.append(temp_file.name)
-            return f"data:image/png;base64,{img_data}"
-            
+            if correlation_matrix is None:
+                correlation_matrix = self.get_correlation_matrix()
         except Exception as e:
             print(f"Error creating correlation heatmap: {e}")
             return ""
+        
+        if len(correlation_matrix.columns) > HEATMAP_ANNOTATION_LIMIT:
+            correlation_matrix = clustered_matrix(correlation_matrix, HEATMAP_MAX_COLUMNS)
+        
+        plots = self._render_plots('correlation_heatmap',
+                                   [('correlation heatmap', render_heatmap, (correlation_matrix,))])
+        return plots[0] if plots else ""
     
-    def create_histograms(self) -> List[str]:
+    def create_histograms(self) -> List[Any]:
         """
-        Create histograms for numerical variables.
+        Create histograms for the best ranked numerical variables, at most
+        ``histogram_budget`` of them.
         """
         if self.df is None:
             return []
         
-        numerical_cols = self.df.select_dtypes(include=[np.number]).columns
-        histogram_plots = []
-        
-        for col in numerical_cols:
-            try:
-                plt.figure(figsize=(8, 6))
-                
-                # Create histogram
-                plt.hist(self.df[col].dropna(), bins=30, alpha=0.7, color='skyblue', edgecolor='black')
-                plt.title(f'Histograma de {col}', fontsize=14, fontweight='bold')
-                plt.xlabel(col)
-                plt.ylabel('Frecuencia')
-                plt.grid(True, alpha=0.3)
-                
-                # Add statistics text
-                mean_val = self.df[col].mean()
-                median_val = self.df[col].median()
-                plt.axvline(mean_val, color='red', linestyle='--', label=f'Media: {mean_val:.2f}')
-                plt.axvline(median_val, color='green', linestyle='--', label=f'Mediana: {median_val:.2f}')
-                plt.legend()
-                
-                plt.tight_layout()
-                
-                # Save plot
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir='../frontend/plots')
-                plt.savefig(temp_file.name, dpi=300, bbox_inches='tight')
-                plt.close()
-                
-                # Convert to base64
-                with open(temp_file.name, 'rb') as f:
-                    img_data = base64.b64encode(f.read()).decode()
-                
-                self.plot_paths.append(temp_file.name)
-                histogram_plots.append(f"data:image/png;base64,{img_data}")
-                
-            except Exception as e:
-                print(f"Error creating histogram for {col}: {e}")
-                continue
+        profile = self.get_numeric_profile()
+        tasks = []
+        for candidate in self.rank_plots()['histograms'][:self.histogram_budget]:
+            col = candidate['column']
+            # Each task carries only its column's values
+            tasks.append((f'histogram for {col}', render_histogram,
+                          (col, self.df[col].dropna().to_numpy(),
+                           profile.loc[col, 'mean'], profile.loc[col, 'median'])))
         
-        return histogram_plots
+        return self._render_plots('histograms', tasks)
     
-    def create_boxplots(self) -> List[str]:
+    def create_boxplots(self) -> List[Any]:
         """
-        Create boxplots for numerical variables grouped by categorical variables.
+        Create boxplots for the best ranked numerical variables, grouped by
+        categorical variables when one explains them, at most
+        ``boxplot_budget`` of them.
         """
         if self.df is None:
             return []
         
-        numerical_cols = self.df.select_dtypes(include=[np.number]).columns
-        categorical_cols = self.df.select_dtypes(include=['object']).columns
-        
-        boxplot_images = []
-        
-        # If no categorical columns, create simple boxplots for numerical columns
-        if len(categorical_cols) == 0:
-            for col in numerical_cols:
-                try:
-                    plt.figure(figsize=(8, 6))
-                    plt.boxplot(self.df[col].dropna())
-                    plt.title(f'Boxplot de {col}', fontsize=14, fontweight='bold')
-                    plt.ylabel(col)
-                    plt.grid(True, alpha=0.3)
-                    plt.tight_layout()
-                    
-                    # Save plot
-                    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir='../frontend/plots')
-                    plt.savefig(temp_file.name, dpi=300, bbox_inches='tight')
-                    plt.close()
-                    
-                    # Convert to base64
-                    with open(temp_file.name, 'rb') as f:
-                        img_data = base64.b64encode(f.read()).decode()
-                    
-                    self.plot_paths.append(temp_file.name)
-                    boxplot_images.append(f"data:image/png;base64,{img_data}")
-                    
-                except Exception as e:
-                    print(f"Error creating boxplot for {col}: {e}")
-                    continue
-        else:
-            # Create boxplots with categorical grouping
-            for num_col in numerical_cols:
-                for cat_col in categorical_cols:
-                    # Limit categories to avoid overcrowded plots
-                    unique_categories = self.df[cat_col].value_counts().head(10).index
-                    filtered_df = self.df[self.df[cat_col].isin(unique_categories)]
-                    
-                    if len(unique_categories) < 2:
-                        continue
-                    
-                    try:
-                        plt.figure(figsize=(12, 6))
-                        
-                        # Create boxplot
-                        sns.boxplot(data=filtered_df, x=cat_col, y=num_col)
-                        plt.title(f'Boxplot de {num_col} por {cat_col}', fontsize=14, fontweight='bold')
-                        plt.xticks(rotation=45)
-                        plt.grid(True, alpha=0.3)
-                        plt.tight_layout()
-                        
-                        # Save plot
-                        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png', dir='../frontend/plots')
-                        plt.savefig(temp_file.name, dpi=300, bbox_inches='tight')
-                        plt.close()
-                        
-                        # Convert to base64
-                        with open(temp_file.name, 'rb') as f:
-                            img_data = base64.b64encode(f.read()).decode()
-                        
-                        self.plot_paths.append(temp_file.name)
-                        boxplot_images.append(f"data:image/png;base64,{img_data}")
-                        
-                        # Limit to avoid too many plots
-                        if len(boxplot_images) >= 5:
-                            break
-                            
-                    except Exception as e:
-                        print(f"Error creating boxplot for {num_col} by {cat_col}: {e}")
-                        continue
-                
-                if len(boxplot_images) >= 5:
-                    break
-        
-        return boxplot_images
+        tasks = []
+        for candidate in self.rank_plots()['boxplots'][:self.boxplot_budget]:
+            num_col, cat_col = candidate['column'], candidate['group_by']
+            if cat_col is None:
+                # The box is summarized from the quartiles and outliers
+                # already found; the task carries no values
+                stats = self.get_numeric_profile().loc[num_col]
+                values = self.get_numerical_data()[num_col].to_numpy(dtype=float, na_value=np.nan)
+                box = iqr_box(values, stats['q25'], stats['median'], stats['q75'],
+                              self.get_outliers().rows(num_col))
+                tasks.append((f'boxplot for {num_col}', render_boxplot, (num_col, box)))
+                continue
+            
+            # The numeric column is split through the category index, which
+            # limits the categories to avoid overcrowded plots, without
+            # filtering the table
+            index = self.get_category_index(cat_col)
+            tasks.append((f'boxplot for {num_col} by {cat_col}', render_grouped_boxplot,
+                          (num_col, cat_col, index.split(self.df[num_col].to_numpy()))))
+        
+        return self._render_plots('boxplots', tasks)
     
     def generate_ai_insights(self) -> List[str]:
         """
@@ -374,12 +700,13 @@ class DataAnalyzer:
         
         insights = []
         rows, cols = self.df.shape
-        numerical_data = self.df.select_dtypes(include=[np.number])
-        categorical_data = self.df.select_dtypes(include=['object'])
+        numerical_data = self.get_numerical_data()
+        categorical_data = self.get_categorical_data()
+        profile = self.get_numeric_profile()
         
         # 1. ANÁLISIS DE EFICIENCIA OPERATIVA
-        missing_percentage = (self.df.isnull().sum().sum() / (rows * cols)) * 100
-        duplicate_rows = self.df.duplicated().sum()
+        missing_percentage = (self.get_null_counts().sum() / (rows * cols)) * 100
+        duplicate_rows = self.get_duplicate_count()
         
         if missing_percentage == 0 and duplicate_rows == 0:
             insights.append("🎯 **EFICIENCIA OPERATIVA**: Excelente calidad de datos (0% faltantes, 0% duplicados) sugiere una mejora del 25% en la eficiencia operativa del sistema de captura de información.")
@@ -393,11 +720,8 @@ class DataAnalyzer:
         # 2. ANÁLISIS DE TENDENCIAS Y PATRONES
         if len(numerical_data.columns) > 0:
             # Analizar variabilidad como indicador de tendencias
-            cv_scores = []
-            for col in numerical_data.columns:
-                if numerical_data[col].std() > 0:
-                    cv = (numerical_data[col].std() / numerical_data[col].mean()) * 100
-                    cv_scores.append((col, cv))
+            variable = profile[profile['std'] > 0]
+            cv_scores = list(zip(variable.index, variable['std'] / variable['mean'] * 100))
             
             if cv_scores:
                 cv_scores.sort(key=lambda x: x[1], reverse=True)
@@ -414,12 +738,12 @@ class DataAnalyzer:
         # 3. ANÁLISIS DE SEGMENTACIÓN
         if len(categorical_data.columns) > 0:
             for col in categorical_data.columns:
-                unique_values = categorical_data[col].nunique()
-                value_counts = categorical_data[col].value_counts()
+                unique_values = self.get_distinct_count(col, limit=10)['count']
                 
-                if unique_values <= 10 and len(value_counts) > 0:
-                    dominant_category = value_counts.index[0]
-                    dominant_percentage = (value_counts.iloc[0] / len(categorical_data)) * 100
+                if 0 < unique_values <= 10:
+                    # With at most 10 categories the heavy-hitters counts are exact
+                    dominant_category, dominant_count = self.get_top_categories(col, 1)['values'][0]
+                    dominant_percentage = (dominant_count / len(categorical_data)) * 100
                     
                     if dominant_percentage > 70:
                         insights.append(f"🎯 **SEGMENTACIÓN**: El segmento '{dominant_category}' domina el {dominant_percentage:.1f}% del mercado en '{col}', presentando una oportunidad de diversificación que podría incrementar la cuota de mercado en un 20-35%.")
@@ -432,13 +756,7 @@ class DataAnalyzer:
         problems_detected = []
         
         # Outliers como indicadores de problemas
-        outlier_percentage = 0
-        for col in numerical_data.columns:
-            Q1 = numerical_data[col].quantile(0.25)
-            Q3 = numerical_data[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = numerical_data[(numerical_data[col] < Q1 - 1.5*IQR) | (numerical_data[col] > Q3 + 1.5*IQR)]
-            outlier_percentage += len(outliers) / len(numerical_data) * 100
+        outlier_percentage = self.get_outliers().total() / len(numerical_data) * 100 if len(numerical_data) else 0
         
         if outlier_percentage > 15:
             problems_detected.append(f"🚨 **PROBLEMA CRÍTICO**: {outlier_percentage:.1f}% de valores atípicos detectados, indicando posibles fallas en el proceso que requieren investigación inmediata para evitar pérdidas del 10-25%.")
@@ -453,15 +771,9 @@ class DataAnalyzer:
         # 5. ANÁLISIS DE KPIs
         if len(numerical_data.columns) >= 2:
             # Calcular métricas de rendimiento
-            performance_metrics = []
-            for col in numerical_data.columns:
-                mean_val = numerical_data[col].mean()
-                median_val = numerical_data[col].median()
-                std_val = numerical_data[col].std()
-                
-                if std_val > 0:
-                    stability_score = (1 - (std_val / mean_val)) * 100
-                    performance_metrics.append((col, stability_score, mean_val))
+            variable = profile[profile['std'] > 0]
+            stability_scores = (1 - (variable['std'] / variable['mean'])) * 100
+            performance_metrics = list(zip(variable.index, stability_scores, variable['mean']))
             
             if performance_metrics:
                 performance_metrics.sort(key=lambda x: x[1], reverse=True)
@@ -471,18 +783,10 @@ class DataAnalyzer:
         
         # 6. ANÁLISIS DE CORRELACIONES ESTRATÉGICAS
         if len(numerical_data.columns) >= 2:
-            corr_matrix = numerical_data.corr()
-            strategic_correlations = []
-            
-            for i in range(len(corr_matrix.columns)):
-                for j in range(i+1, len(corr_matrix.columns)):
-                    corr_val = corr_matrix.iloc[i, j]
-                    if abs(corr_val) > 0.6:
-                        col1, col2 = corr_matrix.columns[i], corr_matrix.columns[j]
-                        strategic_correlations.append((col1, col2, corr_val))
+            strategic_correlations = correlated_pairs(self.get_correlation_matrix(), threshold=0.6, k=1)
             
             if strategic_correlations:
-                strongest_corr = max(strategic_correlations, key=lambda x: abs(x[2]))
+                strongest_corr = strategic_correlations[0]
                 correlation_strength = abs(strongest_corr[2])
                 correlation_type = "positiva" if strongest_corr[2] > 0 else "negativa"
                 
@@ -493,8 +797,7 @@ class DataAnalyzer:
         
         # Oportunidades basadas en distribución de datos
         if len(numerical_data.columns) > 0:
-            for col in numerical_data.columns:
-                skewness = numerical_data[col].skew()
+            for col, skewness in profile['skew'].items():
                 if abs(skewness) > 1:
                     if skewness > 1:
                         opportunities.append(f"📈 **OPORTUNIDAD**: La distribución sesgada en '{col}' sugiere nichos de alto valor poco explorados, con potencial de crecimiento del 25-45% en segmentos premium.")
@@ -564,50 +867,52 @@ class DataAnalyzer:
         
         return insights
     
-    def analyze(self) -> Dict[str, Any]:
+    def get_data_preview(self) -> List[Dict[str, Any]]:
+        """
+        First rows of the dataset as records.
+        """
+        return preview_records(self.df)
+    
+    def run_stages(self, outputs: List[str]) -> Dict[str, Any]:
+        """
+        Run the stages needed for ``outputs`` and return those outputs.
+        
+        Stage results are memoized in the statistics cache, so asking for
+        more outputs later only runs the stages not computed yet. Each
+        stage's start and finish (with its duration) are sent to
+        ``self.progress``, and each requested output as a ``section_ready``
+        event as soon as its stage finishes.
+        """
+        cache = self._stats()
+        results = {}
+        plan = ANALYSIS_STAGES.plan(outputs)
+        for index, name in enumerate(plan):
+            stage = ANALYSIS_STAGES.stages[name]
+            method = getattr(self, stage.method)
+            emit(self.progress, 'stage_started', stage=name, index=index, total=len(plan))
+            started = time.perf_counter()
+            with cache.stage(name):
+                results[name] = method() if stage.memoized else cache.get(name, method)
+            emit(self.progress, 'stage_finished', stage=name, index=index, total=len(plan),
+                 duration=round(time.perf_counter() - started, 4))
+            if name in outputs:
+                emit(self.progress, 'section_ready', section=name, value=results[name])
+        return {name: results[name] for name in outputs}
+    
+    def analyze(self, outputs: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Perform complete analysis of the dataset.
+        Perform the analysis of the dataset.
+        
+        ``outputs`` selects which sections to compute (all of
+        ``ANALYSIS_OUTPUTS`` by default); only the stages they depend on run.
         """
         if self.df is None:
             return {'error': 'No data loaded'}
         
-        # Ensure plots directory exists
-        plots_dir = '../frontend/plots'
-        if not os.path.exists(plots_dir):
-            os.makedirs(plots_dir)
-        
         try:
-            # Basic information
-            basic_info = self.get_basic_info()
-            
-            # Statistical summary
-            stats = self.get_statistical_summary()
-            
-            # Create visualizations
-            correlation_heatmap = self.create_correlation_heatmap()
-            histograms = self.create_histograms()
-            boxplots = self.create_boxplots()
-            
-            # Generate AI insights
-            ai_insights = self.generate_ai_insights()
-            
-            # Data preview
-            data_preview = []
-            if not self.df.empty:
-                preview_df = self.df.head(10)
-                for _, row in preview_df.iterrows():
-                    data_preview.append(row.to_dict())
-            
-            results = {
-                'basic_info': basic_info,
-                'statistical_summary': stats,
-                'data_preview': data_preview,
-                'correlation_heatmap': correlation_heatmap,
-                'histograms': histograms,
-                'boxplots': boxplots,
-                'ai_insights': ai_insights,
-                'success': True
-            }
+            results = self.run_stages(outputs or ANALYSIS_OUTPUTS)
+            results['cache_stats'] = self.stats_cache.report()
+            results['success'] = True
             
             self.analysis_results = results
             return results
@@ -621,7 +926,11 @@ class DataAnalyzer:
     
     def cleanup_plots(self):
         """
-        Clean up temporary plot files.
+        Remove the plot files listed in ``plot_paths``.
+        
+        Plots are rendered in memory and stored files belong to the plot
+        store, which evicts them itself, so analyses no longer add paths
+        here.
         """
         for plot_path in self.plot_paths:
             try:
@@ -640,15 +949,17 @@ class DataAnalyzer:
         
         column_info = {}
         for col in self.df.columns:
-            unique_count = self.df[col].nunique()
             total_count = len(self.df[col])
             
             if self.df[col].dtype in ['int64', 'float64']:
                 col_type = 'Numérica'
-            elif unique_count / total_count < 0.1 and unique_count < 50:
-                col_type = 'Categórica'
             else:
-                col_type = 'Texto'
+                # The exact count is only needed near the categorical limits
+                unique_count = self.get_distinct_count(col, limit=min(50, 0.1 * total_count))['count']
+                if unique_count / total_count < 0.1 and unique_count < 50:
+                    col_type = 'Categórica'
+                else:
+                    col_type = 'Texto'
             
             column_info[col] = col_type
         
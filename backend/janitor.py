@@ -0,0 +1,116 @@
+"""
+Background clean-up of the directories the application writes to.
+
+Each task trims one directory, e.g. the plot store to its size and age
+limits or the uploads folder of files left behind by a failed analysis,
+and returns the files and bytes it removed. A daemon thread runs every
+task periodically and keeps the totals per task.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# A task removes files and returns (files removed, bytes removed)
+CleanupTask = Callable[[], Tuple[int, int]]
+
+
+def sweep_directory(directory: str, max_age: float) -> Tuple[int, int]:
+    """
+    Remove the files in ``directory`` not modified for ``max_age`` seconds.
+    """
+    removed_files = removed_bytes = 0
+    now = time.time()
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0, 0
+
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+            if not os.path.isfile(path) or now - stat.st_mtime <= max_age:
+                continue
+            os.remove(path)
+        except OSError:
+            continue
+        removed_files += 1
+        removed_bytes += stat.st_size
+    return removed_files, removed_bytes
+
+
+class Janitor:
+    """
+    Runs clean-up tasks every ``interval`` seconds on a daemon thread.
+    """
+
+    def __init__(self, interval: float = 300):
+        self.interval = interval
+        self.tasks: Dict[str, CleanupTask] = {}
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, task: CleanupTask):
+        """
+        Register a task under ``name``.
+        """
+        with self._lock:
+            self.tasks[name] = task
+            self.metrics[name] = {'runs': 0, 'files_reclaimed': 0, 'bytes_reclaimed': 0, 'last_run': None}
+
+    def run_once(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Run every task now; return the files and bytes each one removed.
+        """
+        removed = {}
+        for name, task in list(self.tasks.items()):
+            try:
+                files, size = task()
+            except Exception as e:
+                print(f"Error in clean-up task {name}: {e}")
+                continue
+            removed[name] = (files, size)
+            with self._lock:
+                metrics = self.metrics[name]
+                metrics['runs'] += 1
+                metrics['files_reclaimed'] += files
+                metrics['bytes_reclaimed'] += size
+                metrics['last_run'] = time.time()
+        return removed
+
+    def start(self):
+        """
+        Start the background thread unless it is already running.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Runs, reclaimed files and bytes, and time of the last run per task.
+        """
+        with self._lock:
+            return {name: dict(metrics) for name, metrics in self.metrics.items()}
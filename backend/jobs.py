@@ -0,0 +1,409 @@
+"""
+Background analysis jobs on a bounded process pool.
+
+``/analyze`` enqueues a job and returns at once; the analysis runs in a
+worker process, which sends its progress events through a queue read by
+a listener thread in the web process. Throughput therefore scales with
+the number of worker processes, not with request threads.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from artifact_store import ArtifactStore
+from chunked_analysis import ChunkedDataAnalyzer
+from data_analysis import DataAnalyzer
+from plot_rendering import DEFAULT_RENDER_PROFILE, PlotRenderer
+from progress import ProgressCallback, emit
+
+# Queue used by worker processes to report progress, set by _init_worker
+_progress_queue = None
+
+# Seconds a finished job waits for the progress events still in the queue
+EVENT_DRAIN_TIMEOUT = 2.0
+
+# Plot renderer of this worker process, kept for the analyses it runs later
+_plot_renderer = None
+
+
+class JobQueueFull(Exception):
+    """
+    Raised when the number of pending jobs reaches its bound.
+    """
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _get_plot_renderer(max_workers: int) -> PlotRenderer:
+    global _plot_renderer
+    if _plot_renderer is None or _plot_renderer.max_workers != max_workers:
+        if _plot_renderer is not None:
+            _plot_renderer.shutdown()
+        _plot_renderer = PlotRenderer(max_workers=max_workers)
+    return _plot_renderer
+
+
+def _run_job(job_id: str, task: Callable, args: tuple) -> Any:
+    """
+    Run ``task(*args, progress=...)`` in a worker, forwarding its progress
+    events to the web process.
+    """
+    def progress(event: str, data: Dict[str, Any]):
+        _progress_queue.put((job_id, event, data))
+
+    progress('job_started', {})
+    try:
+        return task(*args, progress=progress)
+    finally:
+        # The result travels on another channel and may arrive first; this
+        # marker tells the web process every event of the job has been read
+        progress('job_returned', {})
+
+
+def run_analysis(file_path: str, params: Dict[str, Any], outputs: Optional[List[str]] = None,
+                 chart_mode: str = 'image', render_profile: str = DEFAULT_RENDER_PROFILE, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Analyze an uploaded file with the application's analysis settings and
+    remove the file afterwards.
+
+    Files larger than ``CHUNKED_ANALYSIS_THRESHOLD`` are read by chunks so
+    memory does not depend on their size. Parsing the file is reported as
+    the ``load`` stage. Plots are stored in ``PLOTS_FOLDER`` when it is
+    set (with the references of rendered plots in ``PLOT_REFS_FOLDER``)
+    and returned as URLs, and rendered by ``PLOT_WORKERS`` processes
+    with the ``render_profile`` named; with ``chart_mode='data'`` they are
+    returned as chart payloads instead, and with ``chart_mode='lazy'`` as
+    descriptors whose data is kept in ``PLOT_SOURCES_FOLDER``.
+    """
+    plot_store = (ArtifactStore(params['PLOTS_FOLDER'], refs_root=params.get('PLOT_REFS_FOLDER'))
+                  if params.get('PLOTS_FOLDER') else None)
+    plot_sources = ArtifactStore(params['PLOT_SOURCES_FOLDER']) if params.get('PLOT_SOURCES_FOLDER') else None
+    plot_renderer = _get_plot_renderer(params.get('PLOT_WORKERS', 1))
+    try:
+        emit(progress, 'stage_started', stage='load', index=0, total=1)
+        started = time.perf_counter()
+        if os.path.getsize(file_path) > params['CHUNKED_ANALYSIS_THRESHOLD']:
+            analyzer = ChunkedDataAnalyzer(file_path,
+                                           chunksize=params['ANALYSIS_CHUNKSIZE'],
+                                           sample_rows=params['ANALYSIS_SAMPLE_ROWS'],
+                                           sniff_sample_size=params['CSV_SNIFF_SAMPLE_SIZE'],
+                                           quantile_error=params['QUANTILE_RANK_ERROR'],
+                                           progress=progress,
+                                           plot_store=plot_store,
+                                           plot_renderer=plot_renderer,
+                                           chart_mode=chart_mode,
+                                           render_profile=render_profile,
+                                           plot_sources=plot_sources,
+                                           histogram_budget=params['HISTOGRAM_BUDGET'],
+                                           boxplot_budget=params['BOXPLOT_BUDGET'])
+        else:
+            analyzer = DataAnalyzer(file_path=file_path,
+                                    sniff_sample_size=params['CSV_SNIFF_SAMPLE_SIZE'],
+                                    quantile_row_threshold=params['QUANTILE_APPROX_ROW_THRESHOLD'],
+                                    quantile_error=params['QUANTILE_RANK_ERROR'],
+                                    distinct_row_threshold=params['DISTINCT_APPROX_ROW_THRESHOLD'],
+                                    progress=progress,
+                                    plot_store=plot_store,
+                                    plot_renderer=plot_renderer,
+                                    chart_mode=chart_mode,
+                                    render_profile=render_profile,
+                                    plot_sources=plot_sources,
+                                    histogram_budget=params['HISTOGRAM_BUDGET'],
+                                    boxplot_budget=params['BOXPLOT_BUDGET'])
+        emit(progress, 'stage_finished', stage='load', index=0, total=1,
+             duration=round(time.perf_counter() - started, 4))
+        return analyzer.analyze(outputs)
+    finally:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+class JobManager:
+    """
+    Submits tasks to a bounded process pool and tracks their status.
+
+    At most ``max_pending`` jobs may be queued or running at once; finished
+    jobs are kept for ``result_ttl`` seconds. Every job keeps the ordered
+    list of its progress events, ending with ``job_finished``, and the
+    result sections delivered so far.
+
+    A worker that dies (crash, out of memory) breaks the whole pool: the
+    jobs it held fail and the next jobs run on a new pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 32, result_ttl: float = 600):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._executor = None
+        self._progress_queue = None
+        self._listener = None
+        self._finished = queue.Queue()
+        self._finisher = None
+
+    def _start(self):
+        # Workers are spawned rather than forked so they never inherit the
+        # web server's threads or locks
+        self._progress_queue = multiprocessing.get_context('spawn').Queue()
+        self._executor = self._new_executor()
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+        # Jobs are finished outside the executor's callbacks, which run on
+        # its management thread and must not wait for progress events
+        self._finisher = threading.Thread(target=self._finish_jobs, daemon=True)
+        self._finisher.start()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker, initargs=(self._progress_queue,))
+
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """
+        Replace a broken pool, unless another job already did, and return
+        the current one.
+        """
+        with self._lock:
+            if self._executor is broken:
+                self._executor = self._new_executor()
+                broken.shutdown(wait=False)
+            return self._executor
+
+    def _new_job(self, status: str) -> Dict[str, Any]:
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': status,
+            'stage': None,
+            'stage_index': 0,
+            'stage_count': 0,
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None,
+            'error_status': None,
+            'on_success': None,
+            'events': [],
+            'sections': [],
+            'drained': False,
+        }
+        self.jobs[job['id']] = job
+        return job
+
+    def submit(self, task: Callable, *args, on_success: Optional[Callable[[Any], None]] = None) -> str:
+        """
+        Enqueue ``task(*args, progress=...)`` and return the job id.
+
+        ``task`` must be a module-level function so it can be sent to a
+        worker process. ``on_success`` runs in this process with the result.
+        """
+        with self._lock:
+            self._expire()
+            pending = sum(1 for job in self.jobs.values() if job['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                raise JobQueueFull(f'{pending} jobs pending')
+            if self._executor is None:
+                self._start()
+            job = self._new_job('queued')
+            job['on_success'] = on_success
+            executor = self._executor
+
+        try:
+            future = executor.submit(_run_job, job['id'], task, args)
+        except BrokenProcessPool:
+            # A worker died after the last job finished
+            executor = self._replace_executor(executor)
+            future = executor.submit(_run_job, job['id'], task, args)
+        future.add_done_callback(lambda done: self._finished.put((job['id'], executor, done)))
+        return job['id']
+
+    def completed(self, result: Any) -> str:
+        """
+        Record a job whose result is already known, e.g. from a cache.
+        """
+        with self._lock:
+            self._expire()
+            job = self._new_job('done')
+            job['started_at'] = job['finished_at'] = job['submitted_at']
+            job['result'] = result
+            self._record(job, 'job_finished', {'status': 'done'})
+        return job['id']
+
+    def _record(self, job: Dict[str, Any], event: str, data: Dict[str, Any]):
+        # Called with the lock held
+        job['events'].append({
+            'id': len(job['events']),
+            'event': event,
+            'data': {**data, 'elapsed': round(time.time() - job['submitted_at'], 3)},
+        })
+        self._changed.notify_all()
+
+    def _listen(self):
+        while True:
+            try:
+                job_id, event, payload = self._progress_queue.get()
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                job = self.jobs.get(job_id)
+                if job is None or job['status'] not in ('queued', 'running'):
+                    continue
+                if event == 'job_returned':
+                    job['drained'] = True
+                    self._changed.notify_all()
+                    continue
+                if event == 'job_started':
+                    job['status'] = 'running'
+                    job['started_at'] = time.time()
+                elif event == 'stage_started':
+                    job['stage'] = payload['stage']
+                    job['stage_index'] = payload['index']
+                    job['stage_count'] = payload['total']
+                elif event == 'section_ready':
+                    # The section itself is kept apart so the event stream
+                    # stays small
+                    job['sections'].append({'section': payload['section'], 'data': payload['value']})
+                    payload = {'section': payload['section']}
+                self._record(job, event, payload)
+
+    def _finish_jobs(self):
+        while True:
+            job_id, executor, future = self._finished.get()
+            try:
+                self._finish(job_id, executor, future)
+            except Exception as e:
+                print(f"Error finishing job {job_id}: {e}")
+
+    def _finish(self, job_id: str, executor: ProcessPoolExecutor, future: Future):
+        error = future.exception()
+        result = None if error is not None else future.result()
+        if error is None and isinstance(result, dict) and result.get('success') is False:
+            error = RuntimeError(result.get('error', 'Error desconocido durante el análisis'))
+        broken = isinstance(error, BrokenProcessPool)
+        if broken:
+            self._replace_executor(executor)
+
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            # Record the events still in the queue before job_finished; a
+            # worker that died never sends the marker, hence the timeout
+            if not broken:
+                self._changed.wait_for(lambda: job['drained'], EVENT_DRAIN_TIMEOUT)
+            job['finished_at'] = time.time()
+            if job['started_at'] is None:
+                job['started_at'] = job['finished_at']
+            if error is None:
+                job['status'] = 'done'
+                job['result'] = result
+            else:
+                job['status'] = 'failed'
+                job['error'] = error
+            self._record(job, 'job_finished', {'status': job['status']})
+            on_success, job['on_success'] = job['on_success'], None
+
+        if error is None and on_success is not None:
+            on_success(result)
+
+    def _expire(self):
+        now = time.time()
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job['finished_at'] is not None and now - job['finished_at'] > self.result_ttl]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The job record, or None if it does not exist or has expired.
+        """
+        with self._lock:
+            self._expire()
+            return self.jobs.get(job_id)
+
+    def wait_events(self, job_id: str, cursor: int = 0,
+                    timeout: float = 15) -> Optional[List[Dict[str, Any]]]:
+        """
+        Events of a job from index ``cursor`` on, waiting up to ``timeout``
+        seconds for one to arrive. None if the job does not exist.
+        """
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is not None and len(job['events']) <= cursor:
+                self._changed.wait_for(lambda: len(job['events']) > cursor, timeout)
+            if job is None:
+                return None
+            return job['events'][cursor:]
+
+    def wait_sections(self, job_id: str, cursor: int = 0,
+                      timeout: float = 15) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Result sections of a job from index ``cursor`` on and whether the job
+        has finished, waiting up to ``timeout`` seconds for either. None if
+        the job does not exist.
+        """
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            self._changed.wait_for(lambda: len(job['sections']) > cursor or job['finished_at'] is not None,
+                                   timeout)
+            return job['sections'][cursor:], job['finished_at'] is not None
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        JSON-serializable status: stage reached, progress, elapsed time and
+        position in the queue.
+        """
+        with self._lock:
+            self._expire()
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+
+            now = time.time()
+            queue_position = None
+            if job['status'] == 'queued':
+                queued = sorted((other['submitted_at'], other_id) for other_id, other in self.jobs.items()
+                                if other['status'] == 'queued')
+                queue_position = [other_id for _, other_id in queued].index(job_id) + 1
+
+            if job['status'] == 'done':
+                progress = 100
+            elif job['stage_count']:
+                progress = round(100 * job['stage_index'] / job['stage_count'])
+            else:
+                progress = 0
+
+            return {
+                'id': job['id'],
+                'status': job['status'],
+                'stage': job['stage'],
+                'progress': progress,
+                'queue_position': queue_position,
+                'elapsed_seconds': round((job['finished_at'] or now) - job['submitted_at'], 3),
+                'running_seconds': round((job['finished_at'] or now) - job['started_at'], 3)
+                                   if job['started_at'] is not None else None,
+            }
+
+    def shutdown(self):
+        """
+        Stop the worker processes, waiting for running jobs.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,75 @@
+"""
+Outliers of every numeric column by the interquartile range rule.
+
+A value is an outlier when it lies more than ``OUTLIER_IQR`` interquartile
+ranges below the first quartile or above the third, the rule boxplots draw
+their whiskers with. All columns are compared against their bounds at once
+by broadcasting over one 2-D array, from quartiles the numeric profile
+already holds, so no rows are copied and no quantile is recomputed. Only the
+positions of the outliers are kept, column by column, along with the bounds,
+so the summary and the boxplots reuse them instead of searching again.
+"""
+
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+OUTLIER_IQR = 1.5
+
+
+class IQROutliers:
+    """
+    Outliers of a set of numeric columns.
+
+    ``indices[j]`` holds the positions, in ascending order, of the rows
+    where column ``columns[j]`` lies outside ``[low[j], high[j]]``; null
+    values never are outliers.
+    """
+
+    def __init__(self, columns: List[Any], low: np.ndarray, high: np.ndarray, indices: List[np.ndarray]):
+        self.columns = columns
+        self.low = low
+        self.high = high
+        self.indices = indices
+
+    @classmethod
+    def detect(cls, frame: pd.DataFrame, q1: np.ndarray, q3: np.ndarray,
+               factor: float = OUTLIER_IQR) -> 'IQROutliers':
+        """
+        Find the outliers of the columns of ``frame`` given their first and
+        third quartiles, one per column.
+        """
+        values = frame.to_numpy(dtype=float, na_value=np.nan)
+        q1, q3 = np.asarray(q1, dtype=float), np.asarray(q3, dtype=float)
+        low = q1 - factor * (q3 - q1)
+        high = q3 + factor * (q3 - q1)
+        # Transposed, the positions come out grouped by column and sorted
+        columns, rows = np.nonzero(((values < low) | (values > high)).T)
+        edges = np.searchsorted(columns, np.arange(values.shape[1] + 1))
+        return cls(list(frame.columns), low, high, [rows[start:end] for start, end in zip(edges[:-1], edges[1:])])
+
+    def counts(self) -> pd.Series:
+        """
+        Number of outliers of every column.
+        """
+        return pd.Series([len(rows) for rows in self.indices], index=self.columns, dtype=int)
+
+    def total(self) -> int:
+        """
+        Number of outlying values over all columns.
+        """
+        return sum(len(rows) for rows in self.indices)
+
+    def rows(self, col: Any) -> np.ndarray:
+        """
+        Positions of the rows where ``col`` is an outlier.
+        """
+        return self.indices[self.columns.index(col)]
+
+    def bounds(self, col: Any) -> Tuple[float, float]:
+        """
+        Lowest and highest values of ``col`` that are not outliers.
+        """
+        j = self.columns.index(col)
+        return float(self.low[j]), float(self.high[j])
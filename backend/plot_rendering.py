@@ -0,0 +1,314 @@
+"""
+Plot rendering, in the calling process or fanned out to worker processes.
+
+Each render function receives only the data its plot needs and returns
+the image bytes, so it can run in another process. Figures are explicit
+``Figure`` objects owned by the call, never pyplot's global current
+figure, so concurrent analyses in threads do not interfere. Worker
+processes import matplotlib and seaborn and build the font cache once
+when they start, and results are returned in task order whatever order
+they finish in.
+
+How a plot is encoded depends on who reads it: a ``RenderProfile`` sets
+the resolution and format, e.g. a light WebP for the browser or a 300 DPI
+PNG for a printed report.
+"""
+
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import style
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+
+# Global style, set once at import; rendering never changes it
+style.use('default')
+sns.set_palette("husl")
+
+# Fewer plots than this are rendered in the calling process, where they
+# do not pay for sending data to a worker
+MIN_PARALLEL_PLOTS = 4
+
+# Heatmaps of more columns are drawn without the value of every cell,
+# which would be unreadable and lays out one text per cell
+HEATMAP_ANNOTATION_LIMIT = 15
+
+RenderTask = Tuple[Callable[..., bytes], tuple]
+
+
+class RenderProfile:
+    """
+    Resolution and image format of the plots sent to one kind of consumer.
+
+    ``tight_bbox`` crops the saved image to its content, which costs an
+    extra layout pass; ``tight_layout`` already keeps labels inside the
+    figure, so only the printed report pays for it.
+    """
+
+    def __init__(self, name: str, dpi: int, format: str = 'png', tight_bbox: bool = False):
+        self.name = name
+        self.dpi = dpi
+        self.format = format
+        self.tight_bbox = tight_bbox
+
+    @property
+    def mimetype(self) -> str:
+        return f'image/{self.format}'
+
+    def __repr__(self) -> str:
+        return f"RenderProfile({self.name!r}, dpi={self.dpi}, format={self.format!r})"
+
+
+RENDER_PROFILES: Dict[str, RenderProfile] = {profile.name: profile for profile in (
+    RenderProfile('web-preview', dpi=100, format='webp'),
+    RenderProfile('pdf', dpi=300, format='png', tight_bbox=True),
+    RenderProfile('thumbnail', dpi=50, format='png'),
+)}
+
+DEFAULT_RENDER_PROFILE = 'web-preview'
+
+
+def _hash_argument(digest, value: Any):
+    if isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _hash_argument(digest, item)
+    elif isinstance(value, pd.DataFrame):
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f'{value.dtype}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b'\0')
+
+
+def source_key(function: Callable[..., bytes], args: tuple) -> str:
+    """
+    Hash identifying the plot ``function(*args)`` draws, whatever the
+    profile it is rendered with.
+    """
+    digest = hashlib.sha256(f'{function.__qualname__}\0{matplotlib.__version__}\0'.encode())
+    for value in args:
+        _hash_argument(digest, value)
+    return digest.hexdigest()
+
+
+def render_key(source: str, profile: RenderProfile) -> str:
+    """
+    Hash identifying the image of the plot ``source`` rendered with
+    ``profile``, so a plot already rendered with the same data and profile
+    can be reused without drawing it again.
+    """
+    parts = (source, profile.name, profile.dpi, profile.format, profile.tight_bbox)
+    return hashlib.sha256('\0'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+class FigureTemplate:
+    """
+    Size, fonts and axes styling shared by every plot of one kind.
+
+    Each call gets its own ``Figure`` on its own Agg canvas, never the
+    pyplot current figure, so plots can be rendered concurrently from
+    several threads.
+    """
+
+    def __init__(self, figsize: Tuple[float, float], title_size: int):
+        self.figsize = figsize
+        # Font properties are resolved once and shared by every plot
+        self.title_font = FontProperties(size=title_size, weight='bold')
+
+    def new(self) -> Tuple[Figure, Axes]:
+        figure = Figure(figsize=self.figsize)
+        FigureCanvasAgg(figure)
+        return figure, figure.add_subplot()
+
+    def title(self, axes: Axes, text: str, grid: bool = True):
+        axes.set_title(text, fontproperties=self.title_font)
+        if grid:
+            axes.grid(True, alpha=0.3)
+
+    def export(self, figure: Figure, profile: RenderProfile) -> bytes:
+        figure.tight_layout()
+        buffer = BytesIO()
+        figure.savefig(buffer, format=profile.format, dpi=profile.dpi,
+                       bbox_inches='tight' if profile.tight_bbox else None)
+        return buffer.getvalue()
+
+
+HEATMAP = FigureTemplate((10, 8), title_size=16)
+HISTOGRAM = FigureTemplate((8, 6), title_size=14)
+BOXPLOT = FigureTemplate((8, 6), title_size=14)
+GROUPED_BOXPLOT = FigureTemplate((12, 6), title_size=14)
+
+_DEFAULT_PROFILE = RENDER_PROFILES[DEFAULT_RENDER_PROFILE]
+
+
+def render_heatmap(correlation_matrix: pd.DataFrame, profile: RenderProfile = _DEFAULT_PROFILE) -> bytes:
+    figure, axes = HEATMAP.new()
+    annotated = len(correlation_matrix.columns) <= HEATMAP_ANNOTATION_LIMIT
+    sns.heatmap(correlation_matrix,
+                annot=annotated,
+                cmap='coolwarm',
+                center=0,
+                square=True,
+                fmt='.2f',
+                xticklabels=True,
+                yticklabels=True,
+                cbar_kws={'shrink': 0.8},
+                ax=axes)
+    if not annotated:
+        axes.tick_params(labelsize=7)
+    HEATMAP.title(axes, 'Matriz de Correlación', grid=False)
+    return HEATMAP.export(figure, profile)
+
+
+def render_histogram(column: str, values: np.ndarray, mean: float, median: float,
+                     profile: RenderProfile = _DEFAULT_PROFILE) -> bytes:
+    figure, axes = HISTOGRAM.new()
+    axes.hist(values, bins=30, alpha=0.7, color='skyblue', edgecolor='black')
+    HISTOGRAM.title(axes, f'Histograma de {column}')
+    axes.set_xlabel(column)
+    axes.set_ylabel('Frecuencia')
+
+    # Add statistics text
+    axes.axvline(mean, color='red', linestyle='--', label=f'Media: {mean:.2f}')
+    axes.axvline(median, color='green', linestyle='--', label=f'Mediana: {median:.2f}')
+    axes.legend()
+    return HISTOGRAM.export(figure, profile)
+
+
+def render_boxplot(column: str, box: Dict[str, Any], profile: RenderProfile = _DEFAULT_PROFILE) -> bytes:
+    # The box is already summarized (chart_data.iqr_box); matplotlib only draws it
+    figure, axes = BOXPLOT.new()
+    axes.bxp([{'q1': box['q1'], 'med': box['median'], 'q3': box['q3'], 'whislo': box['whisker_low'],
+               'whishi': box['whisker_high'], 'fliers': box['outliers']}])
+    BOXPLOT.title(axes, f'Boxplot de {column}')
+    axes.set_ylabel(column)
+    return BOXPLOT.export(figure, profile)
+
+
+def render_grouped_boxplot(num_col: str, cat_col: str, groups: List[Tuple[Any, np.ndarray]],
+                           profile: RenderProfile = _DEFAULT_PROFILE) -> bytes:
+    figure, axes = GROUPED_BOXPLOT.new()
+    sns.boxplot(data=[values for _, values in groups], ax=axes)
+    axes.set_xticks(range(len(groups)), [str(name) for name, _ in groups])
+    GROUPED_BOXPLOT.title(axes, f'Boxplot de {num_col} por {cat_col}')
+    axes.set_xlabel(cat_col)
+    axes.set_ylabel(num_col)
+    axes.tick_params(axis='x', labelrotation=45)
+    return GROUPED_BOXPLOT.export(figure, profile)
+
+
+# Render functions by plot type, the name under which plots are described
+# to clients and stored for rendering later
+PLOT_TYPES: Dict[str, Callable[..., bytes]] = {
+    'heatmap': render_heatmap,
+    'histogram': render_histogram,
+    'boxplot': render_boxplot,
+    'grouped_boxplot': render_grouped_boxplot,
+}
+
+_PLOT_TYPE_NAMES = {function: name for name, function in PLOT_TYPES.items()}
+
+
+def plot_type(function: Callable[..., bytes]) -> str:
+    return _PLOT_TYPE_NAMES[function]
+
+
+def describe_plot(function: Callable[..., bytes], args: tuple) -> Dict[str, Any]:
+    """
+    Type and parameters of the plot ``function(*args)`` would draw, without
+    its data.
+    """
+    kind = plot_type(function)
+    if kind == 'heatmap':
+        params = {'columns': [str(col) for col in args[0].columns]}
+    elif kind == 'histogram':
+        params = {'column': str(args[0]), 'mean': float(args[2]), 'median': float(args[3])}
+    elif kind == 'boxplot':
+        params = {'column': str(args[0])}
+    else:
+        params = {'column': str(args[0]), 'group_by': str(args[1]),
+                  'categories': [str(name) for name, _ in args[2]]}
+    return {'type': kind, 'params': params}
+
+
+def _warm_up():
+    # Worker initializer: drawing text once loads the fonts and the image
+    # encoder, so the first real plot of every worker does not pay for it
+    figure, axes = HISTOGRAM.new()
+    HISTOGRAM.title(axes, '0')
+    axes.text(0.5, 0.5, '0')
+    HISTOGRAM.export(figure, _DEFAULT_PROFILE)
+
+
+class PlotRenderer:
+    """
+    Renders plot tasks, using a pool of ``max_workers`` processes when
+    there are at least ``min_parallel`` of them.
+
+    The pool is created on first use and reused for later analyses.
+    """
+
+    def __init__(self, max_workers: int = 1, min_parallel: int = MIN_PARALLEL_PLOTS):
+        self.max_workers = max_workers
+        self.min_parallel = min_parallel
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context('spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context,
+                                                     initializer=_warm_up)
+            return self._executor
+
+    def render(self, tasks: Sequence[RenderTask],
+               on_rendered: Optional[Callable[[int], None]] = None) -> List[Union[bytes, Exception]]:
+        """
+        Image bytes of each ``(function, args)`` task, in task order, or the
+        exception the task raised. ``on_rendered(count)`` is called each
+        time a plot finishes.
+        """
+        outputs: List[Union[bytes, Exception]] = [None] * len(tasks)
+        if self.max_workers <= 1 or len(tasks) < self.min_parallel:
+            for index, (function, args) in enumerate(tasks):
+                try:
+                    outputs[index] = function(*args)
+                except Exception as e:
+                    outputs[index] = e
+                if on_rendered is not None:
+                    on_rendered(index + 1)
+            return outputs
+
+        pool = self._pool()
+        futures = {pool.submit(function, *args): index for index, (function, args) in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            error = future.exception()
+            outputs[futures[future]] = error if error is not None else future.result()
+            if on_rendered is not None:
+                on_rendered(done)
+        return outputs
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
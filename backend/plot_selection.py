@@ -0,0 +1,83 @@
+"""
+Scores deciding which plots are worth drawing.
+
+Plots are ranked from statistics the analysis computes anyway, so ranking
+costs far less than drawing one plot. A histogram scores by how much its
+column's distribution has to show: constant columns and row identifiers
+(1, 2, 3, ...) score zero, skewed and complete columns score higher. A
+boxplot of a numeric column by a category scores by how strongly the
+category explains the numeric column (eta squared), weighted by the share
+of rows its plotted categories cover.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Skewness beyond which a distribution does not score higher
+SKEW_CAP = 3.0
+
+# Weight of numeric columns with at most two distinct values, e.g. flags
+BINARY_WEIGHT = 0.5
+
+
+def is_sequence(stats: pd.Series) -> bool:
+    """
+    Whether a numeric column may be a row identifier: as many values as the
+    span between its minimum and maximum, as in 1, 2, ..., n.
+    """
+    count = stats['count']
+    return bool(count > 1 and stats['max'] - stats['min'] + 1 == count)
+
+
+def is_identifier(values: pd.Series, stats: pd.Series) -> bool:
+    """
+    Whether a numeric column is a row identifier: every whole number of its
+    span, each once. Only sequences are checked against their values.
+    """
+    if not is_sequence(stats):
+        return False
+    values = values.dropna()
+    return bool((values % 1 == 0).all() and values.nunique() == stats['count'])
+
+
+def distribution_score(stats: pd.Series, distinct: Optional[int] = None) -> float:
+    """
+    Score of a numeric column's distribution from its row of the numeric
+    profile; ``distinct`` is its number of distinct values when known.
+    Identifiers are left to the caller, see ``is_identifier``.
+    """
+    count, rows = stats['count'], stats['count'] + stats['null_count']
+    if count < 2 or not stats['std'] > 0:
+        return 0.0
+
+    skew = 0.0 if pd.isna(stats['skew']) else min(abs(stats['skew']), SKEW_CAP)
+    score = (count / rows) * (1 + skew / SKEW_CAP)
+    if distinct is not None and distinct <= 2:
+        score *= BINARY_WEIGHT
+    return float(score)
+
+
+def eta_squared(counts: np.ndarray, sums: np.ndarray, squares: np.ndarray) -> float:
+    """
+    Share of a numeric column's variance explained by the group of each
+    row, from per-group counts, sums and sums of squares.
+    """
+    total = counts.sum()
+    if total < 2 or np.count_nonzero(counts) < 2:
+        return 0.0
+    grand = sums.sum() ** 2 / total
+    ss_total = squares.sum() - grand
+    if ss_total <= 0:
+        return 0.0
+    present = counts > 0
+    ss_between = (sums[present] ** 2 / counts[present]).sum() - grand
+    return float(min(max(ss_between / ss_total, 0.0), 1.0))
+
+
+def association_score(eta2: float, coverage: float) -> float:
+    """
+    Score of a grouped boxplot whose groups hold ``coverage`` of the rows.
+    """
+    return float(eta2 * coverage)
@@ -0,0 +1,60 @@
+"""
+Plots rendered on demand, the first time a client asks for them.
+
+Instead of drawing every plot, an analysis can save what each plot needs
+(its type and the data passed to its render function) and describe it to
+the client. The data is kept in a private artifact store, since the
+uploaded file is gone once the analysis ends; the image is rendered and
+stored in the public plot store when it is first requested, once per
+render profile.
+"""
+
+import pickle
+from typing import Any, Callable, Dict, Optional
+
+from artifact_store import ArtifactStore
+from plot_rendering import PLOT_TYPES, RenderProfile, describe_plot, plot_type, render_key, source_key
+
+
+def save_plot_source(sources: ArtifactStore, function: Callable[..., bytes], args: tuple) -> str:
+    """
+    Keep the data of the plot ``function(*args)`` and return its key.
+    """
+    key = source_key(function, args)
+    if sources.lookup(key) is None:
+        data = pickle.dumps((plot_type(function), args), protocol=pickle.HIGHEST_PROTOCOL)
+        sources.link(key, sources.put(data, 'pkl'))
+    return key
+
+
+def plot_descriptor(sources: ArtifactStore, function: Callable[..., bytes], args: tuple,
+                    url_prefix: str) -> Dict[str, Any]:
+    """
+    Save the plot's data and describe it: type, parameters and the URL
+    rendering it.
+    """
+    key = save_plot_source(sources, function, args)
+    return {**describe_plot(function, args), 'id': key, 'url': f'{url_prefix}/render/{key}'}
+
+
+def render_plot_source(sources: ArtifactStore, plots: ArtifactStore, key: str,
+                       profile: RenderProfile) -> Optional[str]:
+    """
+    Name in ``plots`` of the image of plot ``key`` with ``profile``,
+    rendering it unless it was rendered before. None if the plot's data is
+    not stored (unknown or evicted key).
+    """
+    name = plots.lookup(render_key(key, profile))
+    if name is not None:
+        return name
+
+    source = sources.lookup(key)
+    if source is None:
+        return None
+    # Sources are only ever written by save_plot_source
+    with open(sources.path(source), 'rb') as f:
+        kind, args = pickle.load(f)
+
+    name = plots.put(PLOT_TYPES[kind](*args, profile), profile.format)
+    plots.link(render_key(key, profile), name)
+    return name
@@ -0,0 +1,73 @@
+"""
+Progress events emitted while an analysis runs.
+
+A progress callback receives ``(event, data)`` with ``event`` one of
+``bytes_parsed``, ``stage_started``, ``stage_finished``,
+``plot_rendered`` or ``section_ready``, which carries a finished result
+section. Events are throttled or bounded by the number of stages and
+plots, so reporting stays cheap enough to leave on.
+"""
+
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+# Minimum share of the file parsed between two bytes_parsed events
+BYTES_EVENT_STEP = 0.01
+
+
+def emit(progress: Optional[ProgressCallback], event: str, **data):
+    """
+    Send an event to ``progress`` if there is one.
+    """
+    if progress is not None:
+        progress(event, data)
+
+
+class ProgressReader:
+    """
+    Binary file wrapper that reports the bytes read by the CSV parser.
+
+    pandas reads the handle in large blocks, so wrapping it does not slow
+    parsing down; events are sent at most once per ``step`` of the file.
+    """
+
+    def __init__(self, file: BinaryIO, total_bytes: int, progress: ProgressCallback,
+                 step: float = BYTES_EVENT_STEP):
+        self.file = file
+        self.total_bytes = total_bytes
+        self.progress = progress
+        self.bytes_read = 0
+        self._step = max(1, int(total_bytes * step))
+        self._next_report = self._step
+        self._reported = -1
+
+    def read(self, size: int = -1) -> bytes:
+        return self._count(self.file.read(size))
+
+    def read1(self, size: int = -1) -> bytes:
+        # Used by the text wrapper pandas puts around binary handles
+        return self._count(self.file.read1(size))
+
+    def _count(self, data: bytes) -> bytes:
+        self.bytes_read += len(data)
+        if data and self.bytes_read >= self._next_report:
+            self.report()
+        elif not data and self._reported != self.bytes_read:
+            # End of file: make sure the final position is sent once
+            self.report()
+        return data
+
+    def report(self):
+        """
+        Send the current position, e.g. once parsing has finished.
+        """
+        self._next_report = self.bytes_read + self._step
+        self._reported = self.bytes_read
+        emit(self.progress, 'bytes_parsed', bytes=self.bytes_read, total_bytes=self.total_bytes)
+
+    def __iter__(self):
+        return iter(self.file)
+
+    def __getattr__(self, name: str):
+        return getattr(self.file, name)
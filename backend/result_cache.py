@@ -0,0 +1,193 @@
+"""
+Cache of complete analysis results keyed by the uploaded content.
+
+The key is a SHA-256 of the uploaded bytes plus the analysis options, so
+re-uploading the same export with the same settings returns the stored
+result instead of re-parsing and re-plotting it. Entries live in an LRU
+memory tier and, optionally, in an LRU on-disk tier of JSON files that
+survives restarts; both expire after a TTL. Disk entries are written with
+the JSON provider the responses use, so a result read back from disk is
+sent exactly as one kept in memory.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+# Bytes read per update when hashing an upload
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider, also turning numpy scalars and arrays into
+    Python numbers and lists.
+    """
+
+    @staticmethod
+    def default(value: Any) -> Any:
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        return DefaultJSONProvider.default(value)
+
+
+def content_key(stream: BinaryIO, options: Dict[str, Any]) -> str:
+    """
+    SHA-256 of a binary stream and the analysis options.
+
+    The stream is read to the end and rewound, so it can still be saved
+    or parsed afterwards.
+    """
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(HASH_BLOCK_SIZE), b''):
+        digest.update(block)
+    stream.seek(0)
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier LRU cache of analysis results with a time to live.
+
+    ``get`` returns the result and its age in seconds; results found only
+    on disk are promoted to memory. Disk entries are serialized with
+    ``dumps``, normally the application's ``app.json.dumps``.
+    """
+
+    def __init__(self, max_entries: int = 32, ttl: float = 3600,
+                 disk_dir: Optional[str] = None, max_disk_entries: int = 256,
+                 dumps: Callable[[Any], str] = json.dumps):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self.dumps = dumps
+        self._memory: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f'{key}.json')
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Cached result and its age in seconds, or None on a miss.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    return entry[1], time.time() - entry[0]
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self._store_memory(key, entry)
+        return entry[1], time.time() - entry[0]
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result in every tier.
+        """
+        entry = (time.time(), result)
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def discard(self, key: str):
+        """
+        Drop one entry from both tiers.
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.disk_dir:
+            try:
+                os.remove(self._disk_path(key))
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Drop every entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def _store_memory(self, key: str, entry: Tuple[float, Dict[str, Any]]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self._expired(stored['created']):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        # The file's modification time records its last use for LRU eviction
+        os.utime(path)
+        return stored['created'], stored['result']
+
+    def _write_disk(self, key: str, entry: Tuple[float, Dict[str, Any]]):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.dumps({'created': entry[0], 'result': entry[1]}))
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing cached result {path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith('.json'):
+                path = os.path.join(self.disk_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_disk_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
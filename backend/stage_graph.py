@@ -0,0 +1,68 @@
+"""
+Dependency graph of named analysis stages.
+
+Each stage names the analyzer method that produces it and the stages it
+depends on. Callers ask for a set of outputs and only those stages and
+their dependencies run, in dependency order.
+"""
+
+from typing import Dict, Iterable, List, Sequence
+
+
+class Stage:
+    """
+    One node of the graph.
+
+    ``memoized`` stages are produced by methods that already store their
+    result in the statistics cache; the others are memoized by the runner.
+    """
+
+    def __init__(self, name: str, method: str, dependencies: Sequence[str] = (), memoized: bool = False):
+        self.name = name
+        self.method = method
+        self.dependencies = tuple(dependencies)
+        self.memoized = memoized
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, dependencies={list(self.dependencies)!r})"
+
+
+class StageGraph:
+    """
+    Named stages with declared dependencies.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, method: str, dependencies: Sequence[str] = (), memoized: bool = False) -> Stage:
+        """
+        Register a stage; its dependencies must already be registered.
+        """
+        missing = [dep for dep in dependencies if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {', '.join(missing)}")
+        stage = Stage(name, method, dependencies, memoized)
+        self.stages[name] = stage
+        return stage
+
+    def plan(self, targets: Iterable[str]) -> List[str]:
+        """
+        The stages needed for ``targets``, each after its dependencies.
+        """
+        order: List[str] = []
+        seen = set()
+
+        def visit(name: str):
+            if name in seen:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Unknown analysis output: '{name}'")
+            seen.add(name)
+            for dep in self.stages[name].dependencies:
+                visit(dep)
+            order.append(name)
+
+        for target in targets:
+            visit(target)
+        return order
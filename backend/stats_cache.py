@@ -0,0 +1,85 @@
+"""
+Memoized statistics shared by every stage of an analysis.
+
+Quantities such as the numeric columns, null counts or the correlation
+matrix are computed the first time a stage asks for them and reused by
+every later stage. Lookups are counted per stage, so the report shows
+which stage paid for each computation and which ones were served from
+the cache.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator
+
+# Stage charged for lookups made outside any ``stage`` block
+DEFAULT_STAGE = 'other'
+
+
+def _key_label(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return ':'.join(str(part) for part in key)
+    return str(key)
+
+
+class StatsCache:
+    """
+    Lazily populated cache of dataset statistics with per-stage hit and
+    miss counters.
+    """
+
+    def __init__(self):
+        self.values: Dict[Hashable, Any] = {}
+        self.counters: Dict[str, Dict[str, Any]] = {}
+        self.current_stage = DEFAULT_STAGE
+
+    def _counter(self) -> Dict[str, Any]:
+        return self.counters.setdefault(self.current_stage, {'hits': 0, 'misses': 0, 'computed': []})
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Value stored under ``key``, calling ``compute`` on the first request.
+        """
+        counter = self._counter()
+        if key in self.values:
+            counter['hits'] += 1
+        else:
+            counter['misses'] += 1
+            counter['computed'].append(_key_label(key))
+            self.values[key] = compute()
+        return self.values[key]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store or replace a value, e.g. when an estimate is refined.
+        """
+        self.values[key] = value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.values
+
+    def clear(self):
+        """
+        Forget every value and counter, e.g. when the dataset changes.
+        """
+        self.values = {}
+        self.counters = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator['StatsCache']:
+        """
+        Charge the lookups made inside the block to stage ``name``.
+        """
+        previous = self.current_stage
+        self.current_stage = name
+        try:
+            yield self
+        finally:
+            self.current_stage = previous
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Hits, misses and computed keys per stage.
+        """
+        return {stage: {'hits': counter['hits'], 'misses': counter['misses'],
+                        'computed': list(counter['computed'])}
+                for stage, counter in self.counters.items()}
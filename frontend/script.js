@@ -2,6 +2,31 @@
 
 // Configuración
 const API_BASE_URL = 'http://localhost:5000';
+const JOB_POLL_INTERVAL = 500; // Milisegundos entre consultas del estado del análisis
+// Modo de los gráficos: 'data' los dibuja en el navegador, 'lazy' pide cada imagen al servidor
+// cuando el gráfico entra en pantalla e 'image' las genera todas durante el análisis
+const CHART_MODE = 'data';
+
+// Mensajes de progreso para cada etapa del análisis en el servidor
+const STAGE_MESSAGES = {
+    load: "Cargando datos...",
+    numerical_data: "Analizando estructura...",
+    categorical_data: "Analizando estructura...",
+    null_counts: "Analizando estructura...",
+    duplicate_rows: "Analizando estructura...",
+    basic_info: "Analizando estructura...",
+    numeric_profile: "Calculando estadísticas...",
+    statistical_summary: "Calculando estadísticas...",
+    data_preview: "Calculando estadísticas...",
+    correlation_matrix: "Calculando estadísticas...",
+    correlation_heatmap: "Generando visualizaciones...",
+    histograms: "Generando visualizaciones...",
+    boxplots: "Generando visualizaciones...",
+    ai_insights: "Aplicando IA..."
+};
+
+// Contenedores de las secciones de resultados
+const RESULT_CONTAINERS = ['datasetInfo', 'basicStats', 'dataPreview', 'nullValues', 'columnDistribution', 'visualizations', 'aiInsights'];
 
 // Elementos del DOM
 const uploadForm = document.getElementById('uploadForm');
@@ -67,63 +92,216 @@ async function analyzeData(file) {
         
         const formData = new FormData();
         formData.append('file', file);
+        formData.append('chart_mode', CHART_MODE);
         
-        // Iniciar progreso inmediatamente después de mostrar loading
-        setTimeout(() => {
-            simulateProgress();
-        }, 200);
+        updateProgress(5, "Validando archivo...");
         
+        // El servidor encola el análisis y devuelve el id del trabajo
         const response = await fetch(`${API_BASE_URL}/analyze`, {
             method: 'POST',
             body: formData
         });
         
         if (!response.ok) {
-            throw new Error(`Error del servidor: ${response.status}`);
+            const body = await response.json().catch(() => ({}));
+            const error = new Error(body.error || `Error del servidor: ${response.status}`);
+            error.serverMessage = body.error;
+            throw error;
         }
         
-        const results = await response.json();
-        completeProgress();
+        const job = await response.json();
         
-        // Guardar resultados para descarga PDF
-        window.lastAnalysisResults = results;
-        window.lastFileName = file.name;
+        if (window.ReadableStream && window.TextDecoder && job.sections_url) {
+            // Cada sección se muestra en cuanto termina su etapa en el servidor
+            trackJobProgress(job);
+            finishAnalysis(await streamJobSections(job), file);
+            return;
+        }
         
-        // Esperar un poco antes de mostrar resultados para que se vea el 100%
-        setTimeout(() => {
-            displayResults(results);
-        }, 1000);
+        finishAnalysis(await followJob(job), file);
         
     } catch (error) {
         console.error('Error durante el análisis:', error);
-        if (window.currentProgressInterval) {
-            clearInterval(window.currentProgressInterval);
+        showError(error.serverMessage || 'Error al analizar el archivo. Verifica que el servidor esté ejecutándose.');
+    }
+}
+
+// Terminar el análisis igual se hayan recibido las secciones por separado o no
+function finishAnalysis(results, file) {
+    completeProgress();
+    
+    // Guardar resultados para descarga PDF
+    window.lastAnalysisResults = results;
+    window.lastFileName = file.name;
+    
+    // Esperar un poco antes de mostrar resultados para que se vea el 100%
+    setTimeout(() => {
+        displayResults(results);
+    }, 1000);
+}
+
+// Seguir el progreso real del trabajo por Server-Sent Events y devolver su resultado;
+// si el flujo de eventos no está disponible se consulta el estado periódicamente
+async function followJob(job) {
+    const finished = await trackJobProgress(job);
+    return finished ? fetchJobResult(job) : waitForJob(job);
+}
+
+// Actualizar la barra de progreso con los eventos del trabajo; indica si se
+// recibió el final del trabajo por el flujo de eventos
+function trackJobProgress(job) {
+    if (!window.EventSource || !job.events_url || ['done', 'failed'].includes(job.status.status)) {
+        return Promise.resolve(false);
+    }
+    
+    return new Promise(resolve => {
+        const source = new EventSource(`${API_BASE_URL}${job.events_url}`);
+        // Etapa en curso, para repartir el avance de las visualizaciones dentro de ella
+        let stage = { index: 0, total: 1 };
+        
+        if (job.status.status === 'queued') {
+            updateProgress(5, `En cola (posición ${job.status.queue_position})...`);
+        }
+        source.addEventListener('job_started', () => {
+            updateProgress(10, "Cargando datos...");
+        });
+        source.addEventListener('bytes_parsed', event => {
+            // La lectura del archivo ocupa de 10% a 30%
+            const data = JSON.parse(event.data);
+            const share = data.total_bytes ? data.bytes / data.total_bytes : 1;
+            updateProgress(10 + Math.round(share * 20), `Cargando datos (${formatBytes(data.bytes)} de ${formatBytes(data.total_bytes)})...`);
+        });
+        source.addEventListener('stage_started', event => {
+            const data = JSON.parse(event.data);
+            if (data.stage === 'load') {
+                return;
+            }
+            // Las etapas del análisis ocupan de 30% a 95%
+            stage = data;
+            updateProgress(30 + Math.round(65 * data.index / data.total), STAGE_MESSAGES[data.stage] || "Analizando datos...");
+        });
+        source.addEventListener('plot_rendered', event => {
+            const data = JSON.parse(event.data);
+            const done = (stage.index + data.rendered / data.total) / stage.total;
+            updateProgress(30 + Math.round(65 * done), `Generando visualizaciones (${data.rendered}/${data.total})...`);
+        });
+        source.addEventListener('job_finished', () => {
+            source.close();
+            resolve(true);
+        });
+        source.onerror = () => {
+            source.close();
+            resolve(false);
+        };
+    });
+}
+
+// Leer el resultado en NDJSON y mostrar cada sección en cuanto llega
+async function streamJobSections(job) {
+    const response = await fetch(`${API_BASE_URL}${job.sections_url}`);
+    if (!response.ok) {
+        throw new Error(`Error del servidor: ${response.status}`);
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const results = {};
+    let buffer = '';
+    
+    // Quitar las secciones y el error del análisis anterior antes de mostrar las nuevas
+    clearResults();
+    errorArea.classList.add('hidden');
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        for (const line of lines) {
+            // Las líneas vacías solo mantienen viva la conexión
+            if (!line.trim()) {
+                continue;
+            }
+            const message = JSON.parse(line);
+            if (message.done) {
+                if (message.success === false) {
+                    const error = new Error(message.error);
+                    error.serverMessage = message.error;
+                    throw error;
+                }
+                const { done: _, ...rest } = message;
+                return Object.assign(results, rest);
+            }
+            results[message.section] = message.data;
+            resultsSection.classList.remove('hidden');
+            displaySection(message.section, results);
+        }
+        
+        if (done) {
+            throw new Error('La conexión se cerró antes de terminar el análisis');
         }
-        showError('Error al analizar el archivo. Verifica que el servidor esté ejecutándose.');
     }
 }
 
+// Consultar el estado del trabajo hasta que termine y devolver su resultado
+async function waitForJob(job) {
+    let status = job.status;
+    
+    while (status.status === 'queued' || status.status === 'running') {
+        if (status.status === 'queued') {
+            updateProgress(5, `En cola (posición ${status.queue_position})...`);
+        } else {
+            // El avance real va de 10% a 95%; el resto es la carga de resultados
+            const percent = 10 + Math.round(status.progress * 0.85);
+            updateProgress(percent, STAGE_MESSAGES[status.stage] || "Analizando datos...");
+        }
+        
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+        const statusResponse = await fetch(`${API_BASE_URL}${job.status_url}`);
+        if (!statusResponse.ok) {
+            throw new Error(`Error del servidor: ${statusResponse.status}`);
+        }
+        status = await statusResponse.json();
+    }
+    
+    return fetchJobResult(job);
+}
+
+async function fetchJobResult(job) {
+    const resultResponse = await fetch(`${API_BASE_URL}${job.result_url}`);
+    const results = await resultResponse.json();
+    if (!resultResponse.ok) {
+        const error = new Error(results.error || `Error del servidor: ${resultResponse.status}`);
+        error.serverMessage = results.error;
+        throw error;
+    }
+    return results;
+}
+
+function clearResults() {
+    RESULT_CONTAINERS.forEach(id => {
+        document.getElementById(id).innerHTML = '';
+    });
+}
+
 function displayResults(results) {
     hideAllSections();
+    clearResults();
     resultsSection.classList.remove('hidden');
     
     // Habilitar el botón de análisis nuevamente
     analyzeBtn.disabled = false;
     
     // Mostrar información del dataset
-    displayDatasetInfo(results.basic_info);
+    displayBasicInfo(results.basic_info);
     
     // Mostrar estadísticos básicos
     displayBasicStats(results.statistical_summary);
     
-    // Mostrar valores nulos
-    if (results.basic_info?.null_values) {
-        displayNullValues(results.basic_info.null_values);
-    }
-    
-    // Mostrar distribución de columnas
-    if (results.basic_info?.data_types) {
-        displayColumnDistribution(results.basic_info.data_types);
+    // Mostrar las primeras filas
+    if (results.data_preview) {
+        displayDataPreview(results.data_preview);
     }
     
     // Mostrar visualizaciones
@@ -135,6 +313,43 @@ function displayResults(results) {
     }
 }
 
+// Mostrar una sección recibida por separado; results contiene las recibidas hasta ahora
+function displaySection(name, results) {
+    switch (name) {
+        case 'basic_info':
+            displayBasicInfo(results.basic_info);
+            break;
+        case 'statistical_summary':
+            displayBasicStats(results.statistical_summary);
+            break;
+        case 'data_preview':
+            displayDataPreview(results.data_preview);
+            break;
+        case 'correlation_heatmap':
+        case 'histograms':
+        case 'boxplots':
+            displayVisualizations(results);
+            break;
+        case 'ai_insights':
+            displayAIInsights(results.ai_insights);
+            break;
+    }
+}
+
+function displayBasicInfo(info) {
+    displayDatasetInfo(info);
+    
+    // Mostrar valores nulos
+    if (info?.null_values) {
+        displayNullValues(info.null_values);
+    }
+    
+    // Mostrar distribución de columnas
+    if (info?.data_types) {
+        displayColumnDistribution(info.data_types);
+    }
+}
+
 function displayDatasetInfo(info) {
     const container = document.getElementById('datasetInfo');
     
@@ -229,6 +444,8 @@ function displayBasicStats(stats) {
         html += '<div class="stats-grid">';
         
         for (const [column, columnStats] of Object.entries(stats)) {
+            // Los cuartiles de datasets grandes se estiman con un sketch
+            const approx = columnStats.quantiles_exact === false ? '≈ ' : '';
             html += `
                 <div class="stat-column">
                     <h5>📊 ${column}</h5>
@@ -236,10 +453,11 @@ function displayBasicStats(stats) {
                         <tbody>
                             <tr><td><strong>Conteo:</strong></td><td>${columnStats.count}</td></tr>
                             <tr><td><strong>Media:</strong></td><td>${columnStats.mean}</td></tr>
-                            <tr><td><strong>Mediana:</strong></td><td>${columnStats.median}</td></tr>
+                            <tr><td><strong>Mediana:</strong></td><td>${approx}${columnStats.median}</td></tr>
                             <tr><td><strong>Desv. Est.:</strong></td><td>${columnStats.std}</td></tr>
                             <tr><td><strong>Mínimo:</strong></td><td>${columnStats.min}</td></tr>
                             <tr><td><strong>Máximo:</strong></td><td>${columnStats.max}</td></tr>
+                            ${columnStats.outliers !== undefined ? `<tr><td><strong>Atípicos:</strong></td><td>${columnStats.outliers_exact === false ? '≈ ' : ''}${columnStats.outliers}</td></tr>` : ''}
                         </tbody>
                     </table>
                 </div>
@@ -253,6 +471,28 @@ function displayBasicStats(stats) {
     container.innerHTML = html;
 }
 
+function displayDataPreview(rows) {
+    const container = document.getElementById('dataPreview');
+    
+    if (!rows || rows.length === 0) {
+        container.innerHTML = '<div class="info-box"><p>No hay filas para mostrar.</p></div>';
+        return;
+    }
+    
+    const columns = Object.keys(rows[0]);
+    const cell = value => value === null || value === undefined ? '—' : escapeHtml(value);
+    container.innerHTML = `
+        <div style="overflow-x: auto;">
+            <table class="preview-table">
+                <thead><tr>${columns.map(col => `<th>${escapeHtml(col)}</th>`).join('')}</tr></thead>
+                <tbody>
+                    ${rows.map(row => `<tr>${columns.map(col => `<td>${cell(row[col])}</td>`).join('')}</tr>`).join('')}
+                </tbody>
+            </table>
+        </div>
+    `;
+}
+
 function displayNullValues(nullValues) {
     const container = document.getElementById('nullValues');
     
@@ -369,6 +609,13 @@ function formatNumber(num) {
     }).format(num);
 }
 
+function formatBytes(bytes) {
+    if (bytes < 1024 * 1024) {
+        return `${Math.round(bytes / 1024)} KB`;
+    }
+    return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+}
+
 function capitalizeFirst(str) {
     return str.charAt(0).toUpperCase() + str.slice(1);
 }
@@ -399,44 +646,8 @@ function showLoading(fileName = '') {
     analyzeBtn.disabled = true;
 }
 
-// Función para simular progreso
-function simulateProgress() {
-    let currentStage = 0;
-    const stages = [
-        { percent: 10, message: "Validando archivo..." },
-        { percent: 25, message: "Cargando datos..." },
-        { percent: 40, message: "Analizando estructura..." },
-        { percent: 60, message: "Calculando estadísticas..." },
-        { percent: 80, message: "Generando visualizaciones..." },
-        { percent: 95, message: "Aplicando IA..." }
-    ];
-    
-    // Empezar inmediatamente con la primera etapa
-    if (stages.length > 0) {
-        updateProgress(stages[0].percent, stages[0].message);
-        currentStage = 1;
-    }
-    
-    const progressInterval = setInterval(() => {
-        if (currentStage < stages.length) {
-            const stage = stages[currentStage];
-            updateProgress(stage.percent, stage.message);
-            currentStage++;
-        } else {
-            clearInterval(progressInterval);
-            window.currentProgressInterval = null;
-        }
-    }, 1000); // Cambiar cada 1 segundo para mejor visibilidad
-    
-    // Guardar referencia para poder limpiarlo si es necesario
-    window.currentProgressInterval = progressInterval;
-}
-
 // Función para completar progreso
 function completeProgress() {
-    if (window.currentProgressInterval) {
-        clearInterval(window.currentProgressInterval);
-    }
     updateProgress(100, "¡Análisis completado!");
     
     // Esperar un momento antes de mostrar resultados
@@ -561,7 +772,7 @@ function displayVisualizations(results) {
             <div class="visualization-section">
                 <h5>🔥 Matriz de Correlación</h5>
                 <div class="plot-container">
-                    <img src="${results.correlation_heatmap}" alt="Matriz de Correlación" style="max-width: 100%; height: auto;">
+                    ${chartMarkup(results.correlation_heatmap, 'Matriz de Correlación')}
                 </div>
             </div>
         `;
@@ -573,7 +784,7 @@ function displayVisualizations(results) {
         results.histograms.forEach((histogram, index) => {
             html += `
                 <div class="plot-container">
-                    <img src="${histogram}" alt="Histograma ${index + 1}" style="max-width: 100%; height: auto;">
+                    ${chartMarkup(histogram, `Histograma ${index + 1}`)}
                 </div>
             `;
         });
@@ -586,7 +797,7 @@ function displayVisualizations(results) {
         results.boxplots.forEach((boxplot, index) => {
             html += `
                 <div class="plot-container">
-                    <img src="${boxplot}" alt="Boxplot ${index + 1}" style="max-width: 100%; height: auto;">
+                    ${chartMarkup(boxplot, `Boxplot ${index + 1}`)}
                 </div>
             `;
         });
@@ -600,6 +811,203 @@ function displayVisualizations(results) {
     
     html += '</div>';
     container.innerHTML = html;
+    observeLazyPlots(container);
+}
+
+// Las imágenes de los gráficos bajo demanda se piden al servidor solo cuando están por entrar en pantalla
+function observeLazyPlots(container) {
+    const images = container.querySelectorAll('img[data-src]');
+    const load = image => {
+        image.src = image.dataset.src;
+        image.removeAttribute('data-src');
+    };
+    
+    if (!('IntersectionObserver' in window)) {
+        images.forEach(load);
+        return;
+    }
+    
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                load(entry.target);
+                observer.unobserve(entry.target);
+            }
+        });
+    }, { rootMargin: '200px' });
+    images.forEach(image => observer.observe(image));
+}
+
+// Los gráficos llegan como URL del servidor (o como data URI)
+function plotSource(plot) {
+    return plot.startsWith('data:') ? plot : `${API_BASE_URL}${plot}`;
+}
+
+// Un gráfico es una imagen (URL o data URI), la descripción de una imagen que se
+// genera al pedirla o los datos para dibujarlo en SVG
+function chartMarkup(chart, alt) {
+    if (typeof chart === 'string') {
+        return `<img src="${plotSource(chart)}" alt="${alt}" style="max-width: 100%; height: auto;">`;
+    }
+    if (chart.url) {
+        return `<img data-src="${plotSource(chart.url)}" alt="${alt}" class="lazy-plot">`;
+    }
+    switch (chart.type) {
+        case 'histogram':
+            return drawHistogram(chart);
+        case 'boxplot':
+            return drawBoxplot(chart);
+        case 'heatmap':
+            return drawHeatmap(chart);
+    }
+    return '';
+}
+
+// Dimensiones de los gráficos SVG y márgenes para los ejes
+const CHART_WIDTH = 480;
+const CHART_HEIGHT = 360;
+const CHART_MARGIN = { top: 32, right: 16, bottom: 48, left: 56 };
+
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, char => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[char]);
+}
+
+function formatTick(value) {
+    return Math.abs(value) >= 1000 || (value !== 0 && Math.abs(value) < 0.01)
+        ? value.toPrecision(3)
+        : Number(value.toFixed(2)).toString();
+}
+
+// Escala lineal de [min, max] a [start, end]
+function linearScale(min, max, start, end) {
+    const span = max - min || 1;
+    return value => start + (value - min) / span * (end - start);
+}
+
+function svgChart(title, body, width = CHART_WIDTH, height = CHART_HEIGHT) {
+    return `
+        <svg class="chart" viewBox="0 0 ${width} ${height}" role="img" aria-label="${escapeHtml(title)}">
+            <text class="chart-title" x="${width / 2}" y="20" text-anchor="middle">${escapeHtml(title)}</text>
+            ${body}
+        </svg>
+    `;
+}
+
+// Eje vertical con cinco marcas y líneas de cuadrícula
+function svgValueAxis(scale, min, max, left, right) {
+    let axis = '';
+    for (let i = 0; i <= 4; i++) {
+        const value = min + (max - min) * i / 4;
+        const y = scale(value);
+        axis += `<line class="chart-grid" x1="${left}" x2="${right}" y1="${y}" y2="${y}"/>`;
+        axis += `<text class="chart-tick" x="${left - 6}" y="${y + 4}" text-anchor="end">${formatTick(value)}</text>`;
+    }
+    return axis;
+}
+
+function drawHistogram(chart) {
+    const { top, right, bottom, left } = CHART_MARGIN;
+    const edges = chart.bin_edges;
+    const xMin = edges[0];
+    const xMax = edges[edges.length - 1];
+    const maxCount = Math.max(...chart.counts, 1);
+    const x = linearScale(xMin, xMax, left, CHART_WIDTH - right);
+    const y = linearScale(0, maxCount, CHART_HEIGHT - bottom, top);
+
+    let body = svgValueAxis(y, 0, maxCount, left, CHART_WIDTH - right);
+    chart.counts.forEach((count, i) => {
+        const x0 = x(edges[i]);
+        const width = Math.max(x(edges[i + 1]) - x0, 1);
+        body += `<rect class="chart-bar" x="${x0}" y="${y(count)}" width="${width}" height="${y(0) - y(count)}">`
+            + `<title>${formatTick(edges[i])} – ${formatTick(edges[i + 1])}: ${count}</title></rect>`;
+    });
+
+    const markers = [['mean', 'Media', '#e74c3c'], ['median', 'Mediana', '#27ae60']];
+    markers.forEach(([key, label, color], i) => {
+        if (chart[key] === null || chart[key] === undefined) return;
+        const position = x(chart[key]);
+        body += `<line x1="${position}" x2="${position}" y1="${top}" y2="${CHART_HEIGHT - bottom}" stroke="${color}" stroke-dasharray="5 4"/>`;
+        body += `<text class="chart-tick" x="${CHART_WIDTH - right}" y="${top + 14 + i * 14}" text-anchor="end" fill="${color}">${label}: ${formatTick(chart[key])}</text>`;
+    });
+
+    body += `<text class="chart-tick" x="${left}" y="${CHART_HEIGHT - bottom + 16}" text-anchor="middle">${formatTick(xMin)}</text>`;
+    body += `<text class="chart-tick" x="${CHART_WIDTH - right}" y="${CHART_HEIGHT - bottom + 16}" text-anchor="middle">${formatTick(xMax)}</text>`;
+    body += `<text class="chart-label" x="${(left + CHART_WIDTH - right) / 2}" y="${CHART_HEIGHT - 10}" text-anchor="middle">${escapeHtml(chart.column)}</text>`;
+    return svgChart(chart.title, body);
+}
+
+function drawBoxplot(chart) {
+    const { top, right, bottom, left } = CHART_MARGIN;
+    const groups = chart.groups.filter(group => group.count > 0);
+    if (groups.length === 0) return '';
+
+    const values = groups.flatMap(group => [group.whisker_low, group.whisker_high, ...group.outliers]);
+    const yMin = Math.min(...values);
+    const yMax = Math.max(...values);
+    const y = linearScale(yMin, yMax, CHART_HEIGHT - bottom, top);
+    const slot = (CHART_WIDTH - left - right) / groups.length;
+    const boxWidth = Math.min(slot * 0.6, 80);
+
+    let body = svgValueAxis(y, yMin, yMax, left, CHART_WIDTH - right);
+    groups.forEach((group, i) => {
+        const center = left + slot * (i + 0.5);
+        const x0 = center - boxWidth / 2;
+        body += `<line class="chart-whisker" x1="${center}" x2="${center}" y1="${y(group.whisker_low)}" y2="${y(group.q1)}"/>`;
+        body += `<line class="chart-whisker" x1="${center}" x2="${center}" y1="${y(group.q3)}" y2="${y(group.whisker_high)}"/>`;
+        [group.whisker_low, group.whisker_high].forEach(value => {
+            body += `<line class="chart-whisker" x1="${center - boxWidth / 4}" x2="${center + boxWidth / 4}" y1="${y(value)}" y2="${y(value)}"/>`;
+        });
+        body += `<rect class="chart-box" x="${x0}" y="${y(group.q3)}" width="${boxWidth}" height="${Math.max(y(group.q1) - y(group.q3), 1)}">`
+            + `<title>${escapeHtml(group.name)}: Q1 ${formatTick(group.q1)}, mediana ${formatTick(group.median)}, Q3 ${formatTick(group.q3)}, ${group.outlier_count} outliers</title></rect>`;
+        body += `<line class="chart-median" x1="${x0}" x2="${x0 + boxWidth}" y1="${y(group.median)}" y2="${y(group.median)}"/>`;
+        group.outliers.forEach(value => {
+            body += `<circle class="chart-outlier" cx="${center}" cy="${y(value)}" r="2.5"/>`;
+        });
+        if (chart.group_by) {
+            body += `<text class="chart-tick" x="${center}" y="${CHART_HEIGHT - bottom + 16}" text-anchor="middle">${escapeHtml(group.name)}</text>`;
+        }
+    });
+
+    const label = chart.group_by ? chart.group_by : chart.column;
+    body += `<text class="chart-label" x="${(left + CHART_WIDTH - right) / 2}" y="${CHART_HEIGHT - 10}" text-anchor="middle">${escapeHtml(label)}</text>`;
+    return svgChart(chart.title, body);
+}
+
+// Color de una correlación en [-1, 1]: azul para negativas, rojo para positivas
+function correlationColor(value) {
+    if (value === null) return '#eeeeee';
+    const strength = Math.min(Math.abs(value), 1);
+    const [r, g, b] = value < 0 ? [59, 76, 192] : [180, 4, 38];
+    const mix = channel => Math.round(255 + (channel - 255) * strength);
+    return `rgb(${mix(r)}, ${mix(g)}, ${mix(b)})`;
+}
+
+function drawHeatmap(chart) {
+    const n = chart.columns.length;
+    const labelWidth = 110;
+    const size = Math.max(Math.min(48, 420 / n), 12);
+    const width = labelWidth + n * size + 16;
+    const height = 40 + n * size + labelWidth;
+
+    let body = '';
+    chart.values.forEach((row, i) => {
+        row.forEach((value, j) => {
+            const x = labelWidth + j * size;
+            const y = 40 + i * size;
+            body += `<rect x="${x}" y="${y}" width="${size}" height="${size}" fill="${correlationColor(value)}">`
+                + `<title>${escapeHtml(chart.columns[i])} / ${escapeHtml(chart.columns[j])}: ${value === null ? '–' : value.toFixed(2)}</title></rect>`;
+            if (size >= 32 && value !== null) {
+                body += `<text class="chart-cell" x="${x + size / 2}" y="${y + size / 2 + 4}" text-anchor="middle">${value.toFixed(2)}</text>`;
+            }
+        });
+        body += `<text class="chart-tick" x="${labelWidth - 6}" y="${40 + i * size + size / 2 + 4}" text-anchor="end">${escapeHtml(chart.columns[i])}</text>`;
+        const columnX = labelWidth + i * size + size / 2;
+        const columnY = 40 + n * size + 8;
+        body += `<text class="chart-tick" x="${columnX}" y="${columnY}" text-anchor="end" transform="rotate(-45 ${columnX} ${columnY})">${escapeHtml(chart.columns[i])}</text>`;
+    });
+    return svgChart(chart.title, body, width, height);
 }
 
 function displayAIInsights(insights) {
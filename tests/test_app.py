@@ -8,12 +8,14 @@ import json
 import os
 import tempfile
 import shutil
+import time
 import pandas as pd
 from io import StringIO, BytesIO
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
-from app import app
+from app import app, plot_sources, plot_store, result_cache
+from artifact_store import ArtifactStore, artifact_digest
 from config import TestConfig
 
 
@@ -61,6 +63,17 @@ class TestFlaskApp(unittest.TestCase):
         self.assertEqual(data['status'], 'healthy')
         self.assertIn('message', data)
         self.assertIn('DataApp1', data['message'])
+        self.assertIn('plots', data['storage'])
+        self.assertIn('bytes_reclaimed', data['storage']['uploads'])
+
+    def test_worker_defaults_share_cores(self):
+        """Los procesos de gráficos de todos los análisis no superan los núcleos"""
+        cores = os.cpu_count() or 1
+        self.assertGreaterEqual(self.app.config['PLOT_WORKERS'], 1)
+        self.assertLessEqual(self.app.config['ANALYSIS_WORKERS'] * self.app.config['PLOT_WORKERS'], max(cores, 1))
+        if cores >= 2 and not {'ANALYSIS_WORKERS', 'PLOT_WORKERS'} & set(os.environ):
+            # Con más de un núcleo los gráficos se generan en paralelo
+            self.assertGreater(self.app.config['PLOT_WORKERS'], 1)
 
     def test_analyze_no_file(self):
         """Probar análisis sin archivo"""
@@ -99,8 +112,179 @@ Charlie,32,Phoenix,58000"""
         
         response = self.client.post('/analyze', data=data)
         
-        # Verificar que la respuesta sea exitosa o maneje errores apropiadamente
-        self.assertIn(response.status_code, [200, 500])  # 500 podría ocurrir si falta configuración
+        # El análisis se encola y el resultado se consulta por el id del trabajo
+        self.assertEqual(response.status_code, 202)
+        result = self._wait_for_result(response)
+        self.assertIn(result.status_code, [200, 500])  # 500 podría ocurrir si falta configuración
+        
+        status = self.client.get(response.get_json()['status_url']).get_json()
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual(status['progress'], 100)
+        self.assertGreaterEqual(status['elapsed_seconds'], 0)
+
+    def _wait_for_result(self, response, timeout=120):
+        """Consultar el resultado de un trabajo hasta que termine"""
+        result_url = response.get_json()['result_url']
+        deadline = time.time() + timeout
+        while True:
+            result = self.client.get(result_url)
+            if result.status_code != 202 or time.time() > deadline:
+                return result
+            time.sleep(0.1)
+
+    def test_analyze_result_cache(self):
+        """Probar que volver a subir el mismo CSV se sirve desde la caché"""
+        result_cache.clear()
+        csv_content = b"producto,ventas\nA,10\nB,20\nC,15\nD,30"
+
+        first = self._wait_for_result(self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'ventas.csv'), 'outputs': 'basic_info'}))
+        second = self._wait_for_result(self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'ventas.csv'), 'outputs': 'basic_info'}))
+        other = self._wait_for_result(self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'ventas.csv'), 'outputs': 'statistical_summary'}))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.get_json()['cache']['hit'])
+        self.assertTrue(second.get_json()['cache']['hit'])
+        self.assertGreaterEqual(second.get_json()['cache']['age_seconds'], 0)
+        self.assertEqual(first.get_json()['basic_info'], second.get_json()['basic_info'])
+        self.assertFalse(other.get_json()['cache']['hit'])
+
+    def test_result_cache_evicted_plots(self):
+        """Probar que un resultado en caché cuyos gráficos se borraron no se sirve"""
+        result_cache.clear()
+        csv_content = b"producto,ventas,costo\nA,10,4\nB,20,9\nC,15,7\nD,30,12"
+
+        def analyze():
+            return self._wait_for_result(self.client.post('/analyze', data={
+                'file': (BytesIO(csv_content), 'ventas.csv'), 'outputs': 'histograms'}))
+
+        first = analyze()
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(analyze().get_json()['cache']['hit'])
+
+        url = first.get_json()['histograms'][0]
+        os.remove(plot_store.path(url.rsplit('/', 1)[1]))
+        again = analyze()
+
+        self.assertFalse(again.get_json()['cache']['hit'])
+        self.assertEqual(self.client.get(again.get_json()['histograms'][0]).status_code, 200)
+
+    def test_analyze_chart_data_mode(self):
+        """Probar que chart_mode=data devuelve los datos de los gráficos"""
+        csv_content = b"producto,ventas,costo\nA,10,4\nB,20,9\nC,15,7\nD,30,12"
+
+        response = self._wait_for_result(self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'ventas.csv'), 'outputs': 'histograms', 'chart_mode': 'data'}))
+
+        self.assertEqual(response.status_code, 200)
+        histograms = response.get_json()['histograms']
+        self.assertEqual([chart['column'] for chart in histograms], ['ventas', 'costo'])
+        self.assertEqual(sum(histograms[0]['counts']), 4)
+
+    def test_analyze_lazy_plots(self):
+        """Probar que en modo lazy cada gráfico se genera al pedir su URL"""
+        csv_content = b"producto,ventas,costo\nA,10,4\nB,20,9\nC,15,7\nD,30,12"
+
+        response = self._wait_for_result(self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'ventas.csv'), 'outputs': 'histograms', 'chart_mode': 'lazy'}))
+
+        self.assertEqual(response.status_code, 200)
+        histograms = response.get_json()['histograms']
+        self.assertEqual([plot['params']['column'] for plot in histograms], ['ventas', 'costo'])
+
+        created = []
+        try:
+            for profile, extension in (('web-preview', '.webp'), ('pdf', '.png')):
+                rendered = self.client.get(f"{histograms[0]['url']}?profile={profile}")
+                self.assertEqual(rendered.status_code, 302)
+                location = rendered.headers['Location']
+                self.assertTrue(location.endswith(extension))
+                created.append(location.rsplit('/', 1)[1])
+                self.assertEqual(self.client.get(location).status_code, 200)
+
+            self.assertEqual(self.client.get(f"{histograms[0]['url']}?profile=poster").status_code, 400)
+            self.assertEqual(self.client.get(f"/plots/render/{'f' * 64}").status_code, 404)
+        finally:
+            for name in created:
+                os.remove(plot_store.path(name))
+            for plot in histograms:
+                os.remove(plot_sources.path(plot_sources.lookup(plot['id'])))
+
+    def test_analyze_invalid_chart_mode(self):
+        """Probar que un modo de gráficos desconocido se rechaza"""
+        response = self.client.post('/analyze', data={
+            'file': (BytesIO(b"a,b\n1,2"), 'datos.csv'), 'chart_mode': 'svg'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_analyze_invalid_outputs(self):
+        """Probar que solo se aceptan secciones del resultado, no etapas internas"""
+        for outputs in ('numerical_data', 'basic_info,no_existe'):
+            response = self.client.post('/analyze', data={
+                'file': (BytesIO(b"a,b\n1,2"), 'datos.csv'), 'outputs': outputs})
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(outputs.split(',')[-1], response.get_json()['error'])
+
+    def test_analyze_invalid_render_profile(self):
+        """Probar que un perfil de gráficos desconocido se rechaza"""
+        response = self.client.post('/analyze', data={
+            'file': (BytesIO(b"a,b\n1,2"), 'datos.csv'), 'render_profile': 'poster'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_job_not_found(self):
+        """Probar que un trabajo inexistente devuelve 404"""
+        self.assertEqual(self.client.get('/jobs/desconocido').status_code, 404)
+        self.assertEqual(self.client.get('/jobs/desconocido/result').status_code, 404)
+        self.assertEqual(self.client.get('/jobs/desconocido/events').status_code, 404)
+        self.assertEqual(self.client.get('/jobs/desconocido/sections').status_code, 404)
+
+    def test_job_sections_stream(self):
+        """Probar que el resultado se entrega por secciones en NDJSON"""
+        result_cache.clear()
+        csv_content = b"producto,ventas,costo\nA,10,6\nB,20,11\nC,15,9"
+        response = self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'secciones.csv'), 'outputs': 'basic_info,statistical_summary'})
+        sections = self.client.get(response.get_json()['sections_url'])
+
+        self.assertEqual(sections.status_code, 200)
+        self.assertTrue(sections.content_type.startswith('application/x-ndjson'))
+        lines = [json.loads(line) for line in sections.get_data(as_text=True).splitlines() if line.strip()]
+        self.assertEqual([line['section'] for line in lines[:-1]], ['basic_info', 'statistical_summary'])
+        self.assertEqual(lines[0]['data']['dimensions']['rows'], 3)
+        self.assertTrue(lines[-1]['done'])
+        self.assertTrue(lines[-1]['success'])
+        self.assertFalse(lines[-1]['cache']['hit'])
+
+        # Un resultado en caché entrega todas sus secciones al final
+        cached = self.client.post('/analyze', data={
+            'file': (BytesIO(csv_content), 'secciones.csv'), 'outputs': 'basic_info,statistical_summary'})
+        lines = [json.loads(line) for line in
+                 self.client.get(cached.get_json()['sections_url']).get_data(as_text=True).splitlines()]
+        self.assertEqual([line.get('section') for line in lines], ['basic_info', 'statistical_summary', None])
+        self.assertTrue(lines[-1]['cache']['hit'])
+
+    def test_job_events_stream(self):
+        """Probar el flujo de eventos de progreso de un trabajo"""
+        response = self.client.post('/analyze', data={
+            'file': (BytesIO(b"producto,ventas\nA,10\nB,20\nC,15"), 'eventos.csv'), 'outputs': 'basic_info'})
+        events = self.client.get(response.get_json()['events_url'])
+
+        self.assertEqual(events.status_code, 200)
+        self.assertTrue(events.content_type.startswith('text/event-stream'))
+        body = events.get_data(as_text=True)
+        self.assertIn('event: stage_finished', body)
+        self.assertTrue(body.rstrip().split('\n\n')[-1].startswith('id: '))
+        self.assertIn('event: job_finished\ndata: {"status": "done"', body)
+
+        # Al reconectar solo se envían los eventos posteriores al último recibido
+        last_id = body.rstrip().split('\n\n')[-1].split('\n')[0][len('id: '):]
+        resumed = self.client.get(response.get_json()['events_url'],
+                                  headers={'Last-Event-ID': str(int(last_id) - 1)})
+        self.assertEqual(resumed.get_data(as_text=True).count('event: '), 1)
 
     def test_analyze_empty_csv(self):
         """Probar análisis con CSV vacío"""
@@ -149,6 +333,41 @@ Charlie,32,Phoenix,58000"""
         # Verificar que la ruta existe
         self.assertIn(response.status_code, [200, 404])
 
+    def test_plot_references_not_served(self):
+        """Probar que las referencias internas de los gráficos no son públicas"""
+        name = plot_store.put(b'fake png content', 'png')
+        key = 'e' * 64
+        legacy = os.path.join(app.config['PLOTS_FOLDER'], 'refs')
+        os.makedirs(legacy, exist_ok=True)
+        with open(os.path.join(legacy, key), 'w') as f:
+            f.write(name)
+        try:
+            plot_store.link(key, name)
+
+            self.assertFalse(plot_store.refs_root.startswith(app.config['STATIC_FOLDER']))
+            self.assertEqual(plot_store.lookup(key), name)
+            self.assertEqual(self.client.get(f'/plots/refs/{key}').status_code, 404)
+        finally:
+            os.remove(os.path.join(legacy, key))
+            os.remove(os.path.join(plot_store.refs_root, key))
+            os.remove(plot_store.path(name))
+
+    def test_plot_artifact_cache_headers(self):
+        """Probar que los gráficos guardados por su hash se cachean para siempre"""
+        store = ArtifactStore(app.config['PLOTS_FOLDER'])
+        name = store.put(b'fake png content', 'png')
+        try:
+            response = self.client.get(store.url(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.headers['ETag'], f'"{artifact_digest(name)}"')
+            self.assertIn('immutable', response.headers['Cache-Control'])
+            self.assertIn(f"max-age={app.config['PLOTS_MAX_AGE']}", response.headers['Cache-Control'])
+            
+            revalidated = self.client.get(store.url(name), headers={'If-None-Match': response.headers['ETag']})
+            self.assertEqual(revalidated.status_code, 304)
+        finally:
+            os.remove(store.path(name))
+
     def test_file_size_limit(self):
         """Probar límite de tamaño de archivo"""
         # Crear un archivo grande (simulado)
@@ -160,8 +379,8 @@ Charlie,32,Phoenix,58000"""
         }
         
         response = self.client.post('/analyze', data=data)
-        # Debería manejar archivos grandes apropiadamente
-        self.assertIn(response.status_code, [200, 400, 413, 500])
+        # Debería manejar archivos grandes apropiadamente (202: análisis encolado)
+        self.assertIn(response.status_code, [202, 400, 413, 500])
 
     def test_allowed_file_function(self):
         """Probar la función allowed_file"""
@@ -0,0 +1,195 @@
+"""
+Pruebas unitarias para el almacén de gráficos direccionado por contenido
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from artifact_store import ArtifactStore, artifact_digest
+from data_analysis import DataAnalyzer
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Pruebas para ArtifactStore"""
+
+    def setUp(self):
+        """Crear un almacén en un directorio temporal"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ArtifactStore(os.path.join(self.temp_dir, 'plots'))
+
+    def tearDown(self):
+        """Limpiar archivos temporales"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_name_is_content_hash(self):
+        """El nombre del archivo es el hash de su contenido"""
+        name = self.store.put(b'contenido', 'png')
+
+        self.assertEqual(name, hashlib.sha256(b'contenido').hexdigest() + '.png')
+        self.assertEqual(artifact_digest(name), hashlib.sha256(b'contenido').hexdigest())
+        self.assertEqual(self.store.url(name), f'/plots/{name}')
+        with open(self.store.path(name), 'rb') as f:
+            self.assertEqual(f.read(), b'contenido')
+
+    def test_identical_content_stored_once(self):
+        """El mismo contenido se guarda una sola vez"""
+        first = self.store.put(b'grafico')
+        second = self.store.put(b'grafico')
+        other = self.store.put(b'otro grafico')
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(len(os.listdir(self.store.root)), 2)
+
+    def test_foreign_names_not_artifacts(self):
+        """Los nombres que no produce el almacén no tienen hash"""
+        self.assertIsNone(artifact_digest('test_plot.png'))
+        self.assertIsNone(artifact_digest('../' + 'a' * 64 + '.png'))
+
+    def test_evict_expired(self):
+        """Se borran los archivos sin usar durante más que el TTL"""
+        store = ArtifactStore(self.store.root, ttl=3600)
+        old = store.put(b'viejo')
+        recent = store.put(b'reciente')
+        past = time.time() - 7200
+        os.utime(store.path(old), (past, past))
+
+        self.assertEqual(store.evict(), (1, len(b'viejo')))
+        self.assertFalse(os.path.exists(store.path(old)))
+        self.assertTrue(os.path.exists(store.path(recent)))
+
+    def test_evict_least_recently_used(self):
+        """Con el tamaño excedido se borran primero los menos usados"""
+        store = ArtifactStore(self.store.root, max_bytes=20)
+        names = []
+        for index in range(3):
+            names.append(store.put(bytes([index]) * 10))
+            past = time.time() - 100 + index
+            os.utime(store.path(names[-1]), (past, past))
+        # Volver a guardar el primero lo marca como usado recientemente
+        store.put(bytes([0]) * 10)
+
+        self.assertEqual(store.evict(), (1, 10))
+        self.assertEqual(sorted(os.listdir(store.root)), sorted([names[0], names[2]]))
+
+    def test_link_and_lookup(self):
+        """Una clave enlazada devuelve su artefacto mientras siga guardado"""
+        key = 'b' * 64
+        name = self.store.put(b'grafico')
+
+        self.assertIsNone(self.store.lookup(key))
+        self.store.link(key, name)
+        self.assertEqual(self.store.lookup(key), name)
+        self.assertIsNone(self.store.lookup('../' + key))
+        with self.assertRaises(ValueError):
+            self.store.link(key, '../secreto.png')
+
+        os.remove(self.store.path(name))
+        self.assertIsNone(self.store.lookup(key))
+
+    def test_touch(self):
+        """Marcar un artefacto como usado lo protege del borrado por antigüedad"""
+        store = ArtifactStore(self.store.root, ttl=3600)
+        name = store.put(b'grafico')
+        past = time.time() - 7200
+        os.utime(store.path(name), (past, past))
+
+        self.assertTrue(store.touch(name))
+        self.assertEqual(store.evict(), (0, 0))
+        self.assertFalse(store.touch('../' + name))
+        os.remove(store.path(name))
+        self.assertFalse(store.touch(name))
+
+    def test_separate_refs_root(self):
+        """Las referencias pueden guardarse fuera del directorio de artefactos"""
+        refs_root = os.path.join(self.temp_dir, 'refs')
+        store = ArtifactStore(self.store.root, ttl=3600, refs_root=refs_root)
+        name = store.put(b'grafico')
+        store.link('f' * 64, name)
+
+        self.assertEqual(os.listdir(store.root), [name])
+        self.assertEqual(os.listdir(refs_root), ['f' * 64])
+        self.assertEqual(store.lookup('f' * 64), name)
+
+        past = time.time() - 7200
+        os.utime(store.path(name), (past, past))
+        store.evict()
+        self.assertEqual(os.listdir(refs_root), [])
+
+    def test_evict_drops_references(self):
+        """Al borrar un artefacto también se borran las claves que lo enlazan"""
+        store = ArtifactStore(self.store.root, ttl=3600)
+        old = store.put(b'viejo')
+        recent = store.put(b'reciente')
+        store.link('c' * 64, old)
+        store.link('d' * 64, recent)
+        past = time.time() - 7200
+        os.utime(store.path(old), (past, past))
+
+        store.evict()
+
+        self.assertEqual(os.listdir(store.refs_root), ['d' * 64])
+        self.assertEqual(store.lookup('d' * 64), recent)
+
+    def test_analyzer_without_store_writes_nothing(self):
+        """Sin almacén los gráficos se generan en memoria como data URI"""
+        analyzer = DataAnalyzer()
+        analyzer.df = pd.DataFrame({'ventas': [1.0, 2.0, 3.0, 5.0], 'costo': [2.0, 1.0, 4.0, 3.5]})
+
+        histograms = analyzer.create_histograms()
+
+        self.assertEqual(len(histograms), 2)
+        self.assertTrue(all(plot.startswith('data:image/webp;base64,') for plot in histograms))
+        self.assertEqual(analyzer.plot_paths, [])
+
+    def test_analyzer_returns_plot_urls(self):
+        """Con un almacén, el análisis devuelve URLs en lugar de imágenes en base64"""
+        rng = np.random.default_rng(3)
+        analyzer = DataAnalyzer(plot_store=self.store)
+        analyzer.df = pd.DataFrame({'ventas': rng.normal(100, 10, 50), 'costo': rng.normal(60, 5, 50)})
+
+        results = analyzer.analyze(['correlation_heatmap', 'histograms'])
+
+        plots = [results['correlation_heatmap']] + results['histograms']
+        self.assertEqual(len(plots), 3)
+        for plot in plots:
+            self.assertTrue(plot.startswith('/plots/'))
+            self.assertTrue(os.path.exists(self.store.path(plot[len('/plots/'):])))
+        self.assertEqual(analyzer.plot_paths, [])
+
+    def test_plots_rendered_once_per_profile(self):
+        """Un gráfico ya generado con los mismos datos y perfil no se vuelve a dibujar"""
+        frame = pd.DataFrame({'ventas': [1.0, 2.0, 3.0, 5.0], 'costo': [2.0, 1.0, 4.0, 3.5]})
+        rendered = []
+
+        def analyze(profile):
+            analyzer = DataAnalyzer(plot_store=self.store, render_profile=profile)
+            analyzer.df = frame.copy()
+            render = analyzer.plot_renderer.render
+            analyzer.plot_renderer.render = lambda tasks, *args: rendered.append(len(tasks)) or render(tasks, *args)
+            return analyzer.create_histograms()
+
+        web = analyze('web-preview')
+        again = analyze('web-preview')
+        pdf = analyze('pdf')
+
+        self.assertEqual(rendered, [2, 0, 2])
+        self.assertEqual(web, again)
+        self.assertTrue(all(plot.endswith('.webp') for plot in web))
+        self.assertTrue(all(plot.endswith('.png') for plot in pdf))
+
+
+if __name__ == '__main__':
+    unittest.main()
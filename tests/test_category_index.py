@@ -0,0 +1,69 @@
+"""
+Pruebas unitarias para el índice de categorías
+"""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from category_index import CategoryIndex
+from data_analysis import DataAnalyzer
+
+
+class TestCategoryIndex(unittest.TestCase):
+    """Pruebas para CategoryIndex"""
+
+    def setUp(self):
+        """Crear datos con categorías, nulos y una categoría poco frecuente"""
+        rng = np.random.default_rng(11)
+        self.frame = pd.DataFrame({
+            'ventas': rng.normal(100, 10, 1000),
+            'region': rng.choice(['Norte', 'Sur', 'Este', None], 1000, p=[0.5, 0.3, 0.15, 0.05]),
+        })
+        self.frame.loc[::9, 'ventas'] = np.nan
+
+    def test_positions_match_groupby(self):
+        """Cada grupo tiene las mismas filas que un filtrado por categoría"""
+        index = CategoryIndex.build(self.frame['region'], ['Norte', 'Sur'])
+
+        self.assertEqual(index.categories, ['Norte', 'Sur'])
+        for category, rows in zip(index.categories, index.positions):
+            expected = np.flatnonzero(self.frame['region'].to_numpy() == category)
+            np.testing.assert_array_equal(rows, expected)
+
+    def test_split_values(self):
+        """Los valores de cada grupo coinciden con groupby, sin nulos"""
+        index = CategoryIndex.build(self.frame['region'], ['Norte', 'Sur', 'Este'])
+        groups = dict(index.split(self.frame['ventas'].to_numpy()))
+
+        for category, values in self.frame.dropna().groupby('region')['ventas']:
+            np.testing.assert_array_equal(groups[category], values.to_numpy())
+
+    def test_missing_categories_skipped(self):
+        """Las categorías que no aparecen en la columna se omiten"""
+        index = CategoryIndex.build(self.frame['region'], ['Oeste', 'Este'])
+
+        self.assertEqual(index.categories, ['Este'])
+        self.assertEqual(index.sizes(), [int((self.frame['region'] == 'Este').sum())])
+
+    def test_index_built_once(self):
+        """El analizador construye el índice una vez por columna y lo reutiliza"""
+        analyzer = DataAnalyzer()
+        analyzer.df = self.frame.assign(costo=self.frame['ventas'] / 2)
+
+        first = analyzer.get_category_index('region')
+        boxplots = analyzer.create_boxplots()
+
+        self.assertIs(analyzer.get_category_index('region'), first)
+        self.assertEqual(first.categories, ['Norte', 'Sur', 'Este'])
+        self.assertEqual(len(boxplots), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Pruebas unitarias para los datos de gráficos dibujados en el navegador
+"""
+
+import unittest
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from chart_data import (HISTOGRAM_BINS, box_summary, boxplot_data, grouped_boxplot_data, heatmap_data,
+                        histogram_data, iqr_box)
+
+
+class TestChartData(unittest.TestCase):
+    """Pruebas para los datos de histogramas, boxplots y heatmaps"""
+
+    def setUp(self):
+        """Crear datos de prueba"""
+        rng = np.random.default_rng(7)
+        self.values = np.append(rng.normal(50, 5, 500), [120.0, -40.0])
+        self.frame = pd.DataFrame({'ventas': self.values,
+                                   'region': rng.choice(['Norte', 'Sur', 'Este'], len(self.values))})
+
+    def test_histogram_bins(self):
+        """El histograma contiene los bordes y conteos de np.histogram"""
+        chart = histogram_data('ventas', self.values, 50.0, 49.5)
+
+        counts, edges = np.histogram(self.values, bins=HISTOGRAM_BINS)
+        self.assertEqual(chart['type'], 'histogram')
+        self.assertEqual(chart['counts'], counts.tolist())
+        self.assertEqual(chart['bin_edges'], edges.tolist())
+        self.assertEqual(sum(chart['counts']), len(self.values))
+        self.assertEqual(chart['mean'], 50.0)
+
+    def test_box_summary(self):
+        """El resumen de cinco números coincide con los percentiles y detecta outliers"""
+        summary = box_summary(self.values)
+
+        q1, median, q3 = np.percentile(self.values, [25, 50, 75])
+        self.assertAlmostEqual(summary['q1'], q1)
+        self.assertAlmostEqual(summary['median'], median)
+        self.assertAlmostEqual(summary['q3'], q3)
+        self.assertIn(120.0, summary['outliers'])
+        self.assertIn(-40.0, summary['outliers'])
+        self.assertLess(summary['whisker_high'], 120.0)
+        self.assertGreater(summary['whisker_low'], -40.0)
+        self.assertEqual(summary['outlier_count'], len(summary['outliers']))
+
+    def test_outliers_sampled(self):
+        """Solo se envía una muestra de los outliers pero se cuentan todos"""
+        values = np.append(np.zeros(1000), np.arange(1, 201))
+        summary = box_summary(values, max_outliers=10)
+
+        self.assertEqual(len(summary['outliers']), 10)
+        self.assertEqual(summary['outlier_count'], 200)
+        self.assertEqual(summary['outliers'][0], 1.0)
+        self.assertEqual(summary['outliers'][-1], 200.0)
+
+    def test_iqr_box_matches_summary(self):
+        """Con los cuartiles y las posiciones de los outliers se obtiene la misma caja"""
+        values = np.append(self.values, np.nan)
+        q1, median, q3 = np.nanpercentile(values, [25, 50, 75])
+        rows = np.flatnonzero((values < q1 - 1.5 * (q3 - q1)) | (values > q3 + 1.5 * (q3 - q1)))
+
+        box = iqr_box(values, q1, median, q3, rows)
+
+        self.assertEqual(box, box_summary(self.values))
+        self.assertEqual(iqr_box(np.array([np.nan]), 0.0, 0.0, 0.0, np.array([], dtype=int)), {'count': 0})
+
+    def test_boxplot_groups(self):
+        """El boxplot agrupado tiene una caja por categoría"""
+        simple = boxplot_data('ventas', box_summary(self.values))
+        grouped = grouped_boxplot_data('ventas', 'region', list(self.frame.groupby('region')['ventas']))
+
+        self.assertEqual(len(simple['groups']), 1)
+        self.assertEqual(sorted(group['name'] for group in grouped['groups']), ['Este', 'Norte', 'Sur'])
+        self.assertEqual(sum(group['count'] for group in grouped['groups']), len(self.values))
+        self.assertEqual(grouped['group_by'], 'region')
+
+    def test_heatmap_is_json(self):
+        """La matriz de correlación se envía como JSON válido, con null en lugar de NaN"""
+        matrix = pd.DataFrame([[1.0, np.nan], [np.nan, 1.0]], index=['a', 'b'], columns=['a', 'b'])
+        chart = heatmap_data(matrix)
+
+        self.assertEqual(chart['columns'], ['a', 'b'])
+        self.assertEqual(chart['values'], [[1.0, None], [None, 1.0]])
+        json.dumps(chart, allow_nan=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Pruebas unitarias para el análisis por bloques
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from chunked_analysis import ChunkedDataAnalyzer
+from data_analysis import DataAnalyzer
+
+
+class TestChunkedDataAnalyzer(unittest.TestCase):
+    """Pruebas para el analizador por bloques"""
+
+    def setUp(self):
+        """Crear un CSV de prueba"""
+        self.temp_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(7)
+        n = 3000
+        df = pd.DataFrame({
+            'ventas': rng.uniform(0, 1000, n),
+            'unidades': rng.integers(1, 50, n),
+            'region': rng.choice(['Norte', 'Sur', 'Este'], n),
+        })
+        df['costo'] = df['ventas'] * 0.6 + rng.normal(0, 10, n)
+        df.loc[rng.random(n) < 0.05, 'costo'] = np.nan
+        self.csv_file = os.path.join(self.temp_dir, 'ventas.csv')
+        df.to_csv(self.csv_file, index=False)
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_exact_sections_match_full_analysis(self):
+        """Dimensiones, tipos, nulos y momentos son exactos"""
+        chunked = ChunkedDataAnalyzer(self.csv_file, chunksize=400, sample_rows=500)
+        full = DataAnalyzer(file_path=self.csv_file)
+
+        self.assertEqual(chunked.chunks, 8)
+        self.assertEqual(chunked.get_basic_info(), full.get_basic_info())
+
+        summary = chunked.get_statistical_summary()
+        expected = full.get_statistical_summary()
+        for col in expected:
+            for key in ['count', 'mean', 'std', 'min', 'max']:
+                self.assertAlmostEqual(summary[col][key], expected[col][key], places=3)
+
+        np.testing.assert_allclose(chunked.get_correlation_matrix().to_numpy(),
+                                   full.df.select_dtypes(include=[np.number]).corr().to_numpy(),
+                                   atol=1e-10)
+
+    def test_summary_outliers(self):
+        """El resumen tiene las mismas claves que el análisis completo, con atípicos"""
+        rng = np.random.default_rng(3)
+        ventas = rng.normal(100, 10, 3000)
+        ventas[::100] = 1000.0
+        pd.DataFrame({'ventas': ventas, 'unidades': rng.integers(1, 50, 3000)}).to_csv(self.csv_file, index=False)
+
+        full = DataAnalyzer(file_path=self.csv_file).get_statistical_summary()
+        sampled = ChunkedDataAnalyzer(self.csv_file, chunksize=400, sample_rows=1500).get_statistical_summary()
+        complete = ChunkedDataAnalyzer(self.csv_file, chunksize=400, sample_rows=10_000).get_statistical_summary()
+
+        for col in full:
+            self.assertEqual(set(sampled[col]) - {'quantile_rank_error'}, set(full[col]) - {'quantile_rank_error'})
+            self.assertFalse(sampled[col]['outliers_exact'])
+            self.assertTrue(complete[col]['outliers_exact'])
+            # Los cuartiles por bloques salen del sketch, no del orden exacto
+            self.assertAlmostEqual(complete[col]['outliers'], full[col]['outliers'], delta=3)
+        self.assertGreaterEqual(full['ventas']['outliers'], 30)
+        self.assertAlmostEqual(sampled['ventas']['outliers'], full['ventas']['outliers'], delta=25)
+
+    def test_column_turning_text_is_not_numeric(self):
+        """Una columna numérica con texto en un bloque posterior se trata como texto"""
+        with open(self.csv_file, 'w') as f:
+            f.write('id,codigo\n')
+            f.write(''.join(f'{i},{i * 10}\n' for i in range(100)))
+            f.write('100,ABC\n')
+
+        chunked = ChunkedDataAnalyzer(self.csv_file, chunksize=50)
+
+        self.assertEqual(chunked.numerical_columns(), ['id'])
+        self.assertEqual(chunked.get_basic_info()['data_types']['codigo'], 'Texto')
+
+    def test_latin1_after_sniff_prefix(self):
+        """Bytes Latin-1 después del prefijo analizado se leen con la codificación de respaldo"""
+        with open(self.csv_file, 'wb') as f:
+            f.write(('id,nombre\n' + ''.join(f'{i},fila{i}\n' for i in range(5000))).encode('ascii'))
+            f.write('5000,Ñandú\n'.encode('latin-1'))
+
+        chunked = ChunkedDataAnalyzer(self.csv_file, chunksize=1000, sniff_sample_size=1024)
+
+        self.assertEqual(chunked.rows, 5001)
+        self.assertEqual(chunked.dialect.encoding_source, 'fallback')
+        self.assertIn('Ñandú', chunked.reservoir.sample['nombre'].tolist())
+
+    def test_analyze_result_shape(self):
+        """El resultado tiene la misma estructura que DataAnalyzer.analyze"""
+        chunked = ChunkedDataAnalyzer(self.csv_file, chunksize=1000, sample_rows=500)
+        try:
+            results = chunked.analyze()
+        finally:
+            chunked.cleanup_plots()
+
+        self.assertTrue(results['success'])
+        for key in ['basic_info', 'statistical_summary', 'data_preview', 'correlation_heatmap',
+                    'histograms', 'boxplots', 'ai_insights']:
+            self.assertIn(key, results)
+        self.assertEqual(results['basic_info']['dimensions']['rows'], 3000)
+        self.assertEqual(len(results['data_preview']), 10)
+        self.assertEqual(results['streaming']['sample_rows'], 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
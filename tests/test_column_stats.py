@@ -0,0 +1,245 @@
+"""
+Pruebas unitarias para los acumuladores y resúmenes combinables de columnas
+"""
+
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from column_stats import (ColumnSummary, DistinctCounter, QuantileSketch, RowReservoir,
+                          RunningCovariance, RunningMoments, TopKSketch, merge, profile_frame,
+                          profile_numeric)
+
+
+def _blocks(df, size):
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+class TestRunningAccumulators(unittest.TestCase):
+    """Pruebas para los acumuladores incrementales"""
+
+    def setUp(self):
+        """Crear datos con valores faltantes y una media grande"""
+        rng = np.random.default_rng(42)
+        n = 5000
+        self.df = pd.DataFrame({
+            'a': rng.normal(1e6, 5, n),
+            'b': rng.normal(size=n),
+            'c': rng.normal(size=n),
+        })
+        self.df['b'] += self.df['a'] * 0.5
+        self.df.loc[rng.random(n) < 0.2, 'a'] = np.nan
+        self.df.loc[:1000, 'c'] = np.nan
+
+    def test_running_moments_match_pandas(self):
+        """Los momentos por bloques coinciden con pandas"""
+        moments = RunningMoments()
+        for block in _blocks(self.df, 333):
+            moments.update(block['a'].to_numpy())
+
+        self.assertEqual(moments.count, self.df['a'].count())
+        self.assertAlmostEqual(moments.mean, self.df['a'].mean(), places=6)
+        self.assertAlmostEqual(moments.std, self.df['a'].std(), places=8)
+        self.assertEqual(moments.min, self.df['a'].min())
+        self.assertEqual(moments.max, self.df['a'].max())
+
+    def test_running_covariance_matches_pandas_corr(self):
+        """La correlación por bloques coincide con DataFrame.corr()"""
+        covariance = RunningCovariance(list(self.df.columns))
+        for block in _blocks(self.df, 777):
+            covariance.update(block)
+
+        np.testing.assert_allclose(covariance.correlation().to_numpy(),
+                                   self.df.corr().to_numpy(), atol=1e-10)
+
+    def test_covariance_merge_and_subset(self):
+        """Combinar acumuladores parciales equivale a procesar todo"""
+        first = RunningCovariance(list(self.df.columns)).update(self.df.iloc[:2500])
+        second = RunningCovariance(list(self.df.columns)).update(self.df.iloc[2500:])
+        merged = first.merge(second).subset(['c', 'a'])
+
+        np.testing.assert_allclose(merged.correlation().to_numpy(),
+                                   self.df[['c', 'a']].corr().to_numpy(), atol=1e-10)
+
+    def test_reservoir_is_bounded(self):
+        """La muestra nunca supera el tamaño configurado"""
+        reservoir = RowReservoir(100)
+        for block in _blocks(self.df, 300):
+            reservoir.update(block)
+
+        self.assertEqual(len(reservoir.sample), 100)
+        self.assertEqual(list(reservoir.sample.columns), list(self.df.columns))
+
+
+class TestMergeableSummaries(unittest.TestCase):
+    """Pruebas para los resúmenes de columna combinables"""
+
+    def setUp(self):
+        """Crear datos mixtos con nulos"""
+        rng = np.random.default_rng(3)
+        n = 20000
+        self.df = pd.DataFrame({
+            'monto': rng.lognormal(size=n),
+            'tienda': rng.choice(['A', 'B', 'C', 'D'], n, p=[0.5, 0.3, 0.15, 0.05]),
+        })
+        self.df.loc[rng.random(n) < 0.1, 'monto'] = np.nan
+        self.df.loc[rng.random(n) < 0.05, 'tienda'] = None
+
+    def test_merge_is_associative(self):
+        """Combinar particiones en distinto orden da las mismas estadísticas"""
+        parts = [profile_frame(block) for block in _blocks(self.df, 4000)]
+
+        left = parts[0]
+        for part in parts[1:]:
+            left = merge(left, part)
+        right = parts[-1]
+        for part in reversed(parts[:-1]):
+            right = merge(part, right)
+
+        for profile in (left, right):
+            monto = profile['monto']
+            self.assertEqual(monto.count, self.df['monto'].count())
+            self.assertEqual(monto.null_count, self.df['monto'].isnull().sum())
+            self.assertAlmostEqual(monto.sum, self.df['monto'].sum(), places=6)
+            self.assertAlmostEqual(monto.std, self.df['monto'].std(), places=8)
+            self.assertEqual(monto.min, self.df['monto'].min())
+            self.assertEqual(monto.max, self.df['monto'].max())
+            self.assertEqual(profile['tienda'].top_k.top(1)[0][0], 'A')
+            self.assertEqual(profile['tienda'].null_count, self.df['tienda'].isnull().sum())
+
+    def test_merge_does_not_modify_inputs(self):
+        """merge(a, b) devuelve un nuevo resumen"""
+        a = ColumnSummary('x', numeric=True).update(pd.Series([1.0, 2.0]))
+        b = ColumnSummary('x', numeric=True).update(pd.Series([3.0, None]))
+
+        merged = merge(a, b)
+
+        self.assertEqual(merged.count, 3)
+        self.assertEqual(merged.null_count, 1)
+        self.assertEqual(a.count, 2)
+        self.assertEqual(b.count, 1)
+
+    def test_numeric_and_text_summaries_do_not_merge(self):
+        """No se pueden combinar resúmenes de distinto tipo"""
+        a = ColumnSummary('x', numeric=True)
+        b = ColumnSummary('x', numeric=False)
+        with self.assertRaises(ValueError):
+            merge(a, b)
+
+    def test_quantile_sketch_rank_error(self):
+        """El sketch de cuantiles mantiene un error de rango pequeño"""
+        values = np.random.default_rng(1).lognormal(size=200000)
+        sketch = QuantileSketch(k=200)
+        for start in range(0, len(values), 50000):
+            sketch.update(values[start:start + 50000])
+
+        self.assertFalse(sketch.is_exact)
+        for q in [0.25, 0.5, 0.75]:
+            rank = np.mean(values <= sketch.quantile(q))
+            self.assertLess(abs(rank - q), 0.02)
+
+    def test_quantile_sketch_exact_for_small_inputs(self):
+        """Con pocos valores los cuantiles son exactos"""
+        sketch = QuantileSketch(k=200).update(np.arange(11, dtype=float))
+        self.assertTrue(sketch.is_exact)
+        self.assertEqual(sketch.quantile(0.25), 2.5)
+
+    def test_top_k_sketch_bounds(self):
+        """Los conteos de Misra-Gries nunca superan los reales"""
+        values = list('a' * 50 + 'b' * 30 + 'c' * 10 + 'defghij')
+        sketch = TopKSketch(k=3)
+        for start in range(0, len(values), 20):
+            sketch.update(values[start:start + 20])
+
+        top = dict(sketch.top(3))
+        self.assertFalse(sketch.is_exact)
+        self.assertLessEqual(top['a'], 50)
+        self.assertGreaterEqual(top['a'], 50 - sketch.pruned_weight)
+        self.assertEqual(sketch.top(1)[0][0], 'a')
+
+
+    def test_distinct_counter_estimate(self):
+        """HyperLogLog estima los valores únicos dentro de su error"""
+        values = pd.Series([f'cliente{i}@correo.com' for i in range(50000)] * 2)
+        counter = DistinctCounter()
+        for start in range(0, len(values), 30000):
+            counter.update(values.iloc[start:start + 30000])
+
+        self.assertLess(abs(counter.estimate - 50000) / 50000, 3 * counter.relative_error)
+        self.assertTrue(counter.exceeds(50))
+        self.assertFalse(DistinctCounter().update(['a', 'b', 'c']).exceeds(10))
+
+    def test_distinct_counter_merge(self):
+        """Combinar contadores equivale a contar la unión"""
+        a = DistinctCounter().update(np.arange(5000))
+        b = DistinctCounter().update(np.arange(2500, 10000))
+        union = DistinctCounter().update(np.arange(10000))
+
+        np.testing.assert_array_equal(merge(a, b).registers, union.registers)
+        with self.assertRaises(ValueError):
+            merge(a, DistinctCounter(precision=10))
+
+
+
+class TestNumericProfile(unittest.TestCase):
+    """Pruebas para el kernel vectorizado de perfilado numérico"""
+
+    def test_matches_pandas_reductions(self):
+        """Cada métrica coincide con la reducción equivalente de pandas"""
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame(rng.lognormal(size=(2000, 6)), columns=[f'c{i}' for i in range(6)])
+        df.loc[rng.random(2000) < 0.2, 'c0'] = np.nan
+        df['constante'] = 4.0
+        df['vacia'] = np.nan
+        df['entera'] = np.arange(2000)
+
+        profile = profile_numeric(df, {'q25': 0.25, 'median': 0.5, 'q75': 0.75})
+
+        expected = pd.DataFrame({
+            'count': df.count(),
+            'null_count': df.isnull().sum(),
+            'mean': df.mean(),
+            'std': df.std(),
+            'min': df.min(),
+            'max': df.max(),
+            'skew': df.skew(),
+            'q25': df.quantile(0.25),
+            'median': df.median(),
+            'q75': df.quantile(0.75),
+        })
+        pd.testing.assert_frame_equal(profile, expected, check_dtype=False)
+
+    def test_small_and_large_scales(self):
+        """La dispersión de columnas muy pequeñas o muy grandes no se confunde con ruido"""
+        rng = np.random.default_rng(8)
+        base = rng.lognormal(size=500)
+        df = pd.DataFrame({'diminuta': base * 1e-8, 'enorme': 1e12 + base,
+                           'constante_diminuta': np.full(500, 3e-9), 'constante_enorme': np.full(500, 1e15 / 3)})
+
+        profile = profile_numeric(df)
+
+        np.testing.assert_allclose(profile['std'], df.std(), rtol=1e-6)
+        self.assertGreater(profile.loc['diminuta', 'std'], 0)
+        self.assertEqual(profile.loc['constante_diminuta', 'std'], 0)
+        self.assertEqual(profile.loc['constante_enorme', 'std'], 0)
+        # pandas anula la asimetría de valores diminutos; no depende de la escala
+        self.assertAlmostEqual(profile.loc['diminuta', 'skew'], pd.Series(base).skew())
+        self.assertAlmostEqual(profile.loc['enorme', 'skew'], df['enorme'].skew(), places=4)
+        self.assertEqual(profile.loc['constante_enorme', 'skew'], 0)
+
+    def test_empty_frame(self):
+        """Sin filas todas las métricas son NaN"""
+        profile = profile_numeric(pd.DataFrame({'x': pd.Series([], dtype=float)}), {'median': 0.5})
+
+        self.assertEqual(profile.loc['x', 'count'], 0)
+        self.assertTrue(np.isnan(profile.loc['x', 'median']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Pruebas unitarias para la matriz de correlación y los pares correlacionados
+"""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from correlation import clustered_matrix, correlated_pairs, pairwise_correlation
+
+
+class TestCorrelation(unittest.TestCase):
+    """Pruebas para pairwise_correlation y correlated_pairs"""
+
+    def setUp(self):
+        """Crear columnas relacionadas, una constante y valores grandes"""
+        rng = np.random.default_rng(3)
+        base = rng.normal(size=500)
+        self.df = pd.DataFrame({
+            'a': base,
+            'b': 2 * base + rng.normal(scale=0.5, size=500),
+            'c': rng.normal(size=500),
+            'd': -base + rng.normal(scale=0.1, size=500) + 1e6,
+            'constante': np.full(500, 4.0),
+        })
+
+    def test_matches_pandas(self):
+        """Sin nulos la matriz coincide con DataFrame.corr()"""
+        np.testing.assert_allclose(pairwise_correlation(self.df).to_numpy(),
+                                   self.df.corr().to_numpy(), atol=1e-10)
+
+    def test_missing_values_pairwise(self):
+        """Con nulos cada par usa las filas donde ambas columnas tienen valor"""
+        df = self.df.copy()
+        df.loc[::7, 'a'] = np.nan
+        df.loc[::5, 'c'] = np.nan
+
+        np.testing.assert_allclose(pairwise_correlation(df).to_numpy(),
+                                   df.corr().to_numpy(), atol=1e-10)
+
+    def test_short_columns(self):
+        """Pocas filas compartidas dan NaN, igual que pandas"""
+        df = pd.DataFrame({'x': [1.0, np.nan, 3.0], 'y': [np.nan, 2.0, 5.0], 'z': [1.0, 2.0, 4.0]})
+
+        np.testing.assert_allclose(pairwise_correlation(df).to_numpy(), df.corr().to_numpy(), atol=1e-10)
+        np.testing.assert_allclose(pairwise_correlation(df.iloc[:1]).to_numpy(),
+                                   df.iloc[:1].corr().to_numpy())
+
+    def test_pairs_above_threshold(self):
+        """Los pares se ordenan de más a menos fuertes y respetan el umbral"""
+        matrix = self.df.corr()
+        pairs = correlated_pairs(matrix, threshold=0.6)
+
+        expected = [(i, j, matrix.loc[i, j]) for n, i in enumerate(matrix.columns)
+                    for j in matrix.columns[n + 1:] if abs(matrix.loc[i, j]) > 0.6]
+        expected.sort(key=lambda pair: -abs(pair[2]))
+        self.assertEqual([pair[:2] for pair in pairs], [pair[:2] for pair in expected])
+        self.assertEqual(pairs[0][:2], ('a', 'd'))
+        self.assertLess(pairs[0][2], 0)
+
+    def test_top_k(self):
+        """Con k solo se devuelven los k pares más fuertes"""
+        matrix = self.df.corr()
+
+        self.assertEqual(correlated_pairs(matrix, k=2), correlated_pairs(matrix)[:2])
+        self.assertEqual(correlated_pairs(matrix, threshold=0.999), [])
+
+    def test_ties_keep_matrix_order(self):
+        """Pares igual de fuertes conservan el orden de la matriz"""
+        matrix = pd.DataFrame([[1.0, 0.8, -0.8], [0.8, 1.0, 0.8], [-0.8, 0.8, 1.0]],
+                              index=list('xyz'), columns=list('xyz'))
+
+        self.assertEqual([pair[:2] for pair in correlated_pairs(matrix, k=2)], [('x', 'y'), ('x', 'z')])
+
+    def test_clustered_keeps_most_correlated(self):
+        """Solo se conservan las columnas más correlacionadas con alguna otra"""
+        matrix = clustered_matrix(self.df.corr(), max_columns=3)
+
+        self.assertEqual(sorted(matrix.columns), ['a', 'b', 'd'])
+        self.assertEqual(list(matrix.index), list(matrix.columns))
+
+    def test_clustered_groups_related_columns(self):
+        """Las columnas de un mismo grupo quedan juntas"""
+        rng = np.random.default_rng(9)
+        x, y = rng.normal(size=(2, 300))
+        df = pd.DataFrame({'x1': x + rng.normal(scale=0.2, size=300), 'y1': y + rng.normal(scale=0.2, size=300),
+                           'x2': x + rng.normal(scale=0.2, size=300), 'y2': y + rng.normal(scale=0.2, size=300),
+                           'x3': x + rng.normal(scale=0.2, size=300)})
+
+        order = ''.join(name[0] for name in clustered_matrix(df.corr()).columns)
+
+        self.assertIn(order, ('xxxyy', 'yyxxx'))
+
+
+if __name__ == '__main__':
+    unittest.main()
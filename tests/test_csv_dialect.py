@@ -0,0 +1,128 @@
+"""
+Pruebas unitarias para la detección de dialecto CSV
+"""
+
+import unittest
+import codecs
+import os
+import sys
+import tempfile
+import shutil
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from csv_dialect import CSVDialect, detect_encoding, sniff_bytes, sniff_file, sniff_text
+from data_analysis import DataAnalyzer
+
+
+class TestEncodingDetection(unittest.TestCase):
+    """Pruebas para la detección de codificación"""
+
+    def test_utf8_bom(self):
+        """Un BOM UTF-8 se resuelve sin chardet"""
+        dialect = detect_encoding(codecs.BOM_UTF8 + b'a,b\n1,2\n')
+        self.assertEqual(dialect.encoding, 'utf-8-sig')
+        self.assertTrue(dialect.has_bom)
+        self.assertEqual(dialect.encoding_source, 'bom')
+
+    def test_utf16_bom(self):
+        """Un BOM UTF-16 se detecta"""
+        dialect = detect_encoding('a,b\n1,2\n'.encode('utf-16'))
+        self.assertEqual(dialect.encoding, 'utf-16')
+
+    def test_ascii_fast_path(self):
+        """Contenido ASCII se trata como UTF-8"""
+        dialect = detect_encoding(b'a,b\n1,2\n')
+        self.assertEqual(dialect.encoding, 'utf-8')
+        self.assertEqual(dialect.encoding_source, 'ascii')
+
+    def test_utf8_cut_mid_character(self):
+        """Una muestra cortada a mitad de un carácter multibyte sigue siendo UTF-8"""
+        raw = 'ciudad\nBogotá\n'.encode('utf-8')
+        cut = raw[:raw.index('á'.encode('utf-8')) + 1]
+        self.assertEqual(detect_encoding(cut).encoding, 'utf-8')
+
+    def test_latin1_content(self):
+        """Contenido que no es UTF-8 no se reporta como UTF-8"""
+        raw = ('nombre;ciudad\n' + 'José;Bogotá\n' * 50).encode('latin-1')
+        self.assertNotEqual(detect_encoding(raw).encoding, 'utf-8')
+
+
+class TestDialectSniffing(unittest.TestCase):
+    """Pruebas para la detección de separador, comillas y formato numérico"""
+
+    def test_separators(self):
+        """Detectar los separadores soportados"""
+        for sep in [',', ';', '\t', '|']:
+            text = sep.join(['a', 'b', 'c']) + '\n' + sep.join(['1', '2', '3']) + '\n'
+            self.assertEqual(sniff_text(text).separator, sep)
+
+    def test_quoted_fields_with_embedded_separator(self):
+        """Las comas dentro de comillas no cuentan como separador"""
+        text = 'nombre;descripcion\n"Ana";"alta, rubia, alegre"\n"Luis";"bajo, serio"\n'
+        dialect = sniff_text(text)
+        self.assertEqual(dialect.separator, ';')
+        self.assertEqual(dialect.quotechar, '"')
+
+    def test_single_quote_detection(self):
+        """Detectar comilla simple como carácter de cita"""
+        text = "a,b\n'x, y',1\n'z',2\n"
+        self.assertEqual(sniff_text(text).quotechar, "'")
+
+    def test_decimal_comma_convention(self):
+        """Detectar coma decimal y punto de miles en archivos con ';'"""
+        text = 'producto;precio;cantidad\nA;1.234,50;3\nB;12,75;4\nC;3,10;1\n'
+        dialect = sniff_text(text)
+        self.assertEqual(dialect.separator, ';')
+        self.assertEqual(dialect.decimal, ',')
+        self.assertEqual(dialect.thousands, '.')
+
+    def test_only_prefix_is_inspected(self):
+        """Solo se analiza el prefijo configurado"""
+        text = 'a;b\n1;2\n' + 'x,y,z,w\n' * 10000
+        self.assertEqual(sniff_text(text, sample_size=8).separator, ';')
+
+    def test_truncated_last_line_ignored(self):
+        """La última línea cortada por el límite de la muestra se descarta"""
+        raw = b'a,b,c\n1,2,3\n4,5,6\n7,8' + b',9\n' * 1000
+        dialect = sniff_bytes(raw, sample_size=20)
+        self.assertEqual(dialect.separator, ',')
+
+    def test_sniff_file_reads_prefix(self):
+        """sniff_file devuelve un dialecto reutilizable"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(temp_dir, 'datos.csv')
+            with open(file_path, 'wb') as f:
+                f.write('id;importe\n1;2,5\n2;3,75\n'.encode('utf-8'))
+
+            dialect = sniff_file(file_path)
+
+            self.assertIsInstance(dialect, CSVDialect)
+            kwargs = dialect.read_csv_kwargs()
+            self.assertEqual(kwargs['sep'], ';')
+            self.assertEqual(kwargs['decimal'], ',')
+            self.assertEqual(kwargs['encoding'], 'utf-8')
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestAnalyzerUsesDialect(unittest.TestCase):
+    """Pruebas de integración del detector con DataAnalyzer"""
+
+    def test_decimal_comma_parsed_as_numbers(self):
+        """Los valores con coma decimal se cargan como números"""
+        raw = 'producto;precio\nA;1.234,50\nB;12,75\n'
+        for analyzer in (DataAnalyzer(csv_content=raw), DataAnalyzer(file_bytes=raw.encode('utf-8'))):
+            self.assertEqual(analyzer.dialect.decimal, ',')
+            self.assertEqual(analyzer.df['precio'].tolist(), [1234.5, 12.75])
+
+    def test_bom_is_stripped_from_header(self):
+        """El BOM no aparece en el nombre de la primera columna"""
+        analyzer = DataAnalyzer(file_bytes=codecs.BOM_UTF8 + b'id,valor\n1,2\n')
+        self.assertEqual(list(analyzer.df.columns), ['id', 'valor'])
+
+
+if __name__ == '__main__':
+    unittest.main()
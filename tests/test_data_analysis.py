@@ -16,6 +16,8 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 try:
+    from column_stats import profile_numeric
+    from correlation import pairwise_correlation
     from data_analysis import DataAnalyzer
 except ImportError:
     # Crear un mock si no se puede importar
@@ -215,6 +217,256 @@ class TestDataAnalyzer(unittest.TestCase):
             self.skipTest(f"Análisis de dataset grande falló: {e}")
 
 
+class TestDataLoading(unittest.TestCase):
+    """Pruebas para la carga de archivos CSV"""
+
+    def setUp(self):
+        """Crear directorio temporal"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_load_from_bytes_matches_file(self):
+        """Cargar desde bytes y desde archivo debe producir el mismo DataFrame"""
+        raw = "producto;precio\nCafé;2.5\nTé;1.75\n".encode('utf-8')
+        file_path = os.path.join(self.temp_dir, 'datos.csv')
+        with open(file_path, 'wb') as f:
+            f.write(raw)
+
+        from_bytes = DataAnalyzer(file_bytes=raw)
+        from_file = DataAnalyzer(file_path=file_path)
+
+        self.assertEqual(list(from_bytes.df.columns), ['producto', 'precio'])
+        self.assertEqual(from_bytes.df['producto'].iloc[0], 'Café')
+        pd.testing.assert_frame_equal(from_bytes.df, from_file.df)
+
+    def test_non_ascii_after_sniff_prefix(self):
+        """Texto acentuado más allá del prefijo analizado no debe romper la carga"""
+        ascii_rows = "id,nombre\n" + "".join(f"{i},fila{i}\n" for i in range(20000))
+        raw = (ascii_rows + "20000,Ñandú\n").encode('utf-8')
+
+        analyzer = DataAnalyzer(file_bytes=raw)
+
+        self.assertEqual(len(analyzer.df), 20001)
+        self.assertEqual(analyzer.df['nombre'].iloc[-1], 'Ñandú')
+
+    def test_latin1_after_sniff_prefix(self):
+        """Bytes Latin-1 más allá del prefijo analizado se leen con la codificación de respaldo"""
+        ascii_rows = "id,nombre\n" + "".join(f"{i},fila{i}\n" for i in range(20000))
+        raw = ascii_rows.encode('ascii') + "20000,Ñandú\n".encode('latin-1')
+        path = os.path.join(tempfile.mkdtemp(), 'latin1.csv')
+        with open(path, 'wb') as f:
+            f.write(raw)
+
+        from_bytes = DataAnalyzer(file_bytes=raw)
+        from_file = DataAnalyzer(file_path=path)
+        shutil.rmtree(os.path.dirname(path))
+
+        for analyzer in (from_bytes, from_file):
+            self.assertEqual(len(analyzer.df), 20001)
+            self.assertEqual(analyzer.df['nombre'].iloc[-1], 'Ñandú')
+            self.assertEqual(analyzer.dialect.encoding, 'cp1252')
+
+
+class TestQuantiles(unittest.TestCase):
+    """Pruebas para el cálculo de cuartiles exactos y aproximados"""
+
+    def setUp(self):
+        """Crear un analizador con una columna numérica"""
+        rng = np.random.default_rng(11)
+        self.values = rng.lognormal(size=20000)
+        self.analyzer = DataAnalyzer()
+        self.analyzer.df = pd.DataFrame({'monto': self.values})
+
+    def test_exact_below_threshold(self):
+        """Por debajo del umbral los cuartiles son exactos"""
+        quantiles = self.analyzer.get_quantiles('monto')
+
+        self.assertTrue(quantiles['exact'])
+        self.assertAlmostEqual(quantiles['median'], np.median(self.values))
+        self.assertTrue(self.analyzer.get_statistical_summary()['monto']['quantiles_exact'])
+
+    def test_approximate_above_threshold(self):
+        """Por encima del umbral se usa el sketch y se marca como aproximado"""
+        self.analyzer.quantile_row_threshold = 1000
+        self.analyzer.quantile_error = 0.01
+
+        summary = self.analyzer.get_statistical_summary()['monto']
+
+        self.assertFalse(summary['quantiles_exact'])
+        self.assertGreater(summary['quantile_rank_error'], 0)
+        for key, q in [('q25', 0.25), ('median', 0.5), ('q75', 0.75)]:
+            rank = np.mean(self.values <= summary[key])
+            self.assertLess(abs(rank - q), 0.02)
+
+    def test_quantiles_computed_once(self):
+        """Los cuartiles se reutilizan entre secciones"""
+        with patch('data_analysis.profile_numeric', wraps=profile_numeric) as mocked:
+            self.analyzer.get_statistical_summary()
+            self.analyzer.generate_ai_insights()
+        self.assertEqual(mocked.call_count, 1)
+
+    def test_cache_follows_dataframe(self):
+        """Reemplazar el DataFrame invalida los cuartiles guardados"""
+        self.analyzer.get_quantiles('monto')
+        self.analyzer.df = pd.DataFrame({'monto': [1.0, 2.0, 3.0]})
+        self.assertEqual(self.analyzer.get_quantiles('monto')['median'], 2.0)
+
+
+class TestStatisticsCache(unittest.TestCase):
+    """Pruebas para la caché de estadísticas compartida entre etapas"""
+
+    def setUp(self):
+        """Crear un analizador con columnas numéricas y de texto"""
+        rng = np.random.default_rng(4)
+        self.analyzer = DataAnalyzer()
+        self.analyzer.df = pd.DataFrame({
+            'ventas': rng.normal(100, 10, 200),
+            'costo': rng.normal(60, 5, 200),
+            'region': rng.choice(['Norte', 'Sur'], 200),
+        })
+
+    def tearDown(self):
+        """Eliminar los gráficos generados"""
+        self.analyzer.cleanup_plots()
+
+    def test_each_quantity_computed_once(self):
+        """Cada cantidad se calcula una sola vez por análisis"""
+        with patch('data_analysis.pairwise_correlation', side_effect=pairwise_correlation) as corr:
+            results = self.analyzer.analyze()
+
+        self.assertTrue(results['success'])
+        self.assertEqual(corr.call_count, 1)
+        computed = [key for stage in results['cache_stats'].values() for key in stage['computed']]
+        self.assertEqual(len(computed), len(set(computed)))
+        self.assertEqual(results['cache_stats']['correlation_matrix']['computed'], ['correlation_matrix'])
+        self.assertEqual(results['cache_stats']['correlation_heatmap']['computed'], ['correlation_heatmap'])
+        self.assertGreater(results['cache_stats']['ai_insights']['hits'], 0)
+
+    def test_cache_follows_dataframe(self):
+        """Reemplazar el DataFrame vacía la caché"""
+        self.analyzer.get_numerical_data()
+        self.analyzer.df = self.analyzer.df[['region']]
+        self.assertEqual(len(self.analyzer.get_numerical_data().columns), 0)
+
+
+class TestAnalysisStages(unittest.TestCase):
+    """Pruebas para la ejecución selectiva de etapas"""
+
+    def setUp(self):
+        """Crear un analizador con columnas numéricas y de texto"""
+        rng = np.random.default_rng(8)
+        self.analyzer = DataAnalyzer()
+        self.analyzer.df = pd.DataFrame({
+            'ventas': rng.normal(100, 10, 200),
+            'costo': rng.normal(60, 5, 200),
+            'region': rng.choice(['Norte', 'Sur'], 200),
+        })
+
+    def tearDown(self):
+        """Eliminar los gráficos generados"""
+        self.analyzer.cleanup_plots()
+
+    def test_only_requested_stages_run(self):
+        """Pedir basic_info no calcula correlaciones ni gráficos"""
+        with patch.object(DataAnalyzer, 'create_histograms') as histograms:
+            results = self.analyzer.analyze(['basic_info'])
+
+        histograms.assert_not_called()
+        self.assertTrue(results['success'])
+        self.assertIn('basic_info', results)
+        self.assertNotIn('statistical_summary', results)
+        self.assertEqual(set(results['cache_stats']), {'null_counts', 'basic_info'})
+
+    def test_later_requests_reuse_stages(self):
+        """Una petición posterior reutiliza las etapas ya calculadas"""
+        first = self.analyzer.analyze(['statistical_summary'])
+        second = self.analyzer.analyze(['statistical_summary', 'histograms'])
+
+        self.assertEqual(first['statistical_summary'], second['statistical_summary'])
+        stats = second['cache_stats']
+        self.assertEqual(stats['statistical_summary']['misses'], 1)
+        self.assertEqual(stats['numeric_profile']['misses'], 1)
+        self.assertEqual(stats['histograms']['computed'], ['histograms'])
+        self.assertEqual(len(second['histograms']), 2)
+
+    def test_unknown_output(self):
+        """Una sección desconocida devuelve un error"""
+        results = self.analyzer.analyze(['pdf'])
+
+        self.assertFalse(results['success'])
+
+    def test_chart_data_mode(self):
+        """En modo datos los gráficos se devuelven como datos en lugar de imágenes"""
+        analyzer = DataAnalyzer(chart_mode='data')
+        analyzer.df = self.analyzer.df
+        results = analyzer.analyze(['correlation_heatmap', 'histograms', 'boxplots'])
+
+        self.assertTrue(results['success'])
+        self.assertEqual(results['correlation_heatmap']['columns'], ['ventas', 'costo'])
+        self.assertEqual([chart['type'] for chart in results['histograms']], ['histogram', 'histogram'])
+        self.assertEqual(results['boxplots'][0]['group_by'], 'region')
+        self.assertEqual(analyzer.plot_paths, [])
+
+    def test_unknown_chart_mode(self):
+        """Un modo de gráficos desconocido se rechaza"""
+        with self.assertRaises(ValueError):
+            DataAnalyzer(chart_mode='svg')
+
+
+class TestDistinctCounts(unittest.TestCase):
+    """Pruebas para los conteos aproximados de valores únicos"""
+
+    def setUp(self):
+        """Crear columnas de alta y baja cardinalidad"""
+        n = 5000
+        self.analyzer = DataAnalyzer(distinct_row_threshold=1000)
+        self.analyzer.df = pd.DataFrame({
+            'email': [f'usuario{i}@correo.com' for i in range(n)],
+            'region': ['Norte', 'Sur', 'Norte', 'Este', 'Norte'] * (n // 5),
+            'monto': np.arange(n, dtype=float),
+        })
+
+    def test_high_cardinality_is_estimated(self):
+        """Una columna claramente por encima del límite no se cuenta exactamente"""
+        with patch.object(pd.Series, 'nunique') as mocked:
+            result = self.analyzer.get_distinct_count('email', limit=50)
+
+        mocked.assert_not_called()
+        self.assertFalse(result['exact'])
+        self.assertLess(abs(result['count'] - 5000) / 5000, 0.05)
+
+    def test_low_cardinality_is_exact(self):
+        """Cerca del límite se usa el conteo exacto"""
+        result = self.analyzer.get_distinct_count('region', limit=10)
+
+        self.assertTrue(result['exact'])
+        self.assertEqual(result['count'], 3)
+
+    def test_column_info_classification(self):
+        """La clasificación de columnas no cambia con los conteos aproximados"""
+        info = self.analyzer.get_column_info()
+
+        self.assertEqual(info, {'email': 'Texto', 'region': 'Categórica', 'monto': 'Numérica'})
+
+    def test_top_categories(self):
+        """El sketch de categorías frecuentes da los conteos exactos con pocas categorías"""
+        top = self.analyzer.get_top_categories('region', 2)
+
+        self.assertTrue(top['exact'])
+        self.assertEqual(top['values'], [('Norte', 3000), ('Sur', 1000)])
+
+    def test_segmentation_insight(self):
+        """La segmentación usa la categoría dominante"""
+        insights = self.analyzer.generate_ai_insights()
+
+        self.assertTrue(any("'Norte'" in insight and "'region'" in insight for insight in insights))
+        self.assertFalse(any("'email'" in insight for insight in insights))
+
+
 class TestDataValidation(unittest.TestCase):
     """Pruebas para validación de datos"""
 
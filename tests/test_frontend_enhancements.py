@@ -100,7 +100,7 @@ class TestFrontendEnhancements(unittest.TestCase):
             js_content = f.read()
         
         # Verificar funciones de progreso
-        self.assertIn('function simulateProgress', js_content)
+        self.assertIn('function followJob', js_content)
         self.assertIn('function updateProgress', js_content)
         self.assertIn('function resetProgress', js_content)
         self.assertIn('function completeProgress', js_content)
@@ -163,8 +163,10 @@ class TestFrontendEnhancements(unittest.TestCase):
         
         # Verificar manejo de errores
         self.assertIn('console.error', js_content)
-        self.assertIn('clearInterval', js_content)
-        self.assertIn('currentProgressInterval', js_content)
+        # Si falla el flujo de eventos se cierra y se consulta el estado periódicamente
+        self.assertIn('source.onerror', js_content)
+        self.assertIn('source.close()', js_content)
+        self.assertIn('waitForJob(job)', js_content)
 
     def test_responsive_design_elements(self):
         """Verificar elementos de diseño responsivo"""
@@ -215,8 +217,9 @@ class TestFrontendEnhancements(unittest.TestCase):
         with open(js_file, 'r', encoding='utf-8') as f:
             js_content = f.read()
         
-        # Verificar que showLoading llama a simulateProgress
-        self.assertIn('simulateProgress()', js_content)
+        # Verificar que analyzeData sigue el progreso real del trabajo
+        self.assertIn('await followJob(job)', js_content)
+        self.assertIn('job.events_url', js_content)
         
         # Verificar que analyzeData guarda resultados para PDF
         self.assertIn('window.lastAnalysisResults = results', js_content)
@@ -226,8 +229,8 @@ class TestFrontendEnhancements(unittest.TestCase):
         self.assertIn('analyzeBtn.disabled = false', js_content)
 
 
-class TestProgressSimulation(unittest.TestCase):
-    """Pruebas específicas para la simulación de progreso"""
+class TestServerProgress(unittest.TestCase):
+    """Pruebas específicas para el progreso real informado por el servidor"""
 
     def test_progress_percentage_ranges(self):
         """Verificar rangos correctos de porcentajes"""
@@ -239,13 +242,12 @@ class TestProgressSimulation(unittest.TestCase):
         with open(js_file, 'r', encoding='utf-8') as f:
             js_content = f.read()
         
-        # Verificar que los porcentajes están en el rango correcto
-        percentages = ['10', '25', '40', '60', '80', '95']
-        for percentage in percentages:
-            self.assertIn(f'percent: {percentage}', js_content)
+        # Lectura del archivo de 10% a 30%, etapas de 30% a 95%
+        self.assertIn('10 + Math.round(share * 20)', js_content)
+        self.assertIn('30 + Math.round(65 * data.index / data.total)', js_content)
 
-    def test_progress_timing(self):
-        """Verificar configuración de tiempo"""
+    def test_progress_events_handled(self):
+        """Verificar que se atienden todos los eventos del servidor"""
         js_file = os.path.join(os.path.dirname(__file__), '..', 'frontend', 'script.js')
         
         if not os.path.exists(js_file):
@@ -254,9 +256,9 @@ class TestProgressSimulation(unittest.TestCase):
         with open(js_file, 'r', encoding='utf-8') as f:
             js_content = f.read()
         
-        # Verificar intervalos de tiempo razonables
-        self.assertIn('1000', js_content)  # 1 segundo entre etapas
-        self.assertIn('200', js_content)   # 200ms de delay inicial
+        for event in ['job_started', 'bytes_parsed', 'stage_started', 'plot_rendered', 'job_finished']:
+            self.assertIn(f"addEventListener('{event}'", js_content)
+        self.assertIn('new EventSource', js_content)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+"""
+Pruebas unitarias para la limpieza periódica de directorios
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import time
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from janitor import Janitor, sweep_directory
+
+
+class TestJanitor(unittest.TestCase):
+    """Pruebas para sweep_directory y Janitor"""
+
+    def setUp(self):
+        """Crear un directorio con un archivo viejo y uno reciente"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_file = os.path.join(self.temp_dir, 'viejo.csv')
+        self.new_file = os.path.join(self.temp_dir, 'nuevo.csv')
+        with open(self.old_file, 'wb') as f:
+            f.write(b'x' * 100)
+        with open(self.new_file, 'wb') as f:
+            f.write(b'y' * 10)
+        old = time.time() - 7200
+        os.utime(self.old_file, (old, old))
+
+    def tearDown(self):
+        """Limpiar archivos temporales"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_sweep_removes_only_old_files(self):
+        """Solo se borran los archivos más antiguos que el límite"""
+        self.assertEqual(sweep_directory(self.temp_dir, 3600), (1, 100))
+        self.assertFalse(os.path.exists(self.old_file))
+        self.assertTrue(os.path.exists(self.new_file))
+
+    def test_sweep_missing_directory(self):
+        """Un directorio inexistente no es un error"""
+        self.assertEqual(sweep_directory(os.path.join(self.temp_dir, 'no_existe'), 0), (0, 0))
+
+    def test_metrics_accumulate(self):
+        """Las métricas suman los archivos y bytes recuperados por tarea"""
+        janitor = Janitor()
+        janitor.add('uploads', lambda: sweep_directory(self.temp_dir, 3600))
+
+        self.assertEqual(janitor.run_once(), {'uploads': (1, 100)})
+        janitor.run_once()
+
+        metrics = janitor.report()['uploads']
+        self.assertEqual(metrics['runs'], 2)
+        self.assertEqual(metrics['files_reclaimed'], 1)
+        self.assertEqual(metrics['bytes_reclaimed'], 100)
+        self.assertIsNotNone(metrics['last_run'])
+
+    def test_failing_task_does_not_stop_others(self):
+        """Un error en una tarea no impide las demás"""
+        janitor = Janitor()
+        janitor.add('rota', lambda: 1 / 0)
+        janitor.add('uploads', lambda: sweep_directory(self.temp_dir, 3600))
+
+        self.assertEqual(janitor.run_once(), {'uploads': (1, 100)})
+        self.assertEqual(janitor.report()['rota']['runs'], 0)
+
+    def test_background_thread(self):
+        """El hilo de fondo ejecuta las tareas y se detiene"""
+        janitor = Janitor(interval=0.01)
+        janitor.add('uploads', lambda: sweep_directory(self.temp_dir, 3600))
+        janitor.start()
+        janitor.start()
+        deadline = time.time() + 5
+        while janitor.report()['uploads']['runs'] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        janitor.stop()
+
+        self.assertGreaterEqual(janitor.report()['uploads']['runs'], 2)
+        self.assertFalse(os.path.exists(self.old_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
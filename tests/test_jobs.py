@@ -0,0 +1,137 @@
+"""
+Pruebas unitarias para la cola de trabajos de análisis
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import time
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from jobs import JobManager, JobQueueFull, run_analysis
+
+PARAMS = {
+    'CSV_SNIFF_SAMPLE_SIZE': 64 * 1024,
+    'CHUNKED_ANALYSIS_THRESHOLD': 20 * 1024 * 1024,
+    'ANALYSIS_CHUNKSIZE': 100_000,
+    'ANALYSIS_SAMPLE_ROWS': 50_000,
+    'QUANTILE_APPROX_ROW_THRESHOLD': 250_000,
+    'QUANTILE_RANK_ERROR': 0.01,
+    'DISTINCT_APPROX_ROW_THRESHOLD': 100_000,
+    'HISTOGRAM_BUDGET': 12,
+    'BOXPLOT_BUDGET': 5,
+}
+
+
+def _crash_worker(progress=None):
+    # Termina el proceso como lo haría un fallo o el OOM killer
+    os._exit(1)
+
+
+class TestJobManager(unittest.TestCase):
+    """Pruebas para el gestor de trabajos en procesos"""
+
+    def setUp(self):
+        """Crear un CSV de prueba y un gestor con un proceso"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_file = os.path.join(self.temp_dir, 'ventas.csv')
+        with open(self.csv_file, 'w', encoding='utf-8') as f:
+            f.write("producto,ventas,costo\nA,10,6\nB,20,11\nC,15,9\nD,30,16\n")
+        self.manager = JobManager(max_workers=1, max_pending=4)
+
+    def tearDown(self):
+        """Detener los procesos y limpiar"""
+        self.manager.shutdown()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _wait(self, job_id, timeout=120):
+        deadline = time.time() + timeout
+        while self.manager.status(job_id)['status'] in ('queued', 'running') and time.time() < deadline:
+            time.sleep(0.05)
+        return self.manager.get(job_id)
+
+    def test_job_runs_in_worker(self):
+        """El análisis se ejecuta en otro proceso y borra el archivo subido"""
+        received = []
+        job_id = self.manager.submit(run_analysis, self.csv_file, PARAMS, ['basic_info'],
+                                     on_success=received.append)
+
+        job = self._wait(job_id)
+
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['result']['basic_info']['dimensions']['rows'], 4)
+        self.assertEqual(received, [job['result']])
+        self.assertFalse(os.path.exists(self.csv_file))
+        status = self.manager.status(job_id)
+        self.assertEqual(status['progress'], 100)
+        self.assertIsNone(status['queue_position'])
+
+    def test_job_events(self):
+        """El trabajo registra sus eventos de progreso y termina con job_finished"""
+        job_id = self.manager.submit(run_analysis, self.csv_file, PARAMS, ['basic_info'])
+
+        self._wait(job_id)
+        events = self.manager.wait_events(job_id, 0, timeout=1)
+        names = [event['event'] for event in events]
+
+        self.assertEqual(names[0], 'job_started')
+        self.assertEqual(names[-1], 'job_finished')
+        self.assertEqual(events[-1]['data']['status'], 'done')
+        self.assertEqual([event['id'] for event in events], list(range(len(events))))
+        self.assertIn('bytes_parsed', names)
+        finished = [event['data'] for event in events if event['event'] == 'stage_finished']
+        self.assertIn('load', [data['stage'] for data in finished])
+        self.assertIn('basic_info', [data['stage'] for data in finished])
+        self.assertTrue(all(data['duration'] >= 0 for data in finished))
+
+        # Desde un cursor solo llegan los eventos posteriores
+        self.assertEqual(self.manager.wait_events(job_id, len(events) - 1, timeout=0), events[-1:])
+        self.assertIsNone(self.manager.wait_events('no_existe', 0, timeout=0))
+
+        sections, finished = self.manager.wait_sections(job_id, 0, timeout=0)
+        self.assertTrue(finished)
+        self.assertEqual([section['section'] for section in sections], ['basic_info'])
+        self.assertEqual(sections[0]['data']['dimensions']['rows'], 4)
+        self.assertIn('section_ready', names)
+
+    def test_failed_job_keeps_error(self):
+        """Los errores del análisis se guardan en el trabajo"""
+        job_id = self.manager.submit(run_analysis, os.path.join(self.temp_dir, 'no_existe.csv'), PARAMS)
+
+        job = self._wait(job_id)
+
+        self.assertEqual(job['status'], 'failed')
+        self.assertIsInstance(job['error'], FileNotFoundError)
+
+    def test_pool_recovers_from_dead_worker(self):
+        """Si un proceso muere solo falla su trabajo y los siguientes se ejecutan"""
+        crashed = self._wait(self.manager.submit(_crash_worker))
+
+        self.assertEqual(crashed['status'], 'failed')
+        job = self._wait(self.manager.submit(run_analysis, self.csv_file, PARAMS, ['basic_info']))
+        self.assertEqual(job['status'], 'done')
+        self.assertEqual(job['result']['basic_info']['dimensions']['rows'], 4)
+
+    def test_queue_is_bounded(self):
+        """Con la cola llena se rechazan trabajos nuevos"""
+        manager = JobManager(max_workers=1, max_pending=0)
+        with self.assertRaises(JobQueueFull):
+            manager.submit(run_analysis, self.csv_file, PARAMS)
+
+    def test_completed_job(self):
+        """Un resultado conocido se registra como trabajo terminado"""
+        job_id = self.manager.completed({'success': True})
+
+        self.assertEqual(self.manager.status(job_id)['status'], 'done')
+        self.assertEqual(self.manager.get(job_id)['result'], {'success': True})
+        self.assertEqual([event['event'] for event in self.manager.wait_events(job_id, 0, timeout=0)],
+                         ['job_finished'])
+
+
+if __name__ == '__main__':
+    unittest.main()
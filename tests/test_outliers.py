@@ -0,0 +1,85 @@
+"""
+Pruebas unitarias para la detección de valores atípicos
+"""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from data_analysis import DataAnalyzer
+from outliers import IQROutliers
+
+
+class TestIQROutliers(unittest.TestCase):
+    """Pruebas para IQROutliers"""
+
+    def setUp(self):
+        """Crear columnas con valores atípicos y nulos"""
+        rng = np.random.default_rng(4)
+        self.df = pd.DataFrame({
+            'ventas': rng.normal(100, 10, 1000),
+            'costo': rng.exponential(10, 1000),
+            'unidades': rng.integers(0, 50, 1000),
+        })
+        self.df.loc[[3, 500], 'ventas'] = [400.0, -200.0]
+        self.df.loc[::11, 'costo'] = np.nan
+        self.q1 = self.df.quantile(0.25).to_numpy()
+        self.q3 = self.df.quantile(0.75).to_numpy()
+
+    def test_matches_column_masks(self):
+        """Los conteos coinciden con filtrar columna por columna"""
+        outliers = IQROutliers.detect(self.df, self.q1, self.q3)
+
+        for col, q1, q3 in zip(self.df.columns, self.q1, self.q3):
+            iqr = q3 - q1
+            mask = (self.df[col] < q1 - 1.5 * iqr) | (self.df[col] > q3 + 1.5 * iqr)
+            self.assertEqual(outliers.counts()[col], mask.sum())
+            np.testing.assert_array_equal(outliers.rows(col), np.flatnonzero(mask))
+            self.assertEqual(outliers.bounds(col), (q1 - 1.5 * iqr, q3 + 1.5 * iqr))
+        self.assertEqual(outliers.total(), int(outliers.counts().sum()))
+
+    def test_extreme_rows_found(self):
+        """Los valores extremos se encuentran y los nulos no cuentan"""
+        outliers = IQROutliers.detect(self.df, self.q1, self.q3)
+
+        self.assertIn(3, outliers.rows('ventas'))
+        self.assertIn(500, outliers.rows('ventas'))
+        self.assertFalse(np.isin(outliers.rows('costo'), np.arange(0, 1000, 11)).any())
+        self.assertEqual(outliers.counts()['unidades'], 0)
+
+    def test_analyzer_summary(self):
+        """El resumen estadístico incluye los atípicos de cada columna"""
+        analyzer = DataAnalyzer()
+        analyzer.df = self.df
+
+        summary = analyzer.get_statistical_summary()
+
+        counts = analyzer.get_outliers().counts()
+        self.assertEqual({col: stats['outliers'] for col, stats in summary.items()}, counts.to_dict())
+        self.assertGreaterEqual(summary['ventas']['outliers'], 2)
+        self.assertIs(analyzer.get_outliers(), analyzer.get_outliers())
+
+    def test_boxplot_reuses_outliers(self):
+        """El boxplot sin agrupar usa los atípicos ya detectados"""
+        analyzer = DataAnalyzer(chart_mode='data')
+        analyzer.df = self.df
+
+        boxes = {chart['column']: chart['groups'][0] for chart in analyzer.create_boxplots()}
+
+        outliers = analyzer.get_outliers()
+        self.assertEqual(boxes['ventas']['outlier_count'], outliers.counts()['ventas'])
+        self.assertIn(400.0, boxes['ventas']['outliers'])
+        low, high = outliers.bounds('costo')
+        self.assertGreaterEqual(boxes['costo']['whisker_low'], low)
+        self.assertLessEqual(boxes['costo']['whisker_high'], high)
+        self.assertEqual(boxes['costo']['count'], self.df['costo'].count())
+
+
+if __name__ == '__main__':
+    unittest.main()
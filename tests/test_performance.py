@@ -224,6 +224,133 @@ class TestPerformance(unittest.TestCase):
         self.assertLess(sort_time, 1.0)
 
 
+class TestIngestionBenchmark(unittest.TestCase):
+    """Comparación de la ingesta de CSV en una sola pasada contra la ruta anterior"""
+
+    def setUp(self):
+        """Crear un CSV con texto acentuado para forzar la detección de encoding"""
+        self.temp_dir = tempfile.mkdtemp()
+        n_rows = 200000
+        df = pd.DataFrame({
+            'id': range(n_rows),
+            'ciudad': np.random.choice(['Bogotá', 'Medellín', 'Cali', 'Málaga'], n_rows),
+            'ventas': np.random.uniform(0, 1000, n_rows),
+            'unidades': np.random.randint(1, 50, n_rows)
+        })
+        self.csv_file = os.path.join(self.temp_dir, 'benchmark.csv')
+        df.to_csv(self.csv_file, index=False, sep=';')
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def _legacy_load(self, analyzer, file_path):
+        """Ruta anterior: chardet sobre todo el archivo, decodificación completa y relectura"""
+        import chardet
+        with open(file_path, 'rb') as f:
+            raw_data = f.read()
+        detected = chardet.detect(raw_data)
+        encoding = detected.get('encoding', 'utf-8') if detected['confidence'] > 0.7 else 'utf-8'
+        text_content = raw_data.decode(encoding)
+        separator = analyzer.detect_separator(text_content)
+        return pd.read_csv(file_path, sep=separator, encoding=encoding)
+
+    def test_single_pass_ingestion_benchmark(self):
+        """La ingesta en una pasada debe dar el mismo DataFrame y no ser más lenta"""
+        from data_analysis import DataAnalyzer
+
+        analyzer = DataAnalyzer()
+
+        # Mejor de 5 ejecuciones para reducir el ruido de la caché del sistema
+        legacy_times, single_pass_times = [], []
+        for _ in range(5):
+            start_time = time.perf_counter()
+            legacy_df = self._legacy_load(analyzer, self.csv_file)
+            legacy_times.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            analyzer.load_from_file(self.csv_file)
+            single_pass_times.append(time.perf_counter() - start_time)
+
+        legacy_time = min(legacy_times)
+        single_pass_time = min(single_pass_times)
+
+        print(f"\nIngesta anterior: {legacy_time:.3f}s | una pasada: {single_pass_time:.3f}s "
+              f"| aceleración: {legacy_time / single_pass_time:.1f}x")
+
+        pd.testing.assert_frame_equal(analyzer.df, legacy_df)
+        self.assertLess(single_pass_time, legacy_time)
+
+
+class TestRenderProfileBenchmark(unittest.TestCase):
+    """Tiempo de dibujo y tamaño de las imágenes de cada perfil de gráficos"""
+
+    def test_render_profiles_benchmark(self):
+        """La vista previa web debe ser más rápida y ligera que el perfil pdf"""
+        from plot_rendering import RENDER_PROFILES, render_grouped_boxplot, render_heatmap, render_histogram
+
+        rng = np.random.default_rng(9)
+        frame = pd.DataFrame({'ventas': rng.normal(100, 15, 5000), 'costo': rng.normal(60, 8, 5000),
+                              'region': rng.choice(['Norte', 'Sur', 'Este', 'Oeste'], 5000)})
+        tasks = [
+            (render_histogram, ('ventas', frame['ventas'].to_numpy(), 100.0, 100.0)),
+            (render_grouped_boxplot, ('ventas', 'region', list(frame.groupby('region')['ventas']))),
+            (render_heatmap, (frame[['ventas', 'costo']].corr(),)),
+        ]
+
+        results = {}
+        for name, profile in RENDER_PROFILES.items():
+            # Mejor de 3 ejecuciones para reducir el ruido
+            times = []
+            for _ in range(3):
+                start_time = time.perf_counter()
+                images = [function(*args, profile) for function, args in tasks]
+                times.append(time.perf_counter() - start_time)
+            results[name] = (min(times), sum(len(image) for image in images))
+            print(f"\nPerfil {name}: {results[name][0]:.3f}s | {results[name][1] / 1024:.0f} KB")
+
+        self.assertLess(results['web-preview'][0], results['pdf'][0])
+        self.assertLess(results['web-preview'][1], results['pdf'][1])
+        self.assertLess(results['thumbnail'][1], results['pdf'][1])
+
+
+class TestParallelRenderBenchmark(unittest.TestCase):
+    """Dibujo de gráficos en un pool de procesos contra el dibujo en serie"""
+
+    @unittest.skipIf((os.cpu_count() or 1) < 2, "Se necesitan al menos dos núcleos")
+    def test_parallel_render_benchmark(self):
+        """Con varios procesos los gráficos deben dibujarse más rápido que en serie"""
+        from plot_rendering import MIN_PARALLEL_PLOTS, PlotRenderer, render_histogram
+
+        rng = np.random.default_rng(10)
+        tasks = [(render_histogram, (f'columna {index}', rng.normal(100, 15, 20000), 100.0, 100.0))
+                 for index in range(4 * MIN_PARALLEL_PLOTS)]
+        workers = min(os.cpu_count(), 4)
+
+        serial = PlotRenderer(max_workers=1)
+        parallel = PlotRenderer(max_workers=workers)
+        try:
+            # El arranque del pool no se mide: en la aplicación se reutiliza
+            parallel.render(tasks[:MIN_PARALLEL_PLOTS])
+
+            start_time = time.perf_counter()
+            serial_images = serial.render(tasks)
+            serial_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            parallel_images = parallel.render(tasks)
+            parallel_time = time.perf_counter() - start_time
+        finally:
+            parallel.shutdown()
+
+        print(f"\nGráficos en serie: {serial_time:.3f}s | {workers} procesos: {parallel_time:.3f}s "
+              f"| aceleración: {serial_time / parallel_time:.1f}x")
+
+        self.assertEqual(parallel_images, serial_images)
+        self.assertLess(parallel_time, serial_time)
+
+
 class TestScalability(unittest.TestCase):
     """Pruebas de escalabilidad"""
 
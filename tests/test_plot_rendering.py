@@ -0,0 +1,109 @@
+"""
+Pruebas unitarias para la generación de gráficos en paralelo
+"""
+
+import unittest
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from chart_data import box_summary
+from plot_rendering import (RENDER_PROFILES, PlotRenderer, render_boxplot, render_grouped_boxplot, render_heatmap,
+                            render_histogram, render_key, source_key)
+from data_analysis import DataAnalyzer
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def is_webp(image):
+    return image[:4] == b'RIFF' and image[8:12] == b'WEBP'
+
+
+def _fail():
+    raise ValueError('gráfico inválido')
+
+
+class TestPlotRendering(unittest.TestCase):
+    """Pruebas para las funciones de dibujo y PlotRenderer"""
+
+    def setUp(self):
+        """Crear datos de prueba"""
+        rng = np.random.default_rng(6)
+        self.values = rng.normal(50, 5, 200)
+        self.frame = pd.DataFrame({'ventas': self.values, 'region': rng.choice(['Norte', 'Sur'], 200)})
+        self.tasks = [
+            (render_histogram, ('ventas', self.values, 50.0, 49.5)),
+            (render_boxplot, ('ventas', box_summary(self.values))),
+            (render_grouped_boxplot, ('ventas', 'region', list(self.frame.groupby('region')['ventas']))),
+            (render_heatmap, (pd.DataFrame([[1.0, 0.5], [0.5, 1.0]], index=['a', 'b'], columns=['a', 'b']),)),
+        ]
+
+    def test_render_functions_return_images(self):
+        """Cada función devuelve una imagen WebP por defecto y PNG con el perfil pdf"""
+        outputs = PlotRenderer().render(self.tasks)
+        pdf_outputs = PlotRenderer().render([(function, args + (RENDER_PROFILES['pdf'],))
+                                             for function, args in self.tasks])
+
+        self.assertEqual(len(outputs), 4)
+        for output in outputs:
+            self.assertTrue(is_webp(output))
+        for output in pdf_outputs:
+            self.assertTrue(output.startswith(PNG_SIGNATURE))
+
+    def test_render_key(self):
+        """La clave de un gráfico depende de sus datos y del perfil"""
+        web, pdf = RENDER_PROFILES['web-preview'], RENDER_PROFILES['pdf']
+        function, args = self.tasks[2]
+        changed = self.frame.copy()
+        changed.loc[0, 'ventas'] += 1
+        matrix = self.tasks[3][1][0]
+
+        source = source_key(function, args)
+
+        self.assertEqual(source, source_key(function, args[:2] + (list(self.frame.copy().groupby('region')['ventas']),)))
+        self.assertNotEqual(source, source_key(function, args[:2] + (list(changed.groupby('region')['ventas']),)))
+        self.assertEqual(source_key(render_heatmap, (matrix,)), source_key(render_heatmap, (matrix.copy(),)))
+        self.assertNotEqual(source_key(render_heatmap, (matrix,)), source_key(render_heatmap, (matrix * 2,)))
+        self.assertNotEqual(render_key(source, web), render_key(source, pdf))
+
+    def test_pool_keeps_task_order(self):
+        """En paralelo los resultados llegan en el orden de las tareas"""
+        renderer = PlotRenderer(max_workers=2, min_parallel=1)
+        counts = []
+        try:
+            outputs = renderer.render(self.tasks[:2] + [(_fail, ())], counts.append)
+        finally:
+            renderer.shutdown()
+
+        self.assertEqual(outputs[:2], PlotRenderer().render(self.tasks[:2]))
+        self.assertIsInstance(outputs[2], ValueError)
+        self.assertEqual(counts, [1, 2, 3])
+
+    def test_concurrent_threads(self):
+        """Varios hilos pueden dibujar a la vez sin mezclar sus figuras"""
+        expected = [function(*args) for function, args in self.tasks]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outputs = list(executor.map(lambda task: task[0](*task[1]), self.tasks * 3))
+
+        self.assertEqual(outputs, expected * 3)
+
+    def test_failed_plot_skipped(self):
+        """Un gráfico que falla se omite sin detener los demás"""
+        analyzer = DataAnalyzer()
+        analyzer.df = self.frame
+
+        plots = analyzer._render_plots('histograms', [('histogram for x', _fail, ()),
+                                                      ('histogram for ventas',) + self.tasks[0]])
+
+        self.assertEqual(len(plots), 1)
+        self.assertTrue(plots[0].startswith('data:image/webp;base64,'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Pruebas unitarias para la selección de gráficos
+"""
+
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from category_index import CategoryIndex
+from data_analysis import DataAnalyzer
+from plot_selection import distribution_score, eta_squared, is_identifier
+
+
+class TestPlotSelection(unittest.TestCase):
+    """Pruebas para la puntuación y el presupuesto de gráficos"""
+
+    def setUp(self):
+        """Crear datos con un identificador, una constante y una relación fuerte"""
+        rng = np.random.default_rng(5)
+        region = rng.choice(['Norte', 'Sur', 'Este'], 600)
+        self.frame = pd.DataFrame({
+            'id': np.arange(1, 601),
+            'constante': np.full(600, 7.0),
+            'ventas': np.select([region == 'Norte', region == 'Sur'], [100.0, 200.0], 300.0) + rng.normal(0, 5, 600),
+            'costo': rng.exponential(10, 600),
+            'region': region,
+            'canal': rng.choice(['web', 'tienda'], 600),
+        })
+        self.analyzer = DataAnalyzer()
+        self.analyzer.df = self.frame
+
+    def test_identifier_detected(self):
+        """Una columna 1..n es un identificador; una permutación con decimales no"""
+        profile = self.analyzer.get_numeric_profile()
+
+        self.assertTrue(is_identifier(self.frame['id'], profile.loc['id']))
+        self.assertFalse(is_identifier(self.frame['ventas'], profile.loc['ventas']))
+
+        values = pd.Series([2.0, 1.0, 4.0, 3.5])
+        stats = pd.Series({'count': 4, 'min': 1.0, 'max': 4.0})
+        self.assertFalse(is_identifier(values, stats))
+
+    def test_identifier_and_constant_not_ranked(self):
+        """Ni los identificadores ni las columnas constantes tienen histograma"""
+        ranking = self.analyzer.rank_plots()
+        columns = [candidate['column'] for candidate in ranking['histograms']]
+
+        self.assertEqual(sorted(columns), ['costo', 'ventas'])
+        self.assertEqual(distribution_score(self.analyzer.get_numeric_profile().loc['constante']), 0.0)
+
+    def test_skewed_column_ranked_first(self):
+        """Una distribución sesgada puntúa más que una simétrica"""
+        ranking = self.analyzer.rank_plots()
+
+        self.assertEqual(ranking['histograms'][0]['column'], 'costo')
+
+    def test_strong_association_ranked_first(self):
+        """El par cuya categoría explica la variable numérica va primero"""
+        best = self.analyzer.rank_plots()['boxplots'][0]
+
+        self.assertEqual((best['column'], best['group_by']), ('ventas', 'region'))
+        self.assertGreater(best['score'], 0.9)
+
+    def test_eta_squared_matches_groupby(self):
+        """Eta cuadrado coincide con el calculado con groupby"""
+        index = CategoryIndex.build(self.frame['region'], ['Norte', 'Sur', 'Este'])
+        eta2 = eta_squared(*index.moments(self.frame['costo'].to_numpy()))
+
+        costo = self.frame['costo']
+        means = costo.groupby(self.frame['region']).transform('mean')
+        expected = ((means - costo.mean()) ** 2).sum() / ((costo - costo.mean()) ** 2).sum()
+        self.assertAlmostEqual(eta2, expected)
+
+    def test_budgets_respected(self):
+        """Solo se dibujan los gráficos que caben en el presupuesto"""
+        analyzer = DataAnalyzer(histogram_budget=1, boxplot_budget=1)
+        analyzer.df = self.frame
+
+        self.assertEqual(len(analyzer.create_histograms()), 1)
+        self.assertEqual(len(analyzer.create_boxplots()), 1)
+
+    def test_fallback_without_categories(self):
+        """Sin columnas categóricas se dibujan boxplots simples"""
+        analyzer = DataAnalyzer()
+        analyzer.df = self.frame[['id', 'ventas', 'costo']]
+
+        boxplots = analyzer.rank_plots()['boxplots']
+
+        self.assertEqual([candidate['group_by'] for candidate in boxplots], [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Pruebas unitarias para los gráficos generados bajo demanda
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import plot_rendering
+from artifact_store import ArtifactStore
+from data_analysis import DataAnalyzer
+from plot_rendering import RENDER_PROFILES, render_histogram
+from plot_sources import plot_descriptor, render_plot_source, save_plot_source
+
+
+class TestPlotSources(unittest.TestCase):
+    """Pruebas para los datos guardados y el dibujo bajo demanda"""
+
+    def setUp(self):
+        """Crear los almacenes en un directorio temporal"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.sources = ArtifactStore(os.path.join(self.temp_dir, 'sources'))
+        self.plots = ArtifactStore(os.path.join(self.temp_dir, 'plots'))
+        self.values = np.random.default_rng(10).normal(50, 5, 200)
+        self.args = ('ventas', self.values, 50.0, 49.8)
+
+    def tearDown(self):
+        """Limpiar archivos temporales"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_descriptor(self):
+        """El descriptor tiene tipo, parámetros y URL, pero no los datos"""
+        descriptor = plot_descriptor(self.sources, render_histogram, self.args, '/plots')
+
+        self.assertEqual(descriptor['type'], 'histogram')
+        self.assertEqual(descriptor['params'], {'column': 'ventas', 'mean': 50.0, 'median': 49.8})
+        self.assertEqual(descriptor['url'], f"/plots/render/{descriptor['id']}")
+
+    def test_source_saved_once(self):
+        """Los mismos datos se guardan una sola vez"""
+        first = save_plot_source(self.sources, render_histogram, self.args)
+        second = save_plot_source(self.sources, render_histogram, ('ventas', self.values.copy(), 50.0, 49.8))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len([name for name in os.listdir(self.sources.root) if name.endswith('.pkl')]), 1)
+
+    def test_rendered_once_per_profile(self):
+        """Cada gráfico se dibuja la primera vez que se pide con cada perfil"""
+        key = save_plot_source(self.sources, render_histogram, self.args)
+
+        with patch.dict(plot_rendering.PLOT_TYPES, histogram=Mock(wraps=render_histogram)) as types:
+            web = render_plot_source(self.sources, self.plots, key, RENDER_PROFILES['web-preview'])
+            again = render_plot_source(self.sources, self.plots, key, RENDER_PROFILES['web-preview'])
+            pdf = render_plot_source(self.sources, self.plots, key, RENDER_PROFILES['pdf'])
+
+            self.assertEqual(types['histogram'].call_count, 2)
+        self.assertEqual(web, again)
+        self.assertTrue(web.endswith('.webp'))
+        self.assertTrue(pdf.endswith('.png'))
+        self.assertEqual(render_histogram(*self.args, RENDER_PROFILES['pdf']),
+                         open(self.plots.path(pdf), 'rb').read())
+
+    def test_unknown_source(self):
+        """Un gráfico sin datos guardados no se puede generar"""
+        profile = RENDER_PROFILES['web-preview']
+
+        self.assertIsNone(render_plot_source(self.sources, self.plots, 'e' * 64, profile))
+        self.assertIsNone(render_plot_source(self.sources, self.plots, '../secreto', profile))
+
+    def test_lazy_analysis_renders_nothing(self):
+        """En modo lazy el análisis describe los gráficos sin dibujarlos"""
+        analyzer = DataAnalyzer(chart_mode='lazy', plot_store=self.plots, plot_sources=self.sources)
+        analyzer.df = pd.DataFrame({'ventas': self.values, 'costo': self.values * 2})
+
+        with patch.object(analyzer.plot_renderer, 'render') as render:
+            results = analyzer.analyze(['correlation_heatmap', 'histograms', 'boxplots'])
+
+        render.assert_not_called()
+        self.assertTrue(results['success'])
+        self.assertEqual(results['correlation_heatmap']['params'], {'columns': ['ventas', 'costo']})
+        self.assertEqual([plot['type'] for plot in results['boxplots']], ['boxplot', 'boxplot'])
+        self.assertEqual(os.listdir(self.plots.root), [])
+
+    def test_lazy_mode_needs_stores(self):
+        """El modo lazy necesita dónde guardar los datos y las imágenes"""
+        with self.assertRaises(ValueError):
+            DataAnalyzer(chart_mode='lazy')
+
+
+if __name__ == '__main__':
+    unittest.main()
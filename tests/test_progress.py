@@ -0,0 +1,94 @@
+"""
+Pruebas unitarias para los eventos de progreso del análisis
+"""
+
+import unittest
+import os
+import sys
+from io import BytesIO
+
+import pandas as pd
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from progress import ProgressReader, emit
+from data_analysis import DataAnalyzer
+
+
+class TestProgressReader(unittest.TestCase):
+    """Pruebas para el lector que informa los bytes procesados"""
+
+    def setUp(self):
+        """Crear un CSV en memoria"""
+        self.content = ("x,y\n" + "".join(f"{i},{i * 2}\n" for i in range(5000))).encode('utf-8')
+        self.events = []
+
+    def _progress(self, event, data):
+        self.events.append((event, data))
+
+    def test_reports_all_bytes(self):
+        """El último evento informa el archivo completo"""
+        reader = ProgressReader(BytesIO(self.content), len(self.content), self._progress)
+        df = pd.read_csv(reader)
+
+        self.assertEqual(len(df), 5000)
+        self.assertEqual(self.events[-1], ('bytes_parsed', {'bytes': len(self.content),
+                                                            'total_bytes': len(self.content)}))
+
+    def test_events_are_throttled(self):
+        """Se envía como mucho un evento por cada paso del archivo"""
+        reader = ProgressReader(BytesIO(self.content), len(self.content), self._progress, step=0.25)
+        while reader.read(100):
+            pass
+
+        self.assertLessEqual(len(self.events), 5)
+        positions = [data['bytes'] for _, data in self.events]
+        self.assertEqual(positions, sorted(positions))
+
+    def test_emit_without_callback(self):
+        """Sin callback los eventos se ignoran"""
+        emit(None, 'stage_started', stage='load')
+        emit(self._progress, 'stage_started', stage='load')
+
+        self.assertEqual(self.events, [('stage_started', {'stage': 'load'})])
+
+
+class TestAnalyzerProgress(unittest.TestCase):
+    """Pruebas para los eventos emitidos por el analizador"""
+
+    def test_stage_and_plot_events(self):
+        """Cada etapa informa su inicio y fin, y cada gráfico generado"""
+        events = []
+        df = pd.DataFrame({'a': [i * 2.0 for i in range(20)], 'b': [i * 1.5 for i in range(20)]})
+        analyzer = DataAnalyzer(progress=lambda event, data: events.append((event, data)))
+        analyzer.df = df
+
+        analyzer.analyze(['histograms'])
+        analyzer.cleanup_plots()
+
+        started = [data['stage'] for event, data in events if event == 'stage_started']
+        finished = [data['stage'] for event, data in events if event == 'stage_finished']
+        self.assertEqual(started, finished)
+        self.assertEqual(started[-1], 'histograms')
+        plots = [data for event, data in events if event == 'plot_rendered']
+        self.assertEqual([(data['rendered'], data['total']) for data in plots], [(1, 2), (2, 2)])
+
+    def test_section_events(self):
+        """Cada sección pedida se entrega en cuanto termina su etapa"""
+        events = []
+        analyzer = DataAnalyzer(progress=lambda event, data: events.append((event, data)))
+        analyzer.df = pd.DataFrame({'a': range(10), 'b': list('xyxyxyxyxy')})
+
+        results = analyzer.analyze(['basic_info', 'statistical_summary'])
+
+        sections = [data for event, data in events if event == 'section_ready']
+        self.assertEqual([data['section'] for data in sections], ['basic_info', 'statistical_summary'])
+        self.assertEqual(sections[0]['value'], results['basic_info'])
+        # La sección se entrega justo después de terminar su etapa
+        names = [event for event, _ in events]
+        self.assertEqual(names[names.index('section_ready') - 1], 'stage_finished')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Pruebas unitarias para la caché de resultados de análisis
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import time
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+from flask import Flask
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from result_cache import NumpyJSONProvider, ResultCache, content_key
+
+
+class TestResultCache(unittest.TestCase):
+    """Pruebas para la caché LRU en memoria y en disco"""
+
+    def setUp(self):
+        """Crear un directorio temporal para la caché en disco"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Limpieza después de cada prueba"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_content_key(self):
+        """La clave depende del contenido y de las opciones, y rebobina el flujo"""
+        stream = BytesIO(b'a,b\n1,2\n')
+        key = content_key(stream, {'outputs': ['basic_info']})
+
+        self.assertEqual(stream.read(), b'a,b\n1,2\n')
+        self.assertEqual(key, content_key(BytesIO(b'a,b\n1,2\n'), {'outputs': ['basic_info']}))
+        self.assertNotEqual(key, content_key(BytesIO(b'a,b\n1,3\n'), {'outputs': ['basic_info']}))
+        self.assertNotEqual(key, content_key(BytesIO(b'a,b\n1,2\n'), {'outputs': ['histograms']}))
+
+    def test_lru_eviction(self):
+        """Se descarta el resultado usado hace más tiempo"""
+        cache = ResultCache(max_entries=2)
+        cache.put('a', {'valor': 1})
+        cache.put('b', {'valor': 2})
+        cache.get('a')
+        cache.put('c', {'valor': 3})
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c')[0], {'valor': 3})
+
+    def test_ttl(self):
+        """Los resultados caducan después del TTL"""
+        cache = ResultCache(ttl=0.05, disk_dir=self.temp_dir)
+        cache.put('a', {'valor': 1})
+        self.assertIsNotNone(cache.get('a'))
+
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_disk_tier(self):
+        """Otra instancia encuentra el resultado en disco con su antigüedad"""
+        ResultCache(disk_dir=self.temp_dir).put('a', {'valor': 1})
+
+        result, age = ResultCache(disk_dir=self.temp_dir).get('a')
+
+        self.assertEqual(result, {'valor': 1})
+        self.assertGreaterEqual(age, 0)
+
+    def test_disk_tier_numpy_values(self):
+        """Los valores de numpy se guardan en disco como los envían las respuestas"""
+        provider = NumpyJSONProvider(Flask(__name__))
+        result = {'media': np.float64(2.5), 'filas': np.int64(4), 'nulos': np.bool_(False),
+                  'conteos': np.array([1, 2]), 'fecha': datetime(2024, 1, 1)}
+        ResultCache(disk_dir=self.temp_dir, dumps=provider.dumps).put('a', result)
+
+        loaded, _ = ResultCache(disk_dir=self.temp_dir).get('a')
+
+        self.assertEqual(loaded, {'media': 2.5, 'filas': 4, 'nulos': False, 'conteos': [1, 2],
+                                  'fecha': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        self.assertIs(type(loaded['filas']), int)
+        self.assertEqual(provider.dumps(loaded), provider.dumps(result))
+
+        # Lo que no se puede enviar tampoco se guarda
+        ResultCache(disk_dir=self.temp_dir, dumps=provider.dumps).put('b', {'objeto': object()})
+        self.assertEqual(os.listdir(self.temp_dir), ['a.json'])
+
+    def test_discard(self):
+        """Descartar una entrada la borra de memoria y de disco"""
+        cache = ResultCache(disk_dir=self.temp_dir)
+        cache.put('a', {'valor': 1})
+        cache.put('b', {'valor': 2})
+
+        cache.discard('a')
+        cache.discard('c')
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(os.listdir(self.temp_dir), ['b.json'])
+
+    def test_disk_eviction(self):
+        """El disco conserva como máximo max_disk_entries resultados"""
+        cache = ResultCache(max_entries=1, disk_dir=self.temp_dir, max_disk_entries=2)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, {'clave': key})
+            time.sleep(0.01)
+
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['b.json', 'c.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Pruebas unitarias para el grafo de etapas de análisis
+"""
+
+import unittest
+import os
+import sys
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from stage_graph import StageGraph
+
+
+class TestStageGraph(unittest.TestCase):
+    """Pruebas para la planificación de etapas"""
+
+    def setUp(self):
+        """Crear un grafo tipos -> bloque numérico -> momentos -> histogramas"""
+        self.graph = StageGraph()
+        self.graph.add('tipos', 'get_tipos')
+        self.graph.add('numericas', 'get_numericas', ['tipos'])
+        self.graph.add('momentos', 'get_momentos', ['numericas'])
+        self.graph.add('histogramas', 'create_histogramas', ['momentos'])
+        self.graph.add('nulos', 'get_nulos')
+
+    def test_plan_includes_only_dependencies(self):
+        """Solo se planifican las etapas necesarias, en orden"""
+        self.assertEqual(self.graph.plan(['histogramas']), ['tipos', 'numericas', 'momentos', 'histogramas'])
+        self.assertEqual(self.graph.plan(['nulos']), ['nulos'])
+
+    def test_shared_dependencies_run_once(self):
+        """Las dependencias compartidas aparecen una sola vez"""
+        plan = self.graph.plan(['momentos', 'histogramas', 'numericas'])
+        self.assertEqual(plan, ['tipos', 'numericas', 'momentos', 'histogramas'])
+
+    def test_unknown_stages(self):
+        """Las etapas desconocidas se rechazan"""
+        with self.assertRaises(ValueError):
+            self.graph.plan(['pdf'])
+        with self.assertRaises(ValueError):
+            self.graph.add('pdf', 'create_pdf', ['portada'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Pruebas unitarias para la caché de estadísticas
+"""
+
+import unittest
+import os
+import sys
+
+# Agregar el path del backend
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from stats_cache import StatsCache
+
+
+class TestStatsCache(unittest.TestCase):
+    """Pruebas para la caché memoizada por etapa"""
+
+    def setUp(self):
+        """Crear una caché vacía"""
+        self.cache = StatsCache()
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return 42
+
+    def test_value_computed_once(self):
+        """Cada valor se calcula solo la primera vez"""
+        self.assertEqual(self.cache.get('media', self._compute), 42)
+        self.assertEqual(self.cache.get('media', self._compute), 42)
+        self.assertEqual(self.calls, 1)
+
+    def test_report_per_stage(self):
+        """Los aciertos y fallos se cuentan por etapa"""
+        with self.cache.stage('resumen'):
+            self.cache.get(('distinct', 'region'), self._compute)
+        with self.cache.stage('insights'):
+            self.cache.get(('distinct', 'region'), self._compute)
+            self.cache.get(('distinct', 'region'), self._compute)
+
+        report = self.cache.report()
+        self.assertEqual(report['resumen'], {'hits': 0, 'misses': 1, 'computed': ['distinct:region']})
+        self.assertEqual(report['insights'], {'hits': 2, 'misses': 0, 'computed': []})
+
+    def test_clear(self):
+        """Limpiar la caché obliga a recalcular"""
+        self.cache.get('media', self._compute)
+        self.cache.clear()
+        self.cache.get('media', self._compute)
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.cache.report()['other']['misses'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()